@@ -0,0 +1,99 @@
+# Admin User Cache for Wheeler Knight Portfolio
+# Short-lived per-process copies of admin user records for auth checks
+from typing import Dict, Any, Optional, Tuple
+import copy
+import logging
+import threading
+import time
+
+from content_events import content_events
+
+logger = logging.getLogger(__name__)
+
+# Attributes whose changes must be visible to auth checks right away
+WATCHED_FIELDS = (
+    'username', 'email', 'password_hash', 'first_name', 'last_name', 'role', 'is_active', 'last_login'
+)
+
+_MISSING = object()
+
+
+class AdminUserCache:
+    """TTL cache of admin user dicts keyed by id
+
+    Entries are dropped after any committed change to the user in this
+    process (update, delete, password change, login). Other workers see the
+    change once their copy expires, so the TTL bounds how long a
+    deactivated account keeps working there.
+    """
+
+    def __init__(self, app=None):
+        self.ttl = 30.0
+        self.max_entries = 256
+        self._entries: Dict[int, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._counters = {'hits': 0, 'misses': 0, 'invalidations': 0}
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Configure the TTL and subscribe to admin user commits"""
+        from models.models import AdminUser
+
+        self.ttl = app.config.get('ADMIN_USER_CACHE_TTL', 30.0)
+        content_events.subscribe({AdminUser: WATCHED_FIELDS}, lambda instance: None, self._on_changes)
+
+    def _on_changes(self, changes) -> None:
+        for change in changes:
+            self.invalidate(change.id)
+
+    def get(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """Admin user as a dict (see AdminUser.to_dict), or None if no such user"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry and entry[0] > now:
+                self._counters['hits'] += 1
+                return None if entry[1] is _MISSING else copy.deepcopy(entry[1])
+            self._counters['misses'] += 1
+            generation = self._generation
+
+        from models.models import AdminUser
+
+        user = AdminUser.query.get(user_id)
+        data = user.to_dict() if user else _MISSING
+
+        if self.ttl > 0:
+            with self._lock:
+                # Skip storing a row read before a concurrent invalidation
+                if generation != self._generation:
+                    return None if data is _MISSING else copy.deepcopy(data)
+                if len(self._entries) >= self.max_entries:
+                    self._entries = {key: value for key, value in self._entries.items() if value[0] > now}
+                if len(self._entries) < self.max_entries:
+                    self._entries[user_id] = (now + self.ttl, data)
+
+        return None if data is _MISSING else copy.deepcopy(data)
+
+    def invalidate(self, user_id: Optional[int] = None) -> None:
+        """Drop one user's entry, or every entry when user_id is None"""
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+            self._generation += 1
+            self._counters['invalidations'] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache counters for monitoring"""
+        with self._lock:
+            counters = dict(self._counters)
+            counters['entries'] = len(self._entries)
+        counters['ttl'] = self.ttl
+        return counters
+
+
+# Initialize admin user cache
+admin_user_cache = AdminUserCache()
@@ -0,0 +1,216 @@
+# Analytics Ingestion Pipeline for Wheeler Knight Portfolio
+# Request handlers enqueue events; a background thread writes them in batches
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Column limits from models/analytics.py, applied before queuing so one
+# oversized value cannot fail a whole batch
+COLUMN_LIMITS = {
+    'event_type': 100,
+    'ip_address': 45,
+    'page_url': 500,
+    'referrer': 500,
+    'session_id': 255
+}
+
+
+def event_row(event) -> Dict[str, Any]:
+    """Convert an unsaved Analytics instance into an insert row"""
+    now = datetime.utcnow()
+    row = {
+        'event_type': event.event_type,
+        'event_data': event.event_data,
+        'user_id': event.user_id,
+        'ip_address': event.ip_address,
+        'user_agent': event.user_agent,
+        'page_url': event.page_url,
+        'referrer': event.referrer,
+        'session_id': event.session_id,
+        'created_at': event.created_at or now,
+        'updated_at': now
+    }
+    for column, limit in COLUMN_LIMITS.items():
+        if row[column] and len(row[column]) > limit:
+            row[column] = row[column][:limit]
+    return row
+
+
+class AnalyticsIngestor:
+    """Bounded in-memory queue of analytics events flushed by a background thread"""
+
+    def __init__(self, app=None):
+        self.app = None
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._pid = None
+        self._counters = self._empty_counters()
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Configure the ingestor from the Flask app config"""
+        self.app = app
+        self.max_queue_size = app.config.get('ANALYTICS_QUEUE_SIZE', 10000)
+        self.batch_size = app.config.get('ANALYTICS_BATCH_SIZE', 500)
+        self.flush_interval = app.config.get('ANALYTICS_FLUSH_INTERVAL', 2.0)
+        self.enqueue_timeout = app.config.get('ANALYTICS_ENQUEUE_TIMEOUT', 0.0)
+        self._queue = queue.Queue(maxsize=self.max_queue_size)
+        atexit.register(self.shutdown)
+
+    @staticmethod
+    def _empty_counters() -> Dict[str, int]:
+        return {
+            'enqueued': 0,
+            'written': 0,
+            'dropped': 0,
+            'backpressure_waits': 0,
+            'failed': 0,
+            'batches': 0
+        }
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += amount
+
+    def _ensure_started(self) -> None:
+        """Start the flusher thread lazily, once per process (gunicorn forks workers)"""
+        if self._pid == os.getpid() and self._thread and self._thread.is_alive():
+            return
+
+        with self._lock:
+            if self._pid == os.getpid() and self._thread and self._thread.is_alive():
+                return
+            if self._pid != os.getpid():
+                # A forked child must not share the parent's queue or counters
+                self._queue = queue.Queue(maxsize=self.max_queue_size)
+                self._counters = self._empty_counters()
+                self._pid = os.getpid()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='analytics-ingestor', daemon=True)
+            self._thread.start()
+
+    def enqueue(self, event) -> bool:
+        """Queue an Analytics instance for the next batch; returns False if dropped"""
+        return self.enqueue_row(event_row(event))
+
+    def enqueue_row(self, row: Dict[str, Any]) -> bool:
+        """Queue a prepared insert row for the next batch; returns False if dropped"""
+        self._ensure_started()
+
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            if self.enqueue_timeout <= 0:
+                self._count('dropped')
+                return False
+            self._count('backpressure_waits')
+            try:
+                self._queue.put(row, timeout=self.enqueue_timeout)
+            except queue.Full:
+                self._count('dropped')
+                return False
+
+        self._count('enqueued')
+        return True
+
+    def _next_batch(self, deadline: float) -> List[Dict[str, Any]]:
+        """Collect rows until the batch is full or the flush interval elapses"""
+        batch = []
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            batch = self._next_batch(time.monotonic() + self.flush_interval)
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        """Insert a batch with a single executemany, isolating bad rows on failure"""
+        from models import db
+        from models.models import Analytics
+
+        table = Analytics.__table__
+        with self.app.app_context():
+            try:
+                db.session.execute(table.insert(), batch)
+                db.session.commit()
+                self._count('written', len(batch))
+                self._count('batches')
+                return
+            except Exception as e:
+                db.session.rollback()
+                logger.warning(f"Analytics batch of {len(batch)} failed, retrying rows individually: {e}")
+
+            for row in batch:
+                try:
+                    db.session.execute(table.insert(), [row])
+                    db.session.commit()
+                    self._count('written')
+                except Exception as e:
+                    db.session.rollback()
+                    self._count('failed')
+                    logger.error(f"Failed to write analytics event {row.get('event_type')}: {e}")
+
+    def flush(self) -> int:
+        """Write everything currently queued from the calling thread"""
+        if self._queue is None:
+            return 0
+
+        written = 0
+        while True:
+            batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not batch:
+                return written
+            self._write(batch)
+            written += len(batch)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Stop the flusher thread and write any remaining events"""
+        self._stop.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout)
+        self._thread = None
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Failed to flush analytics on shutdown: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get pipeline counters for monitoring"""
+        with self._lock:
+            counters = dict(self._counters)
+        counters.update({
+            'queue_depth': self._queue.qsize() if self._queue else 0,
+            'queue_capacity': getattr(self, 'max_queue_size', 0),
+            'batch_size': getattr(self, 'batch_size', 0),
+            'flush_interval': getattr(self, 'flush_interval', 0),
+            'flusher_running': bool(self._thread and self._thread.is_alive())
+        })
+        return counters
+
+
+# Initialize analytics ingestor
+analytics_ingestor = AnalyticsIngestor()
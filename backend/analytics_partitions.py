@@ -0,0 +1,165 @@
+# Analytics Partition Maintenance for Wheeler Knight Portfolio
+from datetime import date, datetime
+from typing import Dict, Any, List, Optional
+from sqlalchemy import text
+import logging
+
+logger = logging.getLogger(__name__)
+
+ANALYTICS_TABLE = 'analytics'
+MAXVALUE_PARTITION = 'pmax'
+
+
+def month_start(value: date) -> date:
+    """Get the first day of the month containing value"""
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    """Shift a month-start date by a number of months"""
+    month_index = value.year * 12 + (value.month - 1) + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_name(value: date) -> str:
+    """Get the partition name holding rows for the month of value"""
+    return f"p{value.year:04d}{value.month:02d}"
+
+
+def partition_definition(value: date) -> str:
+    """Build the RANGE COLUMNS definition for a monthly partition"""
+    upper_bound = add_months(month_start(value), 1)
+    return f"PARTITION {partition_name(value)} VALUES LESS THAN ('{upper_bound.isoformat()}')"
+
+
+def _parse_upper_bound(description: Optional[str]) -> Optional[date]:
+    """Parse a partition's LESS THAN value from information_schema"""
+    if not description or description.upper() == 'MAXVALUE':
+        return None
+    return datetime.strptime(description.strip("'")[:10], '%Y-%m-%d').date()
+
+
+def list_partitions(connection) -> List[Dict[str, Any]]:
+    """List analytics partitions ordered by position"""
+    rows = connection.execute(text(
+        "SELECT PARTITION_NAME, PARTITION_DESCRIPTION, TABLE_ROWS "
+        "FROM information_schema.PARTITIONS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table "
+        "AND PARTITION_NAME IS NOT NULL "
+        "ORDER BY PARTITION_ORDINAL_POSITION"
+    ), {'table': ANALYTICS_TABLE}).fetchall()
+
+    return [
+        {
+            'name': row[0],
+            'upper_bound': _parse_upper_bound(row[1]),
+            'rows': row[2]
+        }
+        for row in rows
+    ]
+
+
+def ensure_future_partitions(connection, premake_months: int, today: Optional[date] = None,
+                             dry_run: bool = False) -> List[str]:
+    """Split the MAXVALUE partition so monthly partitions exist ahead of time"""
+    partitions = list_partitions(connection)
+    if not partitions:
+        raise RuntimeError("analytics table is not partitioned - run 'flask db upgrade' first")
+
+    bounded = [p['upper_bound'] for p in partitions if p['upper_bound']]
+    current = month_start(today or datetime.utcnow().date())
+    next_month = max(bounded) if bounded else current
+    target = add_months(current, premake_months + 1)
+
+    new_months = []
+    while next_month < target:
+        new_months.append(next_month)
+        next_month = add_months(next_month, 1)
+
+    if not new_months:
+        return []
+
+    definitions = [partition_definition(month) for month in new_months]
+    definitions.append(f"PARTITION {MAXVALUE_PARTITION} VALUES LESS THAN (MAXVALUE)")
+    statement = (
+        f"ALTER TABLE {ANALYTICS_TABLE} REORGANIZE PARTITION {MAXVALUE_PARTITION} INTO ("
+        + ", ".join(definitions) + ")"
+    )
+
+    if not dry_run:
+        connection.execute(text(statement))
+
+    created = [partition_name(month) for month in new_months]
+    logger.info(f"Created analytics partitions: {', '.join(created)}")
+    return created
+
+
+def _archive_partition(connection, name: str) -> str:
+    """Swap a partition's rows into a standalone archive table"""
+    archive_table = f"{ANALYTICS_TABLE}_archive_{name[1:]}"
+    connection.execute(text(f"CREATE TABLE {archive_table} LIKE {ANALYTICS_TABLE}"))
+    connection.execute(text(f"ALTER TABLE {archive_table} REMOVE PARTITIONING"))
+    connection.execute(text(
+        f"ALTER TABLE {ANALYTICS_TABLE} EXCHANGE PARTITION {name} WITH TABLE {archive_table}"
+    ))
+    return archive_table
+
+
+def expire_partitions(connection, retention_months: int, archive: bool = False,
+                      today: Optional[date] = None, dry_run: bool = False) -> List[Dict[str, Any]]:
+    """Drop (or archive then drop) partitions older than the retention window"""
+    cutoff = add_months(month_start(today or datetime.utcnow().date()), -retention_months)
+
+    expired = []
+    for partition in list_partitions(connection):
+        upper_bound = partition['upper_bound']
+        if upper_bound is None or upper_bound > cutoff:
+            continue
+
+        result = {'name': partition['name'], 'rows': partition['rows'], 'archive_table': None}
+        if not dry_run:
+            if archive:
+                result['archive_table'] = _archive_partition(connection, partition['name'])
+            connection.execute(text(
+                f"ALTER TABLE {ANALYTICS_TABLE} DROP PARTITION {partition['name']}"
+            ))
+        expired.append(result)
+
+    if expired:
+        logger.info(f"Expired analytics partitions: {', '.join(p['name'] for p in expired)}")
+    return expired
+
+
+def delete_expired_rows(session, retention_months: int, today: Optional[date] = None) -> int:
+    """Row-by-row retention for databases without partitioning (development only)"""
+    from models.models import Analytics
+
+    cutoff = add_months(month_start(today or datetime.utcnow().date()), -retention_months)
+    deleted = Analytics.query.filter(Analytics.created_at < cutoff).delete(synchronize_session=False)
+    session.commit()
+    return deleted
+
+
+def run_maintenance(db, retention_months: int, premake_months: int, archive: bool = False,
+                    dry_run: bool = False) -> Dict[str, Any]:
+    """Create upcoming partitions and expire old ones per the retention policy"""
+    if db.engine.dialect.name != 'mysql':
+        deleted = 0 if dry_run else delete_expired_rows(db.session, retention_months)
+        return {
+            'partitioned': False,
+            'created': [],
+            'expired': [],
+            'deleted_rows': deleted
+        }
+
+    with db.engine.connect() as connection:
+        created = ensure_future_partitions(connection, premake_months, dry_run=dry_run)
+        expired = expire_partitions(connection, retention_months, archive=archive, dry_run=dry_run)
+        connection.commit()
+
+    return {
+        'partitioned': True,
+        'created': created,
+        'expired': expired,
+        'deleted_rows': 0
+    }
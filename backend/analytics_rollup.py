@@ -0,0 +1,195 @@
+# Analytics Rollup Job for Wheeler Knight Portfolio
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterable, Optional, Tuple
+from urllib.parse import urlparse
+from collections import Counter
+import logging
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_JOB_NAME = 'analytics_rollup'
+
+
+def referrer_domain(referrer: Optional[str]) -> str:
+    """Reduce a referrer URL to its host name"""
+    if not referrer:
+        return ''
+    try:
+        host = urlparse(referrer).hostname or ''
+    except ValueError:
+        return ''
+    return host[:255]
+
+
+def event_weight(event_data: Optional[Dict[str, Any]]) -> int:
+    """Count a sampled event as the number of events it stands for"""
+    if isinstance(event_data, dict):
+        sample_rate = event_data.get('sample_rate')
+        if isinstance(sample_rate, (int, float)) and 0 < sample_rate < 1:
+            return max(1, round(1 / sample_rate))
+    return 1
+
+
+def _upsert_counts(db, model, counts: Dict[Tuple[datetime, str, str, str], int]) -> None:
+    """Add counts to existing rollup rows, inserting rows that do not exist yet"""
+    if not counts:
+        return
+
+    table = model.__table__
+    now = datetime.utcnow()
+    rows = [
+        {
+            'bucket_start': bucket_start,
+            'event_type': event_type,
+            'page_url': page_url,
+            'referrer_domain': domain,
+            'dimension_hash': model.hash_dimensions(event_type, page_url, domain),
+            'count': count,
+            'created_at': now,
+            'updated_at': now
+        }
+        for (bucket_start, event_type, page_url, domain), count in counts.items()
+    ]
+
+    dialect = db.engine.dialect.name
+    if dialect == 'mysql':
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(table)
+        stmt = stmt.on_duplicate_key_update(
+            count=table.c.count + stmt.inserted.count,
+            updated_at=stmt.inserted.updated_at
+        )
+    else:
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        stmt = insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['bucket_start', 'dimension_hash'],
+            set_={
+                'count': table.c.count + stmt.excluded.count,
+                'updated_at': stmt.excluded.updated_at
+            }
+        )
+
+    db.session.execute(stmt, rows)
+
+
+def aggregate_rows(rows: Iterable) -> Tuple[Counter, Counter]:
+    """Aggregate raw analytics rows into hourly and daily counters"""
+    from models.models import AnalyticsHourlyRollup, AnalyticsDailyRollup
+
+    hourly = Counter()
+    daily = Counter()
+    for row in rows:
+        dimensions = (row.event_type, (row.page_url or '')[:500], referrer_domain(row.referrer))
+        weight = event_weight(row.event_data)
+        hourly[(AnalyticsHourlyRollup.bucket_for(row.created_at),) + dimensions] += weight
+        daily[(AnalyticsDailyRollup.bucket_for(row.created_at),) + dimensions] += weight
+    return hourly, daily
+
+
+def run_rollup(db, batch_size: int = 5000, lag_seconds: int = 60,
+               max_batches: Optional[int] = None) -> Dict[str, Any]:
+    """Aggregate analytics rows newer than the stored high-water mark
+
+    Rows are read in id order and the scan stops at the first row younger
+    than lag_seconds, so ids still held by in-flight transactions are not
+    skipped. Each batch's counts and the new high-water mark are committed
+    together, making a rerun after a failure safe.
+    """
+    from models.models import Analytics, AnalyticsHourlyRollup, AnalyticsDailyRollup, AnalyticsRollupState
+
+    cutoff = datetime.utcnow() - timedelta(seconds=lag_seconds)
+    processed = 0
+    batches = 0
+
+    state = AnalyticsRollupState.get_or_create(ROLLUP_JOB_NAME)
+    start_id = state.last_id
+
+    while max_batches is None or batches < max_batches:
+        rows = db.session.query(
+            Analytics.id,
+            Analytics.created_at,
+            Analytics.event_type,
+            Analytics.page_url,
+            Analytics.referrer,
+            Analytics.event_data
+        ).filter(
+            Analytics.id > state.last_id
+        ).order_by(Analytics.id.asc()).limit(batch_size).all()
+
+        settled = []
+        for row in rows:
+            if row.created_at > cutoff:
+                break
+            settled.append(row)
+
+        if not settled:
+            break
+
+        hourly, daily = aggregate_rows(settled)
+        _upsert_counts(db, AnalyticsHourlyRollup, hourly)
+        _upsert_counts(db, AnalyticsDailyRollup, daily)
+
+        state.last_id = settled[-1].id
+        state.last_run_at = datetime.utcnow()
+        db.session.commit()
+
+        processed += len(settled)
+        batches += 1
+
+        if len(settled) < len(rows) or len(rows) < batch_size:
+            break
+
+    state.last_run_at = datetime.utcnow()
+    db.session.commit()
+
+    if processed:
+        logger.info(f"Analytics rollup processed {processed} rows (ids {start_id + 1}-{state.last_id})")
+
+    return {
+        'processed_rows': processed,
+        'batches': batches,
+        'last_id': state.last_id
+    }
+
+
+def query_rollups(granularity: str, start: datetime, end: datetime, group_by: str = 'event_type',
+                  event_type: Optional[str] = None, limit: int = 50) -> Dict[str, Any]:
+    """Read aggregated counts from the rollup tables only"""
+    from models import db
+    from models.models import AnalyticsHourlyRollup, AnalyticsDailyRollup
+
+    model = AnalyticsHourlyRollup if granularity == 'hour' else AnalyticsDailyRollup
+    dimension = getattr(model, group_by)
+    total_count = db.func.sum(model.count)
+
+    filters = [model.bucket_start >= start, model.bucket_start < end]
+    if event_type:
+        filters.append(model.event_type == event_type)
+
+    series = db.session.query(
+        model.bucket_start, total_count
+    ).filter(*filters).group_by(model.bucket_start).order_by(model.bucket_start.asc()).all()
+
+    breakdown = db.session.query(
+        dimension, total_count.label('total')
+    ).filter(*filters).group_by(dimension).order_by(db.desc('total')).limit(limit).all()
+
+    return {
+        'granularity': granularity,
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'group_by': group_by,
+        'series': [
+            {'bucket_start': bucket_start.isoformat(), 'count': int(count or 0)}
+            for bucket_start, count in series
+        ],
+        'breakdown': [
+            {'key': key, 'count': int(count or 0)}
+            for key, count in breakdown
+        ],
+        'total': sum(int(count or 0) for _, count in series)
+    }
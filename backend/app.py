@@ -57,6 +57,74 @@ mail = Mail(app)
 from auth import auth_manager
 auth_manager.init_app(app)
 
+# Initialize JWT revocation list
+from token_revocation import token_revocation
+token_revocation.init_app(app)
+
+# Initialize admin user cache
+from admin_user_cache import admin_user_cache
+admin_user_cache.init_app(app)
+
+# Initialize password hashing pool
+from password_hashing import password_hasher
+password_hasher.init_app(app)
+
+# Initialize login throttling
+from login_throttle import login_throttle
+login_throttle.init_app(app)
+
+# Initialize content-addressed upload storage
+from upload_storage import content_store
+content_store.init_app(app)
+
+# Initialize resumable upload sessions
+from upload_sessions import resumable_uploads
+resumable_uploads.init_app(app)
+
+# Initialize upload image optimization
+from image_optimizer import image_optimizer
+image_optimizer.init_app(app)
+
+# Initialize responsive image variant builds
+from image_variants import image_variants
+image_variants.init_app(app)
+
+# Initialize the public upload tree (what nginx serves under /uploads/)
+from upload_publishing import upload_publisher
+upload_publisher.init_app(app)
+
+# Initialize upload reference tracking
+from upload_index import reference_updater
+reference_updater.init_app(app, delay=app.config.get('UPLOAD_REFERENCE_DELAY', 1.0))
+
+# Initialize batched analytics ingestion
+from analytics_ingest import analytics_ingestor
+analytics_ingestor.init_app(app)
+
+# Initialize blog search
+from blog_search import blog_search
+blog_search.init_app(app)
+
+# Initialize site-wide search
+from site_search import site_search
+site_search.init_app(app)
+
+# Initialize skill and technology autocomplete
+from autocomplete import autocomplete
+autocomplete.init_app(app)
+
+# Initialize related content updates
+from related_content import related_updater
+related_updater.init_app(app, delay=app.config.get('RELATED_UPDATE_DELAY', 2.0))
+
+# Initialize static feed and sitemap regeneration
+from static_feeds import feed_updater
+feed_updater.init_app(app, delay=app.config.get('FEEDS_UPDATE_DELAY', 2.0))
+
+# Initialize static API snapshot re-baking
+from static_bake import snapshot_updater
+snapshot_updater.init_app(app, delay=app.config.get('BAKE_UPDATE_DELAY', 5.0))
+
 # Configure CORS
 CORS(app, origins=app_config.CORS_ORIGINS)
 
@@ -70,6 +138,10 @@ from models.models import *
 from routes.routes import register_blueprints
 register_blueprints(app)
 
+# Register CLI commands
+from commands import register_commands
+register_commands(app)
+
 # Basic health check route
 @app.route('/api/health')
 def health_check():
@@ -113,6 +185,10 @@ def api_docs():
             'skills': '/api/skills/*',
             'projects': '/api/projects/*',
             'contact': '/api/contact/*',
+            'analytics': '/api/analytics/*',
+            'search': '/api/search',
+            'autocomplete': '/api/autocomplete',
+            'feeds': '/api/feeds/*',
             'admin': '/api/admin/*'
         },
         'environment': config_name
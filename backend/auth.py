@@ -1,11 +1,14 @@
 # Authentication Module for Wheeler Knight Portfolio
-from flask_jwt_extended import JWTManager, create_access_token, create_refresh_token, jwt_required, get_jwt_identity, get_jwt
+from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity, get_jwt
 from flask import current_app
 from functools import wraps
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 import logging
 
+from admin_user_cache import admin_user_cache
+from jwt_claims_cache import CachingJWTManager, verified_claims_cache
+
 logger = logging.getLogger(__name__)
 
 class AuthManager:
@@ -18,7 +21,8 @@ class AuthManager:
     
     def init_app(self, app):
         """Initialize JWT manager with Flask app"""
-        self.jwt_manager = JWTManager(app)
+        self.jwt_manager = CachingJWTManager(app)
+        verified_claims_cache.init_app(app)
         
         # Configure JWT settings
         app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(hours=1)
@@ -124,6 +128,17 @@ def admin_required(f):
                 'message': 'Please log in to access this resource'
             }, 401
         
+        # Deactivated or deleted accounts lose access immediately; role comes
+        # from the current record rather than the token (cached, no DB round trip)
+        user = admin_user_cache.get(current_user['id'])
+        if not user or not user['is_active']:
+            return {
+                'success': False,
+                'error': 'Account not found or inactive',
+                'message': 'Please log in again'
+            }, 401
+        current_user['role'] = user['role']
+        
         # Check if user has admin role
         if current_user.get('role') not in ['admin', 'super_admin']:
             return {
@@ -151,6 +166,17 @@ def super_admin_required(f):
                 'message': 'Please log in to access this resource'
             }, 401
         
+        # Deactivated or deleted accounts lose access immediately; role comes
+        # from the current record rather than the token (cached, no DB round trip)
+        user = admin_user_cache.get(current_user['id'])
+        if not user or not user['is_active']:
+            return {
+                'success': False,
+                'error': 'Account not found or inactive',
+                'message': 'Please log in again'
+            }, 401
+        current_user['role'] = user['role']
+        
         # Check if user has super admin role
         if current_user.get('role') != 'super_admin':
             return {
@@ -208,8 +234,8 @@ def log_auth_event(event_type: str, user_id: Optional[int], ip_address: Optional
                    user_agent: Optional[str], details: Optional[Dict[str, Any]] = None):
     """Log authentication events for security monitoring"""
     try:
-        from models import db
         from models.models import Analytics
+        from analytics_ingest import analytics_ingestor
         
         event_data = {
             'event_type': event_type,
@@ -224,10 +250,10 @@ def log_auth_event(event_type: str, user_id: Optional[int], ip_address: Optional
             user_agent=user_agent
         )
         
-        db.session.add(analytics)
-        db.session.commit()
-        
-        logger.info(f"Auth event logged: {event_type} for user {user_id}")
+        if analytics_ingestor.enqueue(analytics):
+            logger.info(f"Auth event logged: {event_type} for user {user_id}")
+        else:
+            logger.warning(f"Auth event dropped (analytics queue full): {event_type} for user {user_id}")
         
     except Exception as e:
         logger.error(f"Failed to log auth event: {str(e)}")
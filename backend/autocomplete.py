@@ -0,0 +1,219 @@
+# Skill and Technology Autocomplete for Wheeler Knight Portfolio
+# Sorted-array prefix index over skill names and technology tags
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Dict, Any, List, Optional, Tuple
+import heapq
+import logging
+import os
+import re
+import threading
+import time
+
+from content_events import content_events, table_signature
+
+logger = logging.getLogger(__name__)
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# Source type of each watched model and the attributes it is built from
+AUTOCOMPLETE_SOURCES = {
+    'Skill': ('skill', ('name',)),
+    'Project': ('technology', ('technologies',)),
+    'WorkExperience': ('technology', ('technologies',))
+}
+
+
+def normalize(value: Optional[str]) -> str:
+    """Lowercase and collapse whitespace so 'React  JS' and 'react js' match"""
+    return WHITESPACE_PATTERN.sub(' ', value or '').strip().lower()
+
+
+class _Entry:
+    """One suggestion with the spellings and sources it was seen in"""
+    __slots__ = ('spellings', 'types', 'count')
+
+    def __init__(self):
+        self.spellings = Counter()
+        self.types = Counter()
+        self.count = 0
+
+    @property
+    def label(self) -> str:
+        # Most common spelling wins; ties go to the alphabetically first one
+        return min(self.spellings.items(), key=lambda item: (-item[1], item[0]))[0]
+
+
+class Autocomplete:
+    """Popularity-ordered prefix suggestions for skills and technologies
+
+    Every suggestion is stored once per word it can be completed from, so
+    "learn" finds "Machine Learning". Keys live in one sorted list and a
+    lookup is a bisect plus a scan over the matching range. Each skill
+    counts once and each project or work experience using a technology
+    counts once, which is the popularity used for ordering.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._keys: List[Tuple[str, str]] = []
+        self._entries: Dict[str, _Entry] = {}
+        self._contributions: Dict[Tuple[str, int], List[Tuple[str, str]]] = {}
+        self._models = []
+        self._lock = threading.RLock()
+        self._pid = None
+        self._signature = None
+        self._checked_at = 0.0
+        self.refresh_seconds = 30
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Configure autocomplete and subscribe to content changes"""
+        from models import models
+
+        self.app = app
+        self.refresh_seconds = app.config.get('SEARCH_REFRESH_SECONDS', 30)
+        self._models = [getattr(models, name) for name in AUTOCOMPLETE_SOURCES]
+        content_events.subscribe(
+            {model: AUTOCOMPLETE_SOURCES[model.__name__][1] for model in self._models},
+            self._snapshot,
+            self._apply_changes
+        )
+
+    # Index maintenance
+
+    @staticmethod
+    def _snapshot(instance) -> List[Tuple[str, str]]:
+        """List the (source type, label) pairs a model instance contributes"""
+        source_type = AUTOCOMPLETE_SOURCES[type(instance).__name__][0]
+        if source_type == 'skill':
+            labels = [instance.name]
+        else:
+            labels = instance.technologies_list
+        cleaned = {WHITESPACE_PATTERN.sub(' ', label).strip() for label in labels if isinstance(label, str)}
+        return [(source_type, label) for label in sorted(cleaned) if label]
+
+    @staticmethod
+    def _prefix_keys(key: str) -> List[str]:
+        words = key.split(' ')
+        return [' '.join(words[position:]) for position in range(len(words))]
+
+    def _add(self, source_type: str, label: str) -> None:
+        key = normalize(label)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = _Entry()
+            for prefix_key in self._prefix_keys(key):
+                insort(self._keys, (prefix_key, key))
+        entry.spellings[label] += 1
+        entry.types[source_type] += 1
+        entry.count += 1
+
+    def _remove(self, source_type: str, label: str) -> None:
+        key = normalize(label)
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        entry.spellings[label] -= 1
+        entry.types[source_type] -= 1
+        entry.count -= 1
+        entry.spellings += Counter()  # Drop spellings that reached zero
+        entry.types += Counter()
+        if entry.count <= 0:
+            del self._entries[key]
+            for prefix_key in self._prefix_keys(key):
+                position = bisect_left(self._keys, (prefix_key, key))
+                if position < len(self._keys) and self._keys[position] == (prefix_key, key):
+                    del self._keys[position]
+
+    def _set_contribution(self, owner: Tuple[str, int], labels: List[Tuple[str, str]]) -> None:
+        for source_type, label in self._contributions.pop(owner, []):
+            self._remove(source_type, label)
+        if labels:
+            self._contributions[owner] = labels
+            for source_type, label in labels:
+                self._add(source_type, label)
+
+    def _apply_changes(self, changes) -> None:
+        """Apply committed ORM changes from this process to the index"""
+        if self._pid != os.getpid():
+            return  # Not built yet; the next lookup builds from the database
+        with self._lock:
+            for change in changes:
+                self._set_contribution((change.model, change.id), [] if change.deleted else change.snapshot)
+
+    def rebuild(self) -> int:
+        """Rebuild the index from every skill, project and work experience"""
+        signature = table_signature(self._models)
+        with self._lock:
+            self._keys = []
+            self._entries = {}
+            self._contributions = {}
+            for model in self._models:
+                for instance in model.query.all():
+                    self._set_contribution((model.__name__, instance.id), self._snapshot(instance))
+            self._signature = signature
+            self._pid = os.getpid()
+            self._checked_at = time.monotonic()
+
+        logger.info(f"Built autocomplete index with {len(self._entries)} suggestions")
+        return len(self._entries)
+
+    def _ensure_fresh(self) -> None:
+        """Build once per process and rebuild when another worker changed the tables
+
+        Local commits are applied as events but still change the signature,
+        so the writing worker also rebuilds once on its next check.
+        """
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self.rebuild()
+            return
+
+        if time.monotonic() - self._checked_at < self.refresh_seconds:
+            return
+
+        if table_signature(self._models) != self._signature:
+            self.rebuild()
+        else:
+            self._checked_at = time.monotonic()
+
+    # Querying
+
+    def suggest(self, prefix: str, limit: int = 10, source_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get the most popular suggestions starting with prefix (any word of them)"""
+        self._ensure_fresh()
+        prefix = normalize(prefix)
+
+        with self._lock:
+            if prefix:
+                matched = set()
+                position = bisect_left(self._keys, (prefix,))
+                while position < len(self._keys) and self._keys[position][0].startswith(prefix):
+                    matched.add(self._keys[position][1])
+                    position += 1
+            else:
+                matched = self._entries.keys()
+
+            candidates = [
+                (key, self._entries[key]) for key in matched
+                if source_type is None or self._entries[key].types[source_type] > 0
+            ]
+            top = heapq.nsmallest(limit, candidates, key=lambda item: (
+                -item[1].count, not item[0].startswith(prefix), item[0]
+            ))
+
+            return [
+                {
+                    'value': entry.label,
+                    'count': entry.count,
+                    'types': sorted(entry.types)
+                }
+                for _, entry in top
+            ]
+
+
+# Initialize autocomplete
+autocomplete = Autocomplete()
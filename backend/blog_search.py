@@ -0,0 +1,208 @@
+# Blog Search for Wheeler Knight Portfolio
+# MySQL FULLTEXT when available, in-process inverted index otherwise
+from typing import Dict, Any, List, Optional, Tuple
+import logging
+import os
+import threading
+import time
+
+from search_index import InvertedIndex, tokenize, highlight, make_snippet, encode_cursor, decode_cursor
+
+logger = logging.getLogger(__name__)
+
+# Relative weight of each field when ranking in-process results
+FIELD_WEIGHTS = {
+    'title': 3.0,
+    'excerpt': 2.0,
+    'content': 1.0
+}
+
+SEARCH_BACKENDS = ('auto', 'fulltext', 'memory')
+
+
+class BlogSearch:
+    """Ranked, cursor-paginated search over published blog posts"""
+
+    def __init__(self, app=None):
+        self.app = None
+        self.index = InvertedIndex()
+        self._lock = threading.Lock()
+        self._pid = None
+        self._signature = None
+        self._checked_at = 0.0
+        self.backend_setting = 'auto'
+        self.refresh_seconds = 30
+        self.snippet_length = 200
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Configure blog search from the Flask app config"""
+        self.app = app
+        self.backend_setting = app.config.get('BLOG_SEARCH_BACKEND', 'auto')
+        if self.backend_setting not in SEARCH_BACKENDS:
+            raise ValueError(f"BLOG_SEARCH_BACKEND must be one of: {', '.join(SEARCH_BACKENDS)}")
+        self.refresh_seconds = app.config.get('BLOG_SEARCH_REFRESH_SECONDS', 30)
+        self.snippet_length = app.config.get('BLOG_SEARCH_SNIPPET_LENGTH', 200)
+
+    @property
+    def backend(self) -> str:
+        """Resolve which search backend to use for the current database"""
+        from models import db
+
+        if self.backend_setting == 'auto':
+            return 'fulltext' if db.engine.dialect.name == 'mysql' else 'memory'
+        return self.backend_setting
+
+    # In-process index maintenance
+
+    @staticmethod
+    def _fields(post) -> List[Tuple[Optional[str], float]]:
+        return [(getattr(post, field), weight) for field, weight in FIELD_WEIGHTS.items()]
+
+    @staticmethod
+    def _current_signature() -> List[Any]:
+        """Cheap fingerprint of the blog table used to spot edits from other workers
+
+        Shares table_signature() with the site index, so view and like
+        counters do not count as edits.
+        """
+        from content_events import table_signature
+        from models.models import BlogPost
+
+        return table_signature([BlogPost])
+
+    def rebuild(self) -> int:
+        """Rebuild the in-process index from every published post"""
+        from models.models import BlogPost
+        from models.blog_post import PostStatus
+
+        posts = BlogPost.query.filter(BlogPost.status == PostStatus.PUBLISHED).with_entities(
+            BlogPost.id, BlogPost.title, BlogPost.excerpt, BlogPost.content
+        ).all()
+
+        index = InvertedIndex()
+        for post in posts:
+            index.add(post.id, self._fields(post))
+
+        with self._lock:
+            self.index = index
+            self._pid = os.getpid()
+            self._signature = self._current_signature()
+            self._checked_at = time.monotonic()
+
+        logger.info(f"Built blog search index with {len(index)} posts")
+        return len(index)
+
+    def _ensure_fresh(self) -> None:
+        """Build the index on first use per process and rebuild it when the table changed elsewhere"""
+        if self._pid != os.getpid():
+            self.rebuild()
+            return
+
+        if time.monotonic() - self._checked_at < self.refresh_seconds:
+            return
+
+        signature = self._current_signature()
+        if signature != self._signature:
+            self.rebuild()
+        else:
+            self._checked_at = time.monotonic()
+
+    def index_post(self, post) -> None:
+        """Add or refresh a post after it was committed; unpublished posts are removed"""
+        if self._pid != os.getpid():
+            return  # Built lazily from the database on the next search
+        if post.is_published:
+            self.index.add(post.id, self._fields(post))
+        else:
+            self.index.remove(post.id)
+        self._signature = self._current_signature()
+
+    def remove_post(self, post_id: int) -> None:
+        """Drop a deleted post from the index"""
+        if self._pid != os.getpid():
+            return
+        self.index.remove(post_id)
+        self._signature = self._current_signature()
+
+    # Querying
+
+    def _memory_hits(self, query: str, after: Optional[Tuple[float, int]], limit: int) -> List[Tuple[int, float]]:
+        self._ensure_fresh()
+        hits = self.index.search(query)
+        if after is not None:
+            score, post_id = after
+            hits = [hit for hit in hits if hit[1] < score or (hit[1] == score and hit[0] > post_id)]
+        return hits[:limit + 1]
+
+    @staticmethod
+    def _fulltext_hits(query: str, after: Optional[Tuple[float, int]], limit: int) -> List[Tuple[int, float]]:
+        from sqlalchemy.dialects.mysql import match
+        from models import db
+        from models.models import BlogPost
+        from models.blog_post import PostStatus
+
+        relevance = match(BlogPost.title, BlogPost.excerpt, BlogPost.content, against=query).in_natural_language_mode()
+        score = db.func.round(relevance, 6)
+
+        hits = db.session.query(BlogPost.id, score.label('score')).filter(
+            BlogPost.status == PostStatus.PUBLISHED,
+            relevance > 0
+        )
+        if after is not None:
+            after_score, after_id = after
+            hits = hits.filter(db.or_(score < after_score, db.and_(score == after_score, BlogPost.id > after_id)))
+
+        return [(row.id, float(row.score)) for row in hits.order_by(db.desc('score'), BlogPost.id.asc()).limit(limit + 1)]
+
+    def search(self, query: str, limit: int = 10, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """Search published posts; raises ValueError for an invalid cursor"""
+        from models.models import BlogPost
+
+        after = None
+        if cursor:
+            after_score, after_id = decode_cursor(cursor)
+            if not isinstance(after_id, int):
+                raise ValueError("Invalid cursor")
+            after = (after_score, after_id)
+
+        terms = tokenize(query)
+        backend = self.backend
+        if not terms:
+            hits = []
+        elif backend == 'fulltext':
+            hits = self._fulltext_hits(query, after, limit)
+        else:
+            hits = self._memory_hits(query, after, limit)
+
+        has_more = len(hits) > limit
+        hits = hits[:limit]
+
+        posts = {}
+        if hits:
+            posts = {post.id: post for post in BlogPost.query.filter(BlogPost.id.in_([post_id for post_id, _ in hits]))}
+
+        items = []
+        for post_id, score in hits:
+            post = posts.get(post_id)
+            if post is None:
+                continue
+            item = post.to_dict()
+            item.pop('content', None)
+            item['score'] = score
+            item['title_highlighted'] = highlight(post.title, terms)
+            item['snippet'] = make_snippet(' '.join(filter(None, [post.excerpt, post.content])),
+                                           terms, self.snippet_length)
+            items.append(item)
+
+        return {
+            'query': query,
+            'items': items,
+            'next_cursor': encode_cursor(hits[-1][1], hits[-1][0]) if has_more and hits else None,
+            'backend': backend
+        }
+
+
+# Initialize blog search
+blog_search = BlogSearch()
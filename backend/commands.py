@@ -0,0 +1,382 @@
+# CLI Commands for Wheeler Knight Portfolio
+# Maintenance jobs run with `flask <group> <command>` (e.g. from cron)
+import click
+from flask import Flask, current_app
+from flask.cli import AppGroup
+from models import db
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+analytics_cli = AppGroup('analytics', help='Analytics maintenance commands')
+related_cli = AppGroup('related', help='Related content commands')
+blog_cli = AppGroup('blog', help='Blog maintenance commands')
+feeds_cli = AppGroup('feeds', help='Static feed and sitemap commands')
+bake_cli = AppGroup('bake', help='Static API snapshot commands')
+auth_cli = AppGroup('auth', help='Authentication commands')
+uploads_cli = AppGroup('uploads', help='Uploaded file maintenance commands')
+
+
+@analytics_cli.command('maintain-partitions')
+@click.option('--retention-months', type=int, default=None,
+              help='Months of analytics to keep (defaults to ANALYTICS_RETENTION_MONTHS)')
+@click.option('--premake-months', type=int, default=None,
+              help='Future monthly partitions to create (defaults to ANALYTICS_PARTITION_PREMAKE_MONTHS)')
+@click.option('--archive/--drop', default=None,
+              help='Archive expired partitions into tables instead of dropping them')
+@click.option('--dry-run', is_flag=True, help='Report changes without applying them')
+def maintain_partitions(retention_months, premake_months, archive, dry_run):
+    """Create future analytics partitions and expire old ones"""
+    from analytics_partitions import run_maintenance
+
+    config = current_app.config
+    if archive is None:
+        archive = config['ANALYTICS_ARCHIVE_EXPIRED']
+
+    result = run_maintenance(
+        db,
+        retention_months=retention_months if retention_months is not None else config['ANALYTICS_RETENTION_MONTHS'],
+        premake_months=premake_months if premake_months is not None else config['ANALYTICS_PARTITION_PREMAKE_MONTHS'],
+        archive=archive,
+        dry_run=dry_run
+    )
+
+    prefix = '[dry run] ' if dry_run else ''
+    if not result['partitioned']:
+        click.echo(f"{prefix}analytics is not partitioned on this database; deleted {result['deleted_rows']} expired rows")
+        return
+
+    click.echo(f"{prefix}Created partitions: {', '.join(result['created']) or 'none'}")
+    for partition in result['expired']:
+        action = f"archived to {partition['archive_table'] or 'archive table'}" if archive else 'dropped'
+        click.echo(f"{prefix}Expired {partition['name']} (~{partition['rows']} rows): {action}")
+
+
+@analytics_cli.command('rollup')
+@click.option('--batch-size', type=int, default=None,
+              help='Raw rows aggregated per transaction (defaults to ANALYTICS_ROLLUP_BATCH_SIZE)')
+@click.option('--max-batches', type=int, default=None, help='Stop after this many batches')
+def rollup(batch_size, max_batches):
+    """Aggregate new analytics rows into the hourly and daily rollup tables"""
+    from analytics_rollup import run_rollup
+
+    config = current_app.config
+    result = run_rollup(
+        db,
+        batch_size=batch_size or config['ANALYTICS_ROLLUP_BATCH_SIZE'],
+        lag_seconds=config['ANALYTICS_ROLLUP_LAG_SECONDS'],
+        max_batches=max_batches
+    )
+    click.echo(
+        f"Aggregated {result['processed_rows']} rows in {result['batches']} batches "
+        f"(high-water mark: {result['last_id']})"
+    )
+
+
+@related_cli.command('refresh')
+@click.option('--full', is_flag=True, help='Recompute every row instead of only those affected by changes')
+def refresh_related_content(full):
+    """Recompute related blog posts and projects for changed content"""
+    from related_content import refresh_related
+
+    config = current_app.config
+    result = refresh_related(
+        db,
+        top_k=config['RELATED_TOP_K'],
+        min_score=config['RELATED_MIN_SCORE'],
+        full=full
+    )
+    click.echo(
+        f"{result['changed']} changed and {result['deleted']} deleted documents; "
+        f"recomputed {result['recomputed']} of {result['documents']} rows"
+    )
+
+
+@blog_cli.command('render')
+@click.option('--force', is_flag=True, help='Re-render every post even if its stored render is current')
+def render_blog_posts(force):
+    """Render blog post Markdown to HTML for posts whose render is missing or stale"""
+    from models.models import BlogPost
+
+    rendered = 0
+    for post in BlogPost.query.all():
+        if post.render_content(force=force):
+            rendered += 1
+    db.session.commit()
+    click.echo(f"Rendered {rendered} blog posts")
+
+
+@feeds_cli.command('generate')
+def generate_static_feeds():
+    """Write RSS/Atom feeds and sitemap.xml for changed content"""
+    from static_feeds import generate_feeds
+
+    result = generate_feeds(current_app)
+    written = ', '.join(result['written']) or 'nothing (all files current)'
+    click.echo(f"Rendered {result['rendered_entries']} entries; wrote {written} to {result['output_dir']}")
+
+
+
+@bake_cli.command('run')
+@click.option('--full', is_flag=True, help='Render every public endpoint instead of only changed tables')
+def bake_static_snapshots(full):
+    """Write JSON snapshots of public API endpoints for nginx to serve"""
+    from static_bake import bake_snapshots
+
+    result = bake_snapshots(current_app, full=full)
+    click.echo(
+        f"{result['written']} written, {result['unchanged']} unchanged, "
+        f"{result['removed']} removed in {result['output_dir']}"
+    )
+
+
+@auth_cli.command('benchmark-bcrypt')
+@click.option('--rounds', '-r', multiple=True, type=int, help='bcrypt costs to measure (default: 10 to 13)')
+@click.option('--concurrency', '-c', default=4, show_default=True, help='Simultaneous logins')
+@click.option('--seconds', '-s', default=3.0, show_default=True, help='Measurement time per cost')
+def benchmark_bcrypt(rounds, concurrency, seconds):
+    """Measure password checks per second through the hashing pool at each bcrypt cost
+
+    Each login performs one check, so this is the login throughput ceiling
+    of one process with the configured BCRYPT_POOL_SIZE.
+    """
+    import threading
+    import time
+    from password_hashing import password_hasher, PasswordHasherBusy
+
+    password = 'Benchmark-Passw0rd!'
+    click.echo(
+        f"pool_size={password_hasher.pool_size} max_pending={password_hasher.max_pending} "
+        f"concurrency={concurrency} configured_rounds={password_hasher.rounds}"
+    )
+    click.echo(f"{'rounds':>6} {'latency_ms':>11} {'logins/s':>9} {'busy':>5}")
+
+    for cost in rounds or (10, 11, 12, 13):
+        password_hash = password_hasher.hash(password, rounds=cost)
+
+        started = time.perf_counter()
+        password_hasher.verify(password, password_hash)
+        latency = time.perf_counter() - started
+
+        completed = [0]
+        busy = [0]
+        lock = threading.Lock()
+        deadline = time.perf_counter() + seconds
+
+        def worker():
+            while time.perf_counter() < deadline:
+                try:
+                    password_hasher.verify(password, password_hash)
+                    done = completed
+                except PasswordHasherBusy:
+                    done = busy
+                with lock:
+                    done[0] += 1
+
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        click.echo(f"{cost:>6} {latency * 1000:>11.1f} {completed[0] / elapsed:>9.1f} {busy[0]:>5}")
+
+
+@auth_cli.command('benchmark-jwt')
+@click.option('--requests', '-n', 'iterations', default=5000, show_default=True, help='Authenticated requests per run')
+def benchmark_jwt(iterations):
+    """Measure per-request JWT verification overhead with and without the claims cache
+
+    Runs verify_jwt_in_request plus get_current_user, which is what
+    admin_required does before touching the database, for one token.
+    """
+    import time
+    from flask_jwt_extended import create_access_token, verify_jwt_in_request
+    from auth import get_current_user
+    from jwt_claims_cache import verified_claims_cache
+
+    app = current_app._get_current_object()
+    token = create_access_token(identity='1', additional_claims={'username': 'benchmark', 'role': 'admin', 'user_id': 1})
+    headers = {'Authorization': f'Bearer {token}'}
+    configured_size = verified_claims_cache.max_entries
+
+    click.echo(f"{'cache':>8} {'us/request':>11} {'requests/s':>11}")
+    try:
+        for label, size in (('off', 0), ('on', configured_size or 512)):
+            verified_claims_cache.max_entries = size
+            verified_claims_cache.clear()
+            started = time.perf_counter()
+            for _ in range(iterations):
+                with app.test_request_context('/api/auth/me', headers=headers):
+                    verify_jwt_in_request()
+                    get_current_user()
+            elapsed = time.perf_counter() - started
+            click.echo(f"{label:>8} {elapsed / iterations * 1e6:>11.1f} {iterations / elapsed:>11.0f}")
+    finally:
+        verified_claims_cache.max_entries = configured_size
+        verified_claims_cache.clear()
+
+
+@uploads_cli.command('backfill')
+def backfill_upload_index():
+    """Index files already in UPLOAD_FOLDER and rebuild which content links to them"""
+    from upload_index import backfill_uploads
+    from image_placeholders import image_placeholders
+    from static_bake import bake_snapshots
+
+    result = backfill_uploads(current_app)
+    click.echo(
+        f"Upload index: {result['added']} added, {result['removed']} removed, "
+        f"{result['placeholders']} placeholders, {result['references']} references, "
+        f"{result['public']} public"
+    )
+
+    # Published snapshots embed image placeholders
+    if result['added'] or result['placeholders']:
+        image_placeholders.invalidate()
+        bake_snapshots(current_app, full=True)
+
+
+@uploads_cli.command('purge-sessions')
+def purge_upload_sessions():
+    """Delete expired resumable upload sessions and their partial files"""
+    from upload_sessions import resumable_uploads
+
+    click.echo(f"Purged {resumable_uploads.purge_expired()} expired upload sessions")
+
+
+@uploads_cli.command('variants')
+@click.option('--force', is_flag=True, help='Rebuild variants that already exist')
+def build_image_variants(force):
+    """Build responsive variants for every content-addressed image that lacks them"""
+    from concurrent.futures import wait
+    from image_variants import image_variants
+    from static_bake import bake_snapshots
+
+    images_dir = os.path.join(image_variants.upload_folder, 'images')
+    futures = []
+    for root, _, filenames in os.walk(images_dir):
+        for filename in filenames:
+            file_path = os.path.join(root, filename)
+            relative = os.path.relpath(file_path, image_variants.upload_folder).replace(os.sep, '/')
+            content_hash = image_variants.content_hash(f"/uploads/{relative}")
+            if content_hash:
+                future = image_variants.submit(file_path, content_hash, force=force)
+                if future is not None:
+                    futures.append(future)
+
+    wait(futures)
+    failed = sum(1 for future in futures if future.exception())
+    click.echo(f"Image variants: {len(futures) - failed} built, {failed} failed")
+
+    # Published snapshots embed the new srcset fields
+    if futures:
+        bake_snapshots(current_app, full=True)
+
+
+
+@uploads_cli.command('optimize')
+@click.option('--limit', type=int, default=None, help='Optimize at most this many images')
+@click.option('--keep-originals', is_flag=True, help='Leave the unoptimized files on disk')
+def optimize_stored_images(limit, keep_originals):
+    """Optimize indexed JPEG/PNG uploads stored before optimization ran
+
+    Each optimized file is stored at its own content address and the posts,
+    projects and interests linking to the old URL are rewritten, so cached
+    copies of the old immutable URL stay correct. The old file and its
+    variants are then deleted unless --keep-originals is given.
+    """
+    from concurrent.futures import FIRST_COMPLETED, wait
+    from models import db
+    from models.models import Upload
+    from image_optimizer import image_optimizer
+    from image_variants import image_variants
+    from upload_index import move_upload
+    from upload_publishing import upload_publisher
+    from upload_storage import content_store
+    from static_bake import bake_snapshots
+
+    query = Upload.query.filter(
+        Upload.mime_type.in_(('image/jpeg', 'image/png')), Upload.original_size.is_(None)
+    ).order_by(Upload.id)
+    uploads = query.limit(limit).all() if limit else query.all()
+
+    def file_path(upload):
+        return os.path.join(content_store.upload_folder, *upload.relative_path.split('/'))
+
+    moved = []
+
+    def finish(upload, future):
+        if future.exception():
+            click.echo(f"  {upload.relative_path}: failed ({future.exception()})")
+            return 0
+        result = future.result()
+        if result is None:
+            upload.original_size = upload.file_size
+            db.session.commit()
+            return 0
+
+        old_path, old_file = upload.relative_path, file_path(upload)
+        stored = content_store.commit_file(
+            result['file_path'], result['content_hash'], result['file_size'],
+            old_path.split('/', 1)[0], result['ext']
+        )
+        move_upload(upload, stored, result['original_size'])
+        db.session.commit()
+        moved.append((old_path, old_file, stored))
+
+        saved = result['original_size'] - result['file_size']
+        click.echo(f"  {old_path} -> {stored.relative_path}: "
+                   f"{result['original_size']} -> {result['file_size']} bytes (-{saved})")
+        return saved
+
+    pending = {}
+    total_saved = 0
+    for upload in uploads:
+        while True:
+            future = image_optimizer.submit(file_path(upload), content_store.incoming_dir)
+            if future is not None:
+                pending[future] = upload
+                break
+            # Pool backlog is full; wait for a slot
+            done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            for finished in done:
+                total_saved += finish(pending.pop(finished), finished)
+
+    done, _ = wait(list(pending))
+    for finished in done:
+        total_saved += finish(pending[finished], finished)
+
+    variant_builds = []
+    for old_path, old_file, stored in moved:
+        future = image_variants.submit(stored.file_path, stored.content_hash)
+        if future is not None:
+            variant_builds.append(future)
+        if not keep_originals:
+            old_hash = image_variants.content_hash(f"/uploads/{old_path}")
+            if old_hash:
+                image_variants.remove(old_hash)
+            if os.path.exists(old_file):
+                os.remove(old_file)
+    wait(variant_builds)
+
+    click.echo(f"Image optimization: {len(uploads)} files checked, {len(moved)} moved, {total_saved} bytes saved")
+
+    # Link the new files into the public tree; published snapshots embed their URLs
+    if moved:
+        upload_publisher.publish()
+        bake_snapshots(current_app, full=True)
+
+
+def register_commands(app: Flask):
+    """Register all CLI command groups with the Flask app"""
+    app.cli.add_command(analytics_cli)
+    app.cli.add_command(related_cli)
+    app.cli.add_command(blog_cli)
+    app.cli.add_command(feeds_cli)
+    app.cli.add_command(bake_cli)
+    app.cli.add_command(auth_cli)
+    app.cli.add_command(uploads_cli)
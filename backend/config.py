@@ -39,15 +39,104 @@ class Config:
     
     # Analytics Configuration
     GOOGLE_ANALYTICS_ID: Optional[str] = os.getenv('GOOGLE_ANALYTICS_ID')
+    ANALYTICS_RETENTION_MONTHS: int = int(os.getenv('ANALYTICS_RETENTION_MONTHS', '13'))
+    ANALYTICS_PARTITION_PREMAKE_MONTHS: int = int(os.getenv('ANALYTICS_PARTITION_PREMAKE_MONTHS', '3'))
+    ANALYTICS_ARCHIVE_EXPIRED: bool = os.getenv('ANALYTICS_ARCHIVE_EXPIRED', 'False').lower() == 'true'
+    ANALYTICS_ROLLUP_BATCH_SIZE: int = int(os.getenv('ANALYTICS_ROLLUP_BATCH_SIZE', '5000'))
+    ANALYTICS_ROLLUP_LAG_SECONDS: int = int(os.getenv('ANALYTICS_ROLLUP_LAG_SECONDS', '60'))
+    ANALYTICS_QUEUE_SIZE: int = int(os.getenv('ANALYTICS_QUEUE_SIZE', '10000'))
+    ANALYTICS_BATCH_SIZE: int = int(os.getenv('ANALYTICS_BATCH_SIZE', '500'))
+    ANALYTICS_FLUSH_INTERVAL: float = float(os.getenv('ANALYTICS_FLUSH_INTERVAL', '2.0'))  # seconds
+    ANALYTICS_ENQUEUE_TIMEOUT: float = float(os.getenv('ANALYTICS_ENQUEUE_TIMEOUT', '0'))  # 0 = drop when full
+    ANALYTICS_SAMPLE_RATE: float = float(os.getenv('ANALYTICS_SAMPLE_RATE', '1.0'))  # fraction of beacons kept
+    ANALYTICS_BEACON_MAX_EVENTS: int = int(os.getenv('ANALYTICS_BEACON_MAX_EVENTS', '50'))
+    ANALYTICS_BEACON_MAX_BYTES: int = int(os.getenv('ANALYTICS_BEACON_MAX_BYTES', '65536'))
+    
+    # Search Configuration
+    BLOG_SEARCH_BACKEND: str = os.getenv('BLOG_SEARCH_BACKEND', 'auto')  # auto, fulltext (MySQL) or memory
+    BLOG_SEARCH_REFRESH_SECONDS: int = int(os.getenv('BLOG_SEARCH_REFRESH_SECONDS', '30'))
+    BLOG_SEARCH_SNIPPET_LENGTH: int = int(os.getenv('BLOG_SEARCH_SNIPPET_LENGTH', '200'))
+    SEARCH_INDEX_PATH: str = os.getenv('SEARCH_INDEX_PATH', 'data/search_index.json')
+    SEARCH_REFRESH_SECONDS: int = int(os.getenv('SEARCH_REFRESH_SECONDS', '30'))
+    SEARCH_SNIPPET_LENGTH: int = int(os.getenv('SEARCH_SNIPPET_LENGTH', '160'))
+    RELATED_TOP_K: int = int(os.getenv('RELATED_TOP_K', '5'))
+    RELATED_MIN_SCORE: float = float(os.getenv('RELATED_MIN_SCORE', '0.05'))
+    RELATED_UPDATE_DELAY: float = float(os.getenv('RELATED_UPDATE_DELAY', '2.0'))  # seconds; -1 = cron only
+    
+    # Static Feeds Configuration (RSS/Atom and sitemap.xml served by nginx)
+    FEEDS_OUTPUT_DIR: str = os.getenv('FEEDS_OUTPUT_DIR', 'public/')
+    FEEDS_MAX_ITEMS: int = int(os.getenv('FEEDS_MAX_ITEMS', '20'))
+    FEEDS_UPDATE_DELAY: float = float(os.getenv('FEEDS_UPDATE_DELAY', '2.0'))  # seconds; -1 = cron only
+    
+    # Static API Snapshot Configuration (public GET JSON baked for nginx)
+    BAKE_OUTPUT_DIR: str = os.getenv('BAKE_OUTPUT_DIR', 'public/')
+    BAKE_UPDATE_DELAY: float = float(os.getenv('BAKE_UPDATE_DELAY', '5.0'))  # seconds; -1 = cron only
     
     # File Upload Configuration
     MAX_FILE_SIZE: int = int(os.getenv('MAX_FILE_SIZE', '10485760'))  # 10MB
     UPLOAD_FOLDER: str = os.getenv('UPLOAD_FOLDER', 'uploads/')
+    UPLOAD_CHUNK_SIZE: int = int(os.getenv('UPLOAD_CHUNK_SIZE', '65536'))  # bytes read per streaming step
+    
+    # Resumable uploads (init, PUT chunks at offsets, complete)
+    UPLOAD_RESUMABLE_MAX_SIZE: int = int(os.getenv('UPLOAD_RESUMABLE_MAX_SIZE', str(200 * 1024 * 1024)))  # 200MB
+    UPLOAD_RESUMABLE_CHUNK_SIZE: int = int(os.getenv('UPLOAD_RESUMABLE_CHUNK_SIZE', str(8 * 1024 * 1024)))  # 8MB per PUT
+    UPLOAD_SESSION_TTL_HOURS: int = int(os.getenv('UPLOAD_SESSION_TTL_HOURS', '24'))  # idle sessions expire
+    
+    # Downloads: internal nginx location that serves UPLOAD_FOLDER ('' = send files from Flask)
+    UPLOAD_ACCEL_REDIRECT_PREFIX: str = os.getenv('UPLOAD_ACCEL_REDIRECT_PREFIX', '')
+    
+    # Responsive image variants (built in a process pool after upload; each gunicorn
+    # worker starts its own pool, so expect workers x IMAGE_VARIANT_WORKERS processes)
+    IMAGE_VARIANT_WIDTHS: list = [int(w) for w in os.getenv('IMAGE_VARIANT_WIDTHS', '320,640,960,1280,1920').split(',') if w.strip()]
+    IMAGE_VARIANT_FORMATS: list = [f.strip().lower() for f in os.getenv('IMAGE_VARIANT_FORMATS', 'avif,webp').split(',') if f.strip()]
+    IMAGE_VARIANT_QUALITY: int = int(os.getenv('IMAGE_VARIANT_QUALITY', '80'))
+    IMAGE_VARIANT_WORKERS: int = int(os.getenv('IMAGE_VARIANT_WORKERS', '2'))
+    
+    # Image optimization (metadata stripped and re-encoded in a process pool before storing).
+    # Per gunicorn worker: IMAGE_VARIANT_WORKERS + IMAGE_OPTIMIZE_WORKERS image processes
+    IMAGE_OPTIMIZE_ENABLED: bool = os.getenv('IMAGE_OPTIMIZE_ENABLED', 'True').lower() == 'true'
+    IMAGE_OPTIMIZE_JPEG_QUALITY: int = int(os.getenv('IMAGE_OPTIMIZE_JPEG_QUALITY', '85'))
+    IMAGE_OPTIMIZE_PNG_COLORS: int = int(os.getenv('IMAGE_OPTIMIZE_PNG_COLORS', '0'))  # 0 = lossless; else quantize
+    IMAGE_OPTIMIZE_PNG_TO_WEBP: bool = os.getenv('IMAGE_OPTIMIZE_PNG_TO_WEBP', 'True').lower() == 'true'
+    IMAGE_OPTIMIZE_WORKERS: int = int(os.getenv('IMAGE_OPTIMIZE_WORKERS', '2'))
+    IMAGE_OPTIMIZE_TIMEOUT: float = float(os.getenv('IMAGE_OPTIMIZE_TIMEOUT', '15'))  # seconds; then stored as uploaded
+    
+    # Upload metadata: delay before re-linking uploads to edited content
+    UPLOAD_REFERENCE_DELAY: float = float(os.getenv('UPLOAD_REFERENCE_DELAY', '1.0'))  # seconds; -1 = backfill only
     
     # Security Configuration
     JWT_ACCESS_TOKEN_EXPIRES: int = int(os.getenv('JWT_ACCESS_TOKEN_EXPIRES', '3600'))  # 1 hour
     JWT_REFRESH_TOKEN_EXPIRES: int = int(os.getenv('JWT_REFRESH_TOKEN_EXPIRES', '2592000'))  # 30 days
     
+    # Password Hashing Configuration
+    BCRYPT_ROUNDS: int = int(os.getenv('BCRYPT_ROUNDS', '12'))  # stored hashes at other costs are upgraded on login
+    BCRYPT_POOL_SIZE: int = int(os.getenv('BCRYPT_POOL_SIZE', '2'))  # concurrent hashes per process
+    BCRYPT_MAX_PENDING: int = int(os.getenv('BCRYPT_MAX_PENDING', '16'))  # queued hashes before rejecting
+    BCRYPT_TIMEOUT: float = float(os.getenv('BCRYPT_TIMEOUT', '10.0'))  # seconds
+    
+    # Admin user records cached per process for auth checks (dropped on change)
+    ADMIN_USER_CACHE_TTL: float = float(os.getenv('ADMIN_USER_CACHE_TTL', '30'))  # seconds; 0 = disabled
+    
+    # JWT revocation list, checked in memory and synced from the shared store
+    TOKEN_REVOCATION_STORAGE: str = os.getenv('TOKEN_REVOCATION_STORAGE', 'auto')  # auto, redis or database
+    TOKEN_REVOCATION_SYNC_SECONDS: float = float(os.getenv('TOKEN_REVOCATION_SYNC_SECONDS', '2.0'))
+    
+    # Verified JWT claims cached per process until token expiry
+    JWT_CLAIMS_CACHE_SIZE: int = int(os.getenv('JWT_CLAIMS_CACHE_SIZE', '512'))  # 0 = disabled
+    
+    # Login Throttling Configuration
+    LOGIN_THROTTLE_ENABLED: bool = os.getenv('LOGIN_THROTTLE_ENABLED', 'True').lower() == 'true'
+    LOGIN_THROTTLE_STORAGE: str = os.getenv('LOGIN_THROTTLE_STORAGE', 'auto')  # auto, memory or redis
+    LOGIN_THROTTLE_WINDOW: int = int(os.getenv('LOGIN_THROTTLE_WINDOW', '900'))  # seconds
+    LOGIN_THROTTLE_IP_LIMIT: int = int(os.getenv('LOGIN_THROTTLE_IP_LIMIT', '20'))  # failures per window
+    LOGIN_THROTTLE_USERNAME_LIMIT: int = int(os.getenv('LOGIN_THROTTLE_USERNAME_LIMIT', '5'))
+    LOGIN_THROTTLE_BASE_DELAY: int = int(os.getenv('LOGIN_THROTTLE_BASE_DELAY', '30'))  # doubles per extra failure
+    LOGIN_THROTTLE_MAX_DELAY: int = int(os.getenv('LOGIN_THROTTLE_MAX_DELAY', '900'))
+    LOGIN_THROTTLE_PROXY_COUNT: int = int(os.getenv('LOGIN_THROTTLE_PROXY_COUNT', '0'))  # proxies in X-Forwarded-For
+    
+    # Shared Cache Configuration
+    REDIS_URL: str = os.getenv('REDIS_URL', '')
+    
     # Production URLs
     PRODUCTION_DOMAIN: str = os.getenv('PRODUCTION_DOMAIN', 'wheelerknight.com')
     PRODUCTION_API_URL: str = os.getenv('PRODUCTION_API_URL', 'https://wheelerknight.com/api')
@@ -108,6 +197,11 @@ class TestingConfig(Config):
     TESTING = True
     DB_NAME = 'wheelerknight_test'
 
+    @classmethod
+    def get_database_uri(cls) -> str:
+        """TEST_DATABASE_URL when set (e.g. a SQLite file), else the MySQL test database"""
+        return os.getenv('TEST_DATABASE_URL') or super().get_database_uri()
+
 # Configuration mapping
 config = {
     'development': DevelopmentConfig,
@@ -0,0 +1,193 @@
+# Content Change Events for Wheeler Knight Portfolio
+# Collects ORM changes during flush and hands them to subscribers after commit
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from datetime import datetime
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = 'content_events.pending'
+
+
+def table_signature(models: Iterable[type], connection=None) -> List[Any]:
+    """Row count and last update time of each model's table, read in a single query
+
+    Comparing signatures is a cheap way for a process to notice writes it did
+    not see as events: other workers, bulk updates and manual SQL. Read-side
+    counters (BlogPost views and likes) are written without touching
+    updated_at, so only content edits move a signature.
+    """
+    from models import db
+
+    columns = []
+    for model in models:
+        table = model.__table__
+        columns.append(db.select(db.func.count(table.c.id)).scalar_subquery())
+        columns.append(db.select(db.func.max(table.c.updated_at)).scalar_subquery())
+
+    statement = db.select(*columns)
+    row = (connection.execute(statement) if connection is not None else db.session.execute(statement)).one()
+    return [value.isoformat() if isinstance(value, datetime) else value for value in row]
+
+
+class ContentChange(NamedTuple):
+    """One committed change to a watched model"""
+    model: str
+    id: int
+    deleted: bool
+    snapshot: Any
+
+
+class _Subscription(NamedTuple):
+    models: Dict[type, Tuple[str, ...]]
+    snapshot: Callable[[Any], Any]
+    callback: Callable[[List[ContentChange]], None]
+
+
+class ContentEvents:
+    """Dispatch committed inserts, updates and deletes of watched models
+
+    Attributes are expired and the session cannot emit SQL by the time
+    after_commit fires, so each subscriber's snapshot function runs during
+    flush and only its result is delivered. Bulk query.update() and
+    query.delete() calls bypass the ORM unit of work and are not reported.
+    """
+
+    def __init__(self):
+        self._subscriptions: List[_Subscription] = []
+        self._registered = False
+
+    def subscribe(self, models: Dict[type, Iterable[str]], snapshot: Callable[[Any], Any],
+                  callback: Callable[[List[ContentChange]], None]) -> None:
+        """Call callback with the changes to models after every successful commit
+
+        models maps each watched model to the attribute names that matter;
+        updates touching only other attributes (such as view counters) are
+        ignored.
+        """
+        self._subscriptions.append(_Subscription(
+            {model: tuple(fields) for model, fields in models.items()}, snapshot, callback
+        ))
+        self._register()
+
+    def _register(self) -> None:
+        if self._registered:
+            return
+        event.listen(Session, 'after_flush', self._after_flush)
+        event.listen(Session, 'after_commit', self._after_commit)
+        event.listen(Session, 'after_soft_rollback', self._after_rollback)
+        self._registered = True
+
+    @staticmethod
+    def _changed(instance, fields: Tuple[str, ...]) -> bool:
+        attributes = inspect(instance).attrs
+        return any(attributes[field].history.has_changes() for field in fields)
+
+    def _after_flush(self, session, flush_context) -> None:
+        pending: Optional[Dict[Tuple[int, str, int], ContentChange]] = None
+
+        for index, subscription in enumerate(self._subscriptions):
+            for instance, deleted in self._flushed(session):
+                fields = subscription.models.get(type(instance))
+                if fields is None:
+                    continue
+                if instance not in session.new and not deleted and not self._changed(instance, fields):
+                    continue
+                if pending is None:
+                    pending = session.info.setdefault(PENDING_KEY, {})
+
+                try:
+                    snapshot = None if deleted else subscription.snapshot(instance)
+                except Exception as e:
+                    logger.error(f"Failed to snapshot {type(instance).__name__} {instance.id}: {e}")
+                    continue
+
+                # Later flushes in the same transaction supersede earlier ones
+                key = (index, type(instance).__name__, instance.id)
+                pending[key] = ContentChange(type(instance).__name__, instance.id, deleted, snapshot)
+
+    @staticmethod
+    def _flushed(session):
+        for instance in session.new:
+            yield instance, False
+        for instance in session.dirty:
+            yield instance, False
+        for instance in session.deleted:
+            yield instance, True
+
+    def _after_commit(self, session) -> None:
+        pending = session.info.pop(PENDING_KEY, None)
+        if not pending:
+            return
+
+        by_subscription: Dict[int, List[ContentChange]] = {}
+        for (index, _, _), change in pending.items():
+            by_subscription.setdefault(index, []).append(change)
+
+        for index, changes in by_subscription.items():
+            try:
+                self._subscriptions[index].callback(changes)
+            except Exception as e:
+                logger.error(f"Content change subscriber failed: {e}")
+
+    @staticmethod
+    def _after_rollback(session, previous_transaction) -> None:
+        if previous_transaction.parent is None:
+            session.info.pop(PENDING_KEY, None)
+
+
+# Initialize content change events
+content_events = ContentEvents()
+
+
+class DebouncedJob:
+    """Run a job in the background shortly after commits to watched models
+
+    A burst of edits restarts the timer, so the job runs once after the
+    last commit. job is called inside an app context with the app.
+    """
+
+    def __init__(self, name: str, job: Callable[[Any], Any], watched: Dict[str, Iterable[str]]):
+        self.name = name
+        self.job = job
+        self.watched = watched
+        self.app = None
+        self.delay = 2.0
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app, delay: float = 2.0):
+        """Subscribe to the watched models; a negative delay disables automatic runs"""
+        from models import models
+
+        self.app = app
+        self.delay = delay
+        if delay < 0:
+            return
+
+        content_events.subscribe(
+            {getattr(models, name): fields for name, fields in self.watched.items()},
+            lambda instance: None,
+            self.trigger
+        )
+
+    def trigger(self, changes=None) -> None:
+        """Schedule a run, replacing any run that has not started yet"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.delay, self._run)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _run(self) -> None:
+        with self._lock:
+            self._timer = None
+        try:
+            with self.app.app_context():
+                self.job(self.app)
+        except Exception as e:
+            logger.error(f"Background {self.name} job failed: {e}")
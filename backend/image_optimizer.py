@@ -0,0 +1,229 @@
+# Image Optimization for Wheeler Knight Portfolio
+# Uploaded JPEGs and PNGs are re-encoded without metadata in a bounded process
+# pool before they are stored; the smaller encoding wins, the original is kept
+# otherwise
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from typing import Dict, Any, NamedTuple, Optional
+import hashlib
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Formats that are re-encoded (GIFs may be animated, WebP/SVG are left alone)
+OPTIMIZABLE_EXTENSIONS = {'.jpg', '.jpeg', '.png'}
+
+FILE_EXTENSIONS = {'jpeg': '.jpg', 'png': '.png', 'webp': '.webp'}
+
+
+class OptimizedImage(NamedTuple):
+    """A re-encoded temp file ready to be stored"""
+    file_path: str
+    ext: str
+    content_hash: str
+    file_size: int
+    original_size: int
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.original_size - self.file_size
+
+
+def optimize_image(source_path: str, output_dir: str, jpeg_quality: int, png_colors: int,
+                   png_to_webp: bool) -> Optional[Dict[str, Any]]:
+    """Re-encode one image without metadata (runs in a pool process)
+
+    EXIF orientation is applied to the pixels before EXIF is dropped; the
+    ICC profile is kept so colours do not shift. JPEGs are recompressed at
+    jpeg_quality, PNGs are optimized losslessly (or quantized to png_colors
+    when non-zero) and, with png_to_webp, also tried as lossless WebP. The
+    smallest candidate is written to output_dir and described; None means
+    nothing beat the original.
+    """
+    from PIL import Image, ImageOps
+    Image.init()
+
+    original_size = os.path.getsize(source_path)
+    with Image.open(source_path) as opened:
+        source_format = opened.format
+        if source_format not in ('JPEG', 'PNG') or getattr(opened, 'is_animated', False):
+            return None
+        icc_profile = opened.info.get('icc_profile')
+        image = ImageOps.exif_transpose(opened)
+        image.load()
+
+    # Only what the encoders need to reproduce the pixels survives
+    image.info = {key: value for key, value in image.info.items() if key == 'transparency'}
+    options: Dict[str, Any] = {'icc_profile': icc_profile} if icc_profile else {}
+
+    candidates = []
+    if source_format == 'JPEG':
+        if image.mode not in ('RGB', 'L', 'CMYK'):
+            image = image.convert('RGB')
+        candidates.append(('jpeg', image, dict(options, quality=jpeg_quality, optimize=True, progressive=True)))
+    else:
+        png_image = image
+        if png_colors and image.mode in ('RGB', 'RGBA'):
+            method = Image.Quantize.FASTOCTREE if image.mode == 'RGBA' else Image.Quantize.MEDIANCUT
+            png_image = image.quantize(colors=png_colors, method=method)
+        candidates.append(('png', png_image, dict(options, optimize=True)))
+        if png_to_webp and 'WEBP' in Image.SAVE:
+            webp_image = image
+            if webp_image.mode not in ('RGB', 'RGBA'):
+                webp_image = webp_image.convert('RGBA' if 'A' in webp_image.mode or 'transparency' in webp_image.info else 'RGB')
+            candidates.append(('webp', webp_image, dict(options, lossless=True, quality=100, method=6)))
+
+    best = None
+    for fmt, frame, save_options in candidates:
+        handle, path = tempfile.mkstemp(dir=output_dir, prefix='optimize-', suffix='.part')
+        with os.fdopen(handle, 'wb') as f:
+            frame.save(f, fmt.upper(), **save_options)
+        size = os.path.getsize(path)
+        if size < original_size and (best is None or size < best[2]):
+            if best is not None:
+                os.remove(best[1])
+            best = (fmt, path, size)
+        else:
+            os.remove(path)
+
+    if best is None:
+        return None
+
+    fmt, path, size = best
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            sha256.update(chunk)
+    return {
+        'file_path': path,
+        'ext': FILE_EXTENSIONS[fmt],
+        'content_hash': sha256.hexdigest(),
+        'file_size': size,
+        'original_size': original_size
+    }
+
+
+class ImageOptimizer:
+    """Run optimize_image in a small per-process pool with a bounded backlog
+
+    At most two jobs per worker are in flight; an upload that finds the
+    pool saturated, or whose job outlives IMAGE_OPTIMIZE_TIMEOUT, is stored
+    as uploaded and left for 'flask uploads optimize'.
+    """
+
+    def __init__(self, app=None):
+        self.enabled = True
+        self.jpeg_quality = 85
+        self.png_colors = 0
+        self.png_to_webp = True
+        self.workers = 2
+        self.timeout = 15.0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.workers * 2)
+        self._counters = {'optimized': 0, 'unchanged': 0, 'skipped': 0, 'failed': 0, 'bytes_saved': 0}
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Configure quality settings and pool size from the Flask app config"""
+        self.enabled = app.config.get('IMAGE_OPTIMIZE_ENABLED', True)
+        self.jpeg_quality = app.config.get('IMAGE_OPTIMIZE_JPEG_QUALITY', 85)
+        self.png_colors = app.config.get('IMAGE_OPTIMIZE_PNG_COLORS', 0)
+        self.png_to_webp = app.config.get('IMAGE_OPTIMIZE_PNG_TO_WEBP', True)
+        self.workers = app.config.get('IMAGE_OPTIMIZE_WORKERS', 2)
+        self.timeout = app.config.get('IMAGE_OPTIMIZE_TIMEOUT', 15.0)
+        self._slots = threading.BoundedSemaphore(self.workers * 2)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Created lazily per process; pools do not survive a gunicorn fork.
+        # Forkserver children never inherit locks held by this worker's threads
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context('forkserver')
+                )
+                self._pid = os.getpid()
+            return self._executor
+
+    def submit(self, file_path: str, output_dir: str, png_to_webp: Optional[bool] = None) -> Optional[Future]:
+        """Queue one optimization, or None when the pool's backlog is full"""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._counters['skipped'] += 1
+            return None
+        try:
+            future = self._get_executor().submit(
+                optimize_image, file_path, output_dir, self.jpeg_quality, self.png_colors,
+                self.png_to_webp if png_to_webp is None else png_to_webp
+            )
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(self._finished)
+        return future
+
+    def _finished(self, future: Future) -> None:
+        self._slots.release()
+        error = None if future.cancelled() else future.exception()
+        result = None if future.cancelled() or error else future.result()
+        with self._lock:
+            if error:
+                self._counters['failed'] += 1
+            elif result:
+                self._counters['optimized'] += 1
+                self._counters['bytes_saved'] += result['original_size'] - result['file_size']
+            else:
+                self._counters['unchanged'] += 1
+        if error:
+            logger.error(f"Image optimization failed: {error}")
+
+    def optimize(self, file_path: str, ext: str, output_dir: str) -> Optional[OptimizedImage]:
+        """Optimize a received file before it is stored; None keeps it as uploaded"""
+        if not self.enabled or ext.lower() not in OPTIMIZABLE_EXTENSIONS:
+            return None
+
+        future = self.submit(file_path, output_dir)
+        if future is None:
+            logger.warning(f"Image optimization pool busy; storing {os.path.basename(file_path)} as uploaded")
+            return None
+        try:
+            result = future.result(timeout=self.timeout)
+        except FutureTimeout:
+            # The job keeps running; drop whatever it writes
+            future.add_done_callback(self._discard_output)
+            logger.warning(f"Image optimization timed out after {self.timeout}s; storing as uploaded")
+            return None
+        except Exception:
+            return None
+        return OptimizedImage(**result) if result else None
+
+    @staticmethod
+    def _discard_output(future: Future) -> None:
+        if future.cancelled() or future.exception() or not future.result():
+            return
+        try:
+            os.remove(future.result()['file_path'])
+        except FileNotFoundError:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Get optimization counters for monitoring"""
+        with self._lock:
+            counters = dict(self._counters)
+        counters.update({
+            'enabled': self.enabled,
+            'jpeg_quality': self.jpeg_quality,
+            'png_colors': self.png_colors,
+            'png_to_webp': self.png_to_webp,
+            'workers': self.workers
+        })
+        return counters
+
+
+# Initialize upload image optimization
+image_optimizer = ImageOptimizer()
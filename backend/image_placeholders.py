@@ -0,0 +1,119 @@
+# Image Placeholders for Wheeler Knight Portfolio
+# A few-hundred-byte blurred thumbnail of each uploaded image, computed once
+# when the file is indexed and inlined by serializers as a data URI so the
+# first paint can show the image's colours before it loads
+from typing import Dict, Iterable, List, Optional, Tuple
+import base64
+import io
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Longest side of the thumbnail in pixels; the browser scales and blurs it
+PLACEHOLDER_SIZE = 16
+PLACEHOLDER_QUALITY = 40
+
+
+def make_placeholder(file_path: str) -> Optional[str]:
+    """data: URI of a tiny thumbnail of a raster image, or None if unreadable"""
+    from PIL import Image, ImageOps
+
+    try:
+        with Image.open(file_path) as opened:
+            # JPEG decodes at a reduced scale, so large photos stay cheap
+            opened.draft('RGB', (PLACEHOLDER_SIZE * 4, PLACEHOLDER_SIZE * 4))
+            image = ImageOps.exif_transpose(opened)
+            image.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE), Image.LANCZOS)
+    except Exception as e:
+        logger.warning(f"Could not build placeholder for {file_path}: {e}")
+        return None
+
+    has_alpha = 'A' in image.mode or 'transparency' in image.info
+    image = image.convert('RGBA' if has_alpha else 'RGB')
+
+    buffer = io.BytesIO()
+    Image.init()
+    if 'WEBP' in Image.SAVE:
+        image.save(buffer, 'WEBP', quality=PLACEHOLDER_QUALITY, method=6)
+        mime_type = 'image/webp'
+    else:
+        image.save(buffer, 'PNG', optimize=True)
+        mime_type = 'image/png'
+    return f"data:{mime_type};base64,{base64.b64encode(buffer.getvalue()).decode('ascii')}"
+
+
+class ImagePlaceholders:
+    """Per-process lookup of stored placeholders by image URL
+
+    Placeholders never change for a given upload path, so found entries
+    stay until evicted; misses are remembered briefly so content linking
+    to unindexed files does not query on every serialization.
+    """
+
+    def __init__(self, max_entries: int = 2048, miss_ttl: float = 60.0):
+        self.max_entries = max_entries
+        self.miss_ttl = miss_ttl
+        self._entries: Dict[str, Tuple[float, Optional[str]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def relative_path(url: Optional[str]) -> Optional[str]:
+        from upload_index import UPLOAD_URL
+
+        match = UPLOAD_URL.search(url or '')
+        return match.group(1) if match and match.group(1).startswith('images/') else None
+
+    def get(self, url: Optional[str]) -> Optional[str]:
+        """Placeholder data URI for an uploaded image URL, or None"""
+        return self.get_many([url])[0]
+
+    def get_many(self, urls: Iterable[Optional[str]]) -> List[Optional[str]]:
+        """Placeholders for several URLs with at most one query for the misses"""
+        paths = [self.relative_path(url) for url in urls]
+        now = time.monotonic()
+        found: Dict[str, Optional[str]] = {}
+        with self._lock:
+            for path in paths:
+                entry = self._entries.get(path) if path else None
+                if entry and (entry[1] is not None or entry[0] > now):
+                    found[path] = entry[1]
+
+        missing = {path for path in paths if path and path not in found}
+        if missing:
+            from models.models import Upload
+
+            rows = dict(
+                Upload.query.with_entities(Upload.relative_path, Upload.placeholder)
+                .filter(Upload.relative_path.in_(missing))
+            )
+            with self._lock:
+                if len(self._entries) + len(missing) > self.max_entries:
+                    self._entries.clear()
+                for path in missing:
+                    found[path] = rows.get(path)
+                    self._entries[path] = (now + self.miss_ttl, found[path])
+
+        return [found.get(path) if path else None for path in paths]
+
+    def prefetch(self, rows: Iterable) -> None:
+        """Load the placeholders for a page of rows (their image_urls()) in one query
+
+        Serializing the rows afterwards finds every placeholder cached.
+        """
+        urls = [url for row in rows for url in row.image_urls()]
+        if urls:
+            self.get_many(urls)
+
+    def invalidate(self, url: Optional[str] = None) -> None:
+        """Forget one URL's entry, or every entry when url is None"""
+        with self._lock:
+            if url is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(self.relative_path(url) or '', None)
+
+
+# Initialize image placeholder lookups
+image_placeholders = ImagePlaceholders()
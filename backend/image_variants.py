@@ -0,0 +1,281 @@
+# Responsive Image Variants for Wheeler Knight Portfolio
+# Resized WebP/AVIF copies of uploaded images, built in a process pool after
+# upload and exposed to serializers as srcset-ready fields
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Sequence
+import json
+import logging
+import multiprocessing
+import os
+import re
+import shutil
+import threading
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = 'manifest.json'
+
+# Raster formats worth resizing (GIFs may be animated, SVGs scale already)
+RESIZABLE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.webp'}
+
+# Originals every browser decodes; others (WebP from the optimizer) are left
+# out of the fallback srcset in favour of a full-width fallback copy
+FALLBACK_EXTENSIONS = {'.png', '.jpg', '.jpeg'}
+
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp', 'jpeg': 'image/jpeg', 'png': 'image/png'}
+FILE_EXTENSIONS = {'avif': 'avif', 'webp': 'webp', 'jpeg': 'jpg', 'png': 'png'}
+
+# /uploads/images/<hash[:2]>/<hash>.<ext>
+CONTENT_URL = re.compile(r'^/uploads/images/[0-9a-f]{2}/(?P<hash>[0-9a-f]{64})\.[A-Za-z0-9]+$')
+
+
+def build_variants(source_path: str, output_dir: str, url_prefix: str, widths: Sequence[int],
+                   formats: Sequence[str], quality: int) -> Dict[str, Any]:
+    """Write resized copies of one image and its manifest (runs in a pool process)
+
+    Every width narrower than the original is produced in each requested
+    modern format plus a fallback format (PNG when the image has an alpha
+    channel, JPEG otherwise); the modern formats also get a full-width copy,
+    and so does the fallback when the original is not a JPEG or PNG. The
+    manifest is written last, so its presence means the set is complete.
+    """
+    from PIL import Image, ImageOps
+    try:
+        import pillow_avif  # noqa: F401  (registers the AVIF encoder)
+    except ImportError:
+        pass
+    Image.init()
+
+    os.makedirs(output_dir, exist_ok=True)
+    with Image.open(source_path) as opened:
+        native = opened.format in ('JPEG', 'PNG')
+        image = ImageOps.exif_transpose(opened)
+        image.load()
+
+    # JPEG would flatten transparency onto black
+    fallback = 'png' if 'A' in image.mode or 'transparency' in image.info else 'jpeg'
+    width, height = image.size
+    encoders = [fmt for fmt in formats if fmt.upper() in Image.SAVE and fmt != fallback]
+    targets = sorted({w for w in widths if w < width})
+
+    variants: List[Dict[str, Any]] = []
+    for target in targets + [width]:
+        resized = image if target == width else image.resize(
+            (target, max(1, round(height * target / width))), Image.LANCZOS
+        )
+        for fmt in encoders + ([fallback] if target < width or not native else []):
+            frame = resized
+            if fmt == 'jpeg' and frame.mode not in ('RGB', 'L'):
+                frame = frame.convert('RGB')
+            elif fmt in ('webp', 'avif') and frame.mode not in ('RGB', 'RGBA'):
+                frame = frame.convert('RGBA' if 'A' in frame.mode or 'transparency' in frame.info else 'RGB')
+
+            name = f"w{target}.{FILE_EXTENSIONS[fmt]}"
+            options: Dict[str, Any] = {'quality': quality}
+            if fmt == 'jpeg':
+                options.update(optimize=True, progressive=True)
+            elif fmt == 'png':
+                options = {'optimize': True}
+            elif fmt == 'webp':
+                options['method'] = 4
+            frame.save(os.path.join(output_dir, name), fmt.upper(), **options)
+
+            variants.append({
+                'format': fmt,
+                'width': frame.width,
+                'height': frame.height,
+                'url': f"{url_prefix}/{name}",
+                'bytes': os.path.getsize(os.path.join(output_dir, name))
+            })
+
+    manifest = {'width': width, 'height': height, 'fallback': fallback, 'variants': variants}
+    tmp_path = os.path.join(output_dir, f'.{MANIFEST_NAME}.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, sort_keys=True)
+    os.replace(tmp_path, os.path.join(output_dir, MANIFEST_NAME))
+    return manifest
+
+
+class ImageVariants:
+    """Queue derivative builds and answer srcset lookups for image URLs
+
+    Builds run in a small per-process pool so resizing never blocks a
+    request. Variants live under <UPLOAD_FOLDER>/variants/<hash[:2]>/<hash>/
+    and are keyed by the source's content hash, so their URLs never change.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.upload_folder = 'uploads'
+        self.widths = [320, 640, 960, 1280, 1920]
+        self.formats = ['avif', 'webp']
+        self.quality = 80
+        self.workers = 2
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Future] = {}
+        self._manifests: Dict[str, tuple] = {}
+        self._counters = {'queued': 0, 'built': 0, 'failed': 0}
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Configure widths, formats and pool size from the Flask app config"""
+        self.app = app
+        self.upload_folder = app.config.get('UPLOAD_FOLDER', 'uploads')
+        self.widths = app.config.get('IMAGE_VARIANT_WIDTHS', self.widths)
+        self.formats = app.config.get('IMAGE_VARIANT_FORMATS', self.formats)
+        self.quality = app.config.get('IMAGE_VARIANT_QUALITY', 80)
+        self.workers = app.config.get('IMAGE_VARIANT_WORKERS', 2)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Created lazily per process; pools do not survive a gunicorn fork.
+        # Children come from a forkserver, not a fork of this threaded worker,
+        # so they cannot inherit a lock held by a background thread
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context('forkserver')
+                )
+                self._pid = os.getpid()
+                self._pending = {}
+            return self._executor
+
+    def output_dir(self, content_hash: str) -> str:
+        return os.path.join(self.upload_folder, 'variants', content_hash[:2], content_hash)
+
+    @staticmethod
+    def content_hash(url: Optional[str]) -> Optional[str]:
+        """Content hash of a content-addressed image URL"""
+        match = CONTENT_URL.match(url or '')
+        return match.group('hash') if match else None
+
+    def submit(self, file_path: str, content_hash: str, force: bool = False) -> Optional[Future]:
+        """Queue a derivative build unless one exists or is already running"""
+        if os.path.splitext(file_path)[1].lower() not in RESIZABLE_EXTENSIONS:
+            return None
+        output_dir = self.output_dir(content_hash)
+        if not force and os.path.exists(os.path.join(output_dir, MANIFEST_NAME)):
+            return None
+
+        executor = self._get_executor()
+        with self._lock:
+            if content_hash in self._pending:
+                return self._pending[content_hash]
+            future = executor.submit(
+                build_variants, file_path, output_dir,
+                f"/uploads/variants/{content_hash[:2]}/{content_hash}",
+                list(self.widths), list(self.formats), self.quality
+            )
+            self._pending[content_hash] = future
+            self._counters['queued'] += 1
+        future.add_done_callback(lambda done: self._finished(content_hash, done))
+        return future
+
+    def _finished(self, content_hash: str, future: Future) -> None:
+        with self._lock:
+            self._pending.pop(content_hash, None)
+            self._manifests.pop(content_hash, None)
+            error = future.exception()
+            self._counters['failed' if error else 'built'] += 1
+        if error:
+            logger.error(f"Image variant build failed for {content_hash}: {error}")
+            return
+
+        # Published API snapshots embed srcset fields, so re-bake the rows that
+        # link to this image, and link the new files into the public tree if
+        # the image is public
+        from static_bake import snapshot_updater
+        from upload_index import reference_updater
+        rows = self._referencing_rows(content_hash)
+        if rows:
+            snapshot_updater.trigger_rows(rows)
+        reference_updater.trigger()
+
+    def _referencing_rows(self, content_hash: str) -> List[tuple]:
+        """(model name, id) of every content row that links to an image"""
+        if self.app is None:
+            return []
+
+        from models import db
+        from models.models import Upload, UploadReference
+
+        with self.app.app_context():
+            return db.session.query(UploadReference.entity_type, UploadReference.entity_id).join(
+                Upload, Upload.id == UploadReference.upload_id
+            ).filter(Upload.content_hash == content_hash).distinct().all()
+
+    def remove(self, content_hash: str) -> None:
+        """Delete every variant of an image"""
+        shutil.rmtree(self.output_dir(content_hash), ignore_errors=True)
+        with self._lock:
+            self._manifests.pop(content_hash, None)
+
+    def manifest(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        """Variant manifest for a source hash, or None while none is built"""
+        path = os.path.join(self.output_dir(content_hash), MANIFEST_NAME)
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return None
+
+        cached = self._manifests.get(content_hash)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Unreadable image variant manifest {path}: {e}")
+            return None
+        with self._lock:
+            self._manifests[content_hash] = (mtime, manifest)
+        return manifest
+
+    def responsive(self, url: Optional[str]) -> Optional[Dict[str, Any]]:
+        """srcset-ready description of an image URL, or None when it has no variants
+
+        {"src", "width", "height", "srcset", "sources": [{"type", "srcset"}]}
+        where src and srcset only name JPEG/PNG files every browser decodes
+        and sources lists the modern formats best first, ready for a
+        <picture> element.
+        """
+        content_hash = self.content_hash(url)
+        manifest = self.manifest(content_hash) if content_hash else None
+        if not manifest:
+            return None
+
+        by_format: Dict[str, List[Dict[str, Any]]] = {}
+        for variant in manifest['variants']:
+            by_format.setdefault(variant['format'], []).append(variant)
+
+        def srcset(items: List[Dict[str, Any]]) -> str:
+            return ', '.join(f"{item['url']} {item['width']}w" for item in sorted(items, key=lambda v: v['width']))
+
+        fallback = by_format.pop(manifest['fallback'], [])
+        if os.path.splitext(url)[1].lower() in FALLBACK_EXTENSIONS:
+            fallback.append({'url': url, 'width': manifest['width']})
+        src = max(fallback, key=lambda v: v['width'])['url'] if fallback else url
+        return {
+            'src': src,
+            'width': manifest['width'],
+            'height': manifest['height'],
+            'srcset': srcset(fallback),
+            'sources': [
+                {'type': MIME_TYPES[fmt], 'srcset': srcset(by_format[fmt])}
+                for fmt in ('avif', 'webp') if fmt in by_format
+            ]
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Get build counters for monitoring"""
+        with self._lock:
+            counters = dict(self._counters)
+            counters['pending'] = len(self._pending)
+        counters.update({'widths': list(self.widths), 'formats': list(self.formats), 'workers': self.workers})
+        return counters
+
+
+# Initialize responsive image variants
+image_variants = ImageVariants()
@@ -0,0 +1,99 @@
+# JWT Claims Cache for Wheeler Knight Portfolio
+# Verified token claims kept per process so repeat requests skip signature checks
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+import hashlib
+import threading
+import time
+
+from flask_jwt_extended import JWTManager
+
+
+class VerifiedClaimsCache:
+    """Bounded LRU of decoded JWT claims keyed by the token's SHA-256 digest
+
+    An entry is only stored after the token passed full verification and
+    is served until the token's own exp, never longer. Revocation is not
+    cached here: the blocklist callback runs on every request after the
+    claims are returned, so a revoked token is still rejected on a hit.
+    """
+
+    def __init__(self, app=None):
+        self.max_entries = 512
+        self._entries: 'OrderedDict[bytes, Tuple[float, Dict[str, Any]]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'evictions': 0}
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Configure the cache size from the Flask app config"""
+        self.max_entries = app.config.get('JWT_CLAIMS_CACHE_SIZE', 512)
+        self.clear()
+
+    @staticmethod
+    def key(encoded_token: str) -> bytes:
+        return hashlib.sha256(encoded_token.encode('utf-8')).digest()
+
+    def get(self, key: bytes) -> Optional[Dict[str, Any]]:
+        """Claims for a previously verified, unexpired token, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters['misses'] += 1
+                return None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                self._counters['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters['hits'] += 1
+            return dict(entry[1])
+
+    def put(self, key: bytes, claims: Dict[str, Any]) -> None:
+        """Remember verified claims until the token expires"""
+        expires_at = claims.get('exp')
+        if self.max_entries <= 0 or not isinstance(expires_at, (int, float)):
+            return
+        with self._lock:
+            self._entries[key] = (float(expires_at), dict(claims))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters['evictions'] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache counters for monitoring"""
+        with self._lock:
+            counters = dict(self._counters)
+            counters['entries'] = len(self._entries)
+        counters['max_entries'] = self.max_entries
+        return counters
+
+
+class CachingJWTManager(JWTManager):
+    """JWTManager that looks tokens up in the verified claims cache before decoding"""
+
+    def _decode_jwt_from_config(self, encoded_token: str, csrf_value=None, allow_expired: bool = False) -> dict:
+        # Double-submit CSRF values are compared during decoding, so those
+        # requests always take the full path
+        if csrf_value is not None or verified_claims_cache.max_entries <= 0:
+            return super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+
+        key = verified_claims_cache.key(encoded_token)
+        claims = verified_claims_cache.get(key)
+        if claims is not None:
+            return claims
+
+        claims = super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+        if claims.get('exp', 0) > time.time():
+            verified_claims_cache.put(key, claims)
+        return claims
+
+
+# Initialize verified claims cache
+verified_claims_cache = VerifiedClaimsCache()
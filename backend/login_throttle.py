@@ -0,0 +1,263 @@
+# Login Throttling for Wheeler Knight Portfolio
+# Sliding-window failure counters per client IP and per username, checked
+# before the user lookup so rejected attempts never reach bcrypt
+from collections import deque
+from functools import wraps
+from typing import Dict, Any, Deque, Optional, Tuple
+import hashlib
+import logging
+import math
+import threading
+import time
+import uuid
+
+from flask import jsonify, request
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryWindowStore:
+    """Per-process failure timestamps; each gunicorn worker keeps its own counts"""
+
+    name = 'memory'
+
+    # Drop keys with no recent failures every this many writes
+    SWEEP_EVERY = 1000
+
+    def __init__(self):
+        self._hits: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    @staticmethod
+    def _prune(hits: Deque[float], cutoff: float) -> None:
+        while hits and hits[0] <= cutoff:
+            hits.popleft()
+
+    def hits(self, key: str, now: float, window: float) -> Tuple[int, Optional[float]]:
+        """Failures inside the window and the time of the latest one"""
+        with self._lock:
+            hits = self._hits.get(key)
+            if not hits:
+                return 0, None
+            self._prune(hits, now - window)
+            return len(hits), (hits[-1] if hits else None)
+
+    def add(self, key: str, now: float, window: float) -> None:
+        with self._lock:
+            hits = self._hits.setdefault(key, deque())
+            self._prune(hits, now - window)
+            hits.append(now)
+
+            self._writes += 1
+            if self._writes % self.SWEEP_EVERY == 0:
+                cutoff = now - window
+                for stale in [k for k, v in self._hits.items() if not v or v[-1] <= cutoff]:
+                    del self._hits[stale]
+
+    def clear(self, key: str) -> None:
+        with self._lock:
+            self._hits.pop(key, None)
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._hits)
+
+
+class RedisWindowStore:
+    """Failure timestamps in Redis sorted sets, shared by every worker and host"""
+
+    name = 'redis'
+
+    def __init__(self, url: str, prefix: str = 'login_throttle:'):
+        import redis
+
+        self._redis = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self._prefix = prefix
+
+    def hits(self, key: str, now: float, window: float) -> Tuple[int, Optional[float]]:
+        pipe = self._redis.pipeline()
+        pipe.zremrangebyscore(self._prefix + key, 0, now - window)
+        pipe.zcard(self._prefix + key)
+        pipe.zrange(self._prefix + key, -1, -1, withscores=True)
+        _, count, latest = pipe.execute()
+        return count, (latest[0][1] if latest else None)
+
+    def add(self, key: str, now: float, window: float) -> None:
+        pipe = self._redis.pipeline()
+        pipe.zadd(self._prefix + key, {f'{now}:{uuid.uuid4().hex[:8]}': now})
+        pipe.zremrangebyscore(self._prefix + key, 0, now - window)
+        pipe.expire(self._prefix + key, int(math.ceil(window)))
+        pipe.execute()
+
+    def clear(self, key: str) -> None:
+        self._redis.delete(self._prefix + key)
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+class LoginThrottle:
+    """Reject logins from IPs or for usernames with too many recent failures
+
+    Once a key reaches its limit inside the window, every further failure
+    doubles the wait (base delay up to the maximum), measured from the
+    latest failure. A successful login clears the username's failures.
+    If the store is unreachable, logins are allowed and the error counted.
+    """
+
+    def __init__(self, app=None):
+        self.store = None
+        self._lock = threading.Lock()
+        self._counters = self._empty_counters()
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Configure limits and pick the memory or Redis store"""
+        self.enabled = app.config.get('LOGIN_THROTTLE_ENABLED', True)
+        self.window = app.config.get('LOGIN_THROTTLE_WINDOW', 900)
+        self.ip_limit = app.config.get('LOGIN_THROTTLE_IP_LIMIT', 20)
+        self.username_limit = app.config.get('LOGIN_THROTTLE_USERNAME_LIMIT', 5)
+        self.base_delay = app.config.get('LOGIN_THROTTLE_BASE_DELAY', 30)
+        self.max_delay = app.config.get('LOGIN_THROTTLE_MAX_DELAY', 900)
+        self.proxy_count = app.config.get('LOGIN_THROTTLE_PROXY_COUNT', 0)
+
+        storage = app.config.get('LOGIN_THROTTLE_STORAGE', 'auto')
+        redis_url = app.config.get('REDIS_URL', '')
+        self.store = MemoryWindowStore()
+        if storage in ('auto', 'redis') and redis_url:
+            try:
+                self.store = RedisWindowStore(redis_url)
+            except ImportError:
+                level = logging.ERROR if storage == 'redis' else logging.INFO
+                logger.log(level, "redis package not installed; login throttling uses per-process memory")
+
+    @staticmethod
+    def _empty_counters() -> Dict[str, int]:
+        return {
+            'checks': 0,
+            'allowed': 0,
+            'rejected_ip': 0,
+            'rejected_username': 0,
+            'failures_recorded': 0,
+            'successes': 0,
+            'store_errors': 0
+        }
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def client_ip(self) -> Optional[str]:
+        """Client address, read from X-Forwarded-For when behind a known number of proxies"""
+        if self.proxy_count > 0 and len(request.access_route) >= self.proxy_count:
+            return request.access_route[-self.proxy_count]
+        return request.remote_addr
+
+    @staticmethod
+    def _keys(ip: Optional[str], username: Optional[str]) -> Dict[str, str]:
+        keys = {}
+        if ip:
+            keys['ip'] = f'ip:{ip}'
+        if isinstance(username, str) and username.strip():
+            digest = hashlib.sha256(username.strip().lower().encode('utf-8')).hexdigest()[:32]
+            keys['username'] = f'user:{digest}'
+        return keys
+
+    def _retry_after(self, count: int, latest: Optional[float], limit: int, now: float) -> float:
+        if count < limit or latest is None:
+            return 0.0
+        delay = min(self.max_delay, self.base_delay * 2 ** (count - limit))
+        return max(0.0, latest + delay - now)
+
+    def check(self, ip: Optional[str], username: Optional[str]) -> Tuple[int, Optional[str]]:
+        """Seconds until this attempt is allowed (0 when allowed) and which key blocked it"""
+        if not self.enabled or self.store is None:
+            return 0, None
+
+        self._count('checks')
+        now = time.time()
+        limits = {'ip': self.ip_limit, 'username': self.username_limit}
+        try:
+            for scope, key in self._keys(ip, username).items():
+                count, latest = self.store.hits(key, now, self.window)
+                wait = self._retry_after(count, latest, limits[scope], now)
+                if wait > 0:
+                    self._count(f'rejected_{scope}')
+                    return int(math.ceil(wait)), scope
+        except Exception as e:
+            self._count('store_errors')
+            logger.error(f"Login throttle check failed, allowing attempt: {e}")
+
+        self._count('allowed')
+        return 0, None
+
+    def record_failure(self, ip: Optional[str], username: Optional[str]) -> None:
+        """Count a failed login against the IP and the username"""
+        if not self.enabled or self.store is None:
+            return
+        now = time.time()
+        try:
+            for key in self._keys(ip, username).values():
+                self.store.add(key, now, self.window)
+            self._count('failures_recorded')
+        except Exception as e:
+            self._count('store_errors')
+            logger.error(f"Failed to record login failure: {e}")
+
+    def record_success(self, username: Optional[str]) -> None:
+        """Forget a username's failures after it logs in"""
+        if not self.enabled or self.store is None:
+            return
+        try:
+            key = self._keys(None, username).get('username')
+            if key:
+                self.store.clear(key)
+            self._count('successes')
+        except Exception as e:
+            self._count('store_errors')
+            logger.error(f"Failed to clear login failures: {e}")
+
+    def limit(self, f):
+        """Decorator answering 429 with Retry-After before the login handler runs"""
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            data = request.get_json(silent=True)
+            username = data.get('username') if isinstance(data, dict) else None
+            ip = self.client_ip()
+
+            retry_after, scope = self.check(ip, username)
+            if retry_after:
+                logger.warning(f"Login throttled by {scope} for {ip} (retry in {retry_after}s)")
+                response = jsonify({
+                    'success': False,
+                    'error': 'Too many failed login attempts',
+                    'message': f'Please try again in {retry_after} seconds',
+                    'retry_after': retry_after
+                })
+                response.status_code = 429
+                response.headers['Retry-After'] = str(retry_after)
+                return response
+
+            return f(*args, **kwargs)
+
+        return decorated_function
+
+    def stats(self) -> Dict[str, Any]:
+        """Get throttle counters for monitoring"""
+        with self._lock:
+            counters = dict(self._counters)
+        counters.update({
+            'enabled': getattr(self, 'enabled', False),
+            'store': self.store.name if self.store else None,
+            'tracked_keys': self.store.size() if self.store else 0,
+            'window': getattr(self, 'window', 0),
+            'ip_limit': getattr(self, 'ip_limit', 0),
+            'username_limit': getattr(self, 'username_limit', 0)
+        })
+        return counters
+
+
+# Initialize login throttle
+login_throttle = LoginThrottle()
@@ -0,0 +1,98 @@
+# Markdown Rendering for Wheeler Knight Portfolio
+# Blog content is rendered to sanitized HTML once per edit instead of in every browser
+from functools import lru_cache
+from typing import Dict, Any, List
+import hashlib
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Bump when extensions or sanitizer rules change so stored renders are redone
+RENDERER_VERSION = '1'
+
+HIGHLIGHT_CSS_CLASS = 'highlight'
+
+ALLOWED_TAGS = {
+    'a', 'abbr', 'blockquote', 'br', 'code', 'dd', 'del', 'div', 'dl', 'dt', 'em', 'h1', 'h2', 'h3',
+    'h4', 'h5', 'h6', 'hr', 'img', 'li', 'ol', 'p', 'pre', 'span', 'strong', 'sub', 'sup', 'table',
+    'tbody', 'td', 'tfoot', 'th', 'thead', 'tr', 'ul'
+}
+
+ALLOWED_ATTRIBUTES = {
+    '*': ['id', 'class'],
+    'a': ['href', 'title', 'rel'],
+    'abbr': ['title'],
+    'img': ['src', 'alt', 'title', 'width', 'height', 'loading'],
+    'td': ['align', 'style'],
+    'th': ['align', 'style']
+}
+
+ALLOWED_PROTOCOLS = {'http', 'https', 'mailto'}
+
+
+def content_hash(content: str) -> str:
+    """Hash of the source plus renderer version; the cache key for rendered output"""
+    return hashlib.sha256(f'{RENDERER_VERSION}\x00{content or ""}'.encode('utf-8')).hexdigest()
+
+
+def _toc_entries(tokens: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        {
+            'id': token['id'],
+            'title': token['name'],
+            'level': token['level'],
+            'children': _toc_entries(token.get('children', []))
+        }
+        for token in tokens
+    ]
+
+
+@lru_cache(maxsize=128)
+def _render(content: str) -> str:
+    import bleach
+    import markdown
+    from bleach.css_sanitizer import CSSSanitizer
+
+    md = markdown.Markdown(
+        extensions=['fenced_code', 'codehilite', 'tables', 'toc', 'sane_lists', 'smarty'],
+        extension_configs={
+            'codehilite': {'css_class': HIGHLIGHT_CSS_CLASS, 'guess_lang': False},
+            'toc': {'permalink': False, 'toc_depth': '2-4'}
+        },
+        output_format='html'
+    )
+    html = md.convert(content or '')
+    html = bleach.clean(
+        html,
+        tags=ALLOWED_TAGS,
+        attributes=ALLOWED_ATTRIBUTES,
+        protocols=ALLOWED_PROTOCOLS,
+        css_sanitizer=CSSSanitizer(allowed_css_properties=['text-align']),
+        strip=True
+    )
+    html = bleach.linkify(html, callbacks=[bleach.callbacks.nofollow, bleach.callbacks.target_blank],
+                          skip_tags=['pre', 'code'])
+
+    # Cached value is JSON so callers cannot mutate shared state
+    return json.dumps({'html': html, 'toc': _toc_entries(md.toc_tokens)})
+
+
+def render_markdown(content: str) -> Dict[str, Any]:
+    """Render Markdown to sanitized HTML with highlighted code and a table of contents
+
+    Returns {'html', 'toc', 'hash'}. Callers store the hash next to the
+    output and skip rendering while it still matches; renders are also
+    memoized per process.
+    """
+    rendered = json.loads(_render(content or ''))
+    rendered['hash'] = content_hash(content)
+    return rendered
+
+
+@lru_cache(maxsize=1)
+def highlight_css() -> str:
+    """Pygments stylesheet for the code blocks in rendered HTML"""
+    from pygments.formatters import HtmlFormatter
+
+    return HtmlFormatter(style='default').get_style_defs(f'.{HIGHLIGHT_CSS_CLASS}')
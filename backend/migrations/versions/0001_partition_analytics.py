@@ -0,0 +1,84 @@
+"""Partition analytics by month
+
+Tables are created by db.create_all(), so this revision converts the
+existing analytics table in place. MySQL requires every unique key on a
+partitioned table to include the partitioning column and does not allow
+foreign keys, so the primary key becomes (id, created_at) and the
+user_id foreign key is replaced by a plain index.
+
+Revision ID: 0001_partition_analytics
+Revises:
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from datetime import date, datetime
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_partition_analytics'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+PREMAKE_MONTHS = 3
+
+
+def _add_months(value, months):
+    month_index = value.year * 12 + (value.month - 1) + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def _partition_clause(first_month, last_month):
+    definitions = []
+    month = first_month
+    while month <= last_month:
+        upper_bound = _add_months(month, 1)
+        definitions.append(
+            f"PARTITION p{month.year:04d}{month.month:02d} VALUES LESS THAN ('{upper_bound.isoformat()}')"
+        )
+        month = upper_bound
+    definitions.append("PARTITION pmax VALUES LESS THAN (MAXVALUE)")
+    return "PARTITION BY RANGE COLUMNS(created_at) (" + ", ".join(definitions) + ")"
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'mysql':
+        return
+
+    inspector = sa.inspect(bind)
+    if not inspector.has_table('analytics'):
+        raise RuntimeError("analytics table not found - start the app once so db.create_all() creates it")
+
+    for foreign_key in inspector.get_foreign_keys('analytics'):
+        if foreign_key['constrained_columns'] == ['user_id']:
+            op.drop_constraint(foreign_key['name'], 'analytics', type_='foreignkey')
+
+    index_names = {index['name'] for index in inspector.get_indexes('analytics')}
+    if 'ix_analytics_user_id' not in index_names:
+        op.create_index('ix_analytics_user_id', 'analytics', ['user_id'])
+    if 'user_id' in index_names:
+        op.drop_index('user_id', table_name='analytics')
+
+    op.execute("ALTER TABLE analytics DROP PRIMARY KEY, ADD PRIMARY KEY (id, created_at)")
+
+    oldest = bind.execute(sa.text("SELECT MIN(created_at) FROM analytics")).scalar()
+    current = date.today().replace(day=1)
+    first_month = (oldest.date() if isinstance(oldest, datetime) else current).replace(day=1)
+    last_month = _add_months(current, PREMAKE_MONTHS)
+
+    op.execute("ALTER TABLE analytics " + _partition_clause(min(first_month, current), last_month))
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'mysql':
+        return
+
+    op.execute("ALTER TABLE analytics REMOVE PARTITIONING")
+    op.execute("ALTER TABLE analytics DROP PRIMARY KEY, ADD PRIMARY KEY (id)")
+    op.create_foreign_key(
+        'analytics_ibfk_1', 'analytics', 'users', ['user_id'], ['id'], ondelete='SET NULL'
+    )
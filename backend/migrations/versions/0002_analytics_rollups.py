@@ -0,0 +1,58 @@
+"""Add analytics rollup tables
+
+Revision ID: 0002_analytics_rollups
+Revises: 0001_partition_analytics
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_analytics_rollups'
+down_revision = '0001_partition_analytics'
+branch_labels = None
+depends_on = None
+
+ROLLUP_TABLES = ('analytics_hourly', 'analytics_daily')
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    for table_name in ROLLUP_TABLES:
+        if inspector.has_table(table_name):
+            continue
+        op.create_table(
+            table_name,
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.Column('bucket_start', sa.DateTime(), nullable=False),
+            sa.Column('event_type', sa.String(length=100), nullable=False),
+            sa.Column('page_url', sa.String(length=500), nullable=False),
+            sa.Column('referrer_domain', sa.String(length=255), nullable=False),
+            sa.Column('dimension_hash', sa.String(length=40), nullable=False),
+            sa.Column('count', sa.Integer(), nullable=False),
+            sa.UniqueConstraint('bucket_start', 'dimension_hash', name=f'uq_{table_name}_bucket_dimensions')
+        )
+        op.create_index(f'ix_{table_name}_event_type_bucket', table_name, ['event_type', 'bucket_start'])
+
+    if not inspector.has_table('analytics_rollup_state'):
+        op.create_table(
+            'analytics_rollup_state',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.Column('job_name', sa.String(length=100), nullable=False, unique=True),
+            sa.Column('last_id', sa.Integer(), nullable=False),
+            sa.Column('last_run_at', sa.DateTime(), nullable=True)
+        )
+
+
+def downgrade():
+    op.drop_table('analytics_rollup_state')
+    for table_name in ROLLUP_TABLES:
+        op.drop_index(f'ix_{table_name}_event_type_bucket', table_name=table_name)
+        op.drop_table(table_name)
@@ -0,0 +1,41 @@
+"""Add FULLTEXT index for blog search
+
+Only MySQL gets the index; other databases fall back to the in-process
+inverted index in blog_search.py.
+
+Revision ID: 0003_blog_fulltext
+Revises: 0002_analytics_rollups
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_blog_fulltext'
+down_revision = '0002_analytics_rollups'
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = 'ft_blog_posts_search'
+
+
+def _has_index(bind):
+    return any(index['name'] == INDEX_NAME for index in sa.inspect(bind).get_indexes('blog_posts'))
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'mysql' or _has_index(bind):
+        return
+
+    op.create_index(INDEX_NAME, 'blog_posts', ['title', 'excerpt', 'content'], mysql_prefix='FULLTEXT')
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'mysql' or not _has_index(bind):
+        return
+
+    op.drop_index(INDEX_NAME, table_name='blog_posts')
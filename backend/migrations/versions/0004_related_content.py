@@ -0,0 +1,54 @@
+"""Add related content tables
+
+Revision ID: 0004_related_content
+Revises: 0003_blog_fulltext
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_related_content'
+down_revision = '0003_blog_fulltext'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table('related_items'):
+        op.create_table(
+            'related_items',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.Column('source_type', sa.String(length=20), nullable=False),
+            sa.Column('source_id', sa.Integer(), nullable=False),
+            sa.Column('target_type', sa.String(length=20), nullable=False),
+            sa.Column('target_id', sa.Integer(), nullable=False),
+            sa.Column('score', sa.Float(), nullable=False),
+            sa.Column('rank', sa.Integer(), nullable=False),
+            sa.UniqueConstraint('source_type', 'source_id', 'target_type', 'target_id', name='uq_related_items_pair')
+        )
+        op.create_index('ix_related_items_source_rank', 'related_items', ['source_type', 'source_id', 'rank'])
+
+    if not inspector.has_table('related_documents'):
+        op.create_table(
+            'related_documents',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.Column('doc_type', sa.String(length=20), nullable=False),
+            sa.Column('doc_id', sa.Integer(), nullable=False),
+            sa.Column('content_hash', sa.String(length=64), nullable=False),
+            sa.UniqueConstraint('doc_type', 'doc_id', name='uq_related_documents_doc')
+        )
+
+
+def downgrade():
+    op.drop_table('related_documents')
+    op.drop_index('ix_related_items_source_rank', table_name='related_items')
+    op.drop_table('related_items')
@@ -0,0 +1,112 @@
+"""Normalize technologies into their own table
+
+Creates technologies plus the project and work experience link tables,
+then backfills them from the existing JSON technologies columns.
+
+Revision ID: 0005_technologies
+Revises: 0004_related_content
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from datetime import datetime
+import json
+import re
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_technologies'
+down_revision = '0004_related_content'
+branch_labels = None
+depends_on = None
+
+LINK_TABLES = (
+    ('project_technologies', 'project_id', 'projects'),
+    ('work_experience_technologies', 'work_experience_id', 'work_experience'),
+)
+
+
+def _clean_name(name):
+    return re.sub(r'\s+', ' ', name).strip()[:100]
+
+
+def _technology_names(value):
+    try:
+        names = json.loads(value) if value else []
+    except (TypeError, ValueError):
+        return []
+    if not isinstance(names, list):
+        return []
+    return [_clean_name(name) for name in names if isinstance(name, str) and _clean_name(name)]
+
+
+def _backfill(bind):
+    technologies = sa.Table(
+        'technologies',
+        sa.MetaData(),
+        sa.Column('id', sa.Integer, primary_key=True),
+        sa.Column('name', sa.String(100)),
+        sa.Column('slug', sa.String(100)),
+        sa.Column('created_at', sa.DateTime),
+        sa.Column('updated_at', sa.DateTime)
+    )
+    ids_by_slug = {slug: tech_id for tech_id, slug in bind.execute(sa.select(technologies.c.id, technologies.c.slug))}
+    now = datetime.utcnow()
+
+    for link_table, owner_column, owner_table in LINK_TABLES:
+        links = sa.table(link_table, sa.column(owner_column, sa.Integer), sa.column('technology_id', sa.Integer))
+        if bind.execute(sa.select(sa.func.count()).select_from(links)).scalar():
+            continue  # Already populated
+
+        rows = []
+        for owner_id, value in bind.execute(sa.text(f'SELECT id, technologies FROM {owner_table}')):
+            linked = set()
+            for name in _technology_names(value):
+                slug = name.lower()
+                if slug not in ids_by_slug:
+                    result = bind.execute(technologies.insert().values(
+                        name=name, slug=slug, created_at=now, updated_at=now
+                    ))
+                    ids_by_slug[slug] = result.inserted_primary_key[0]
+                if ids_by_slug[slug] not in linked:
+                    linked.add(ids_by_slug[slug])
+                    rows.append({owner_column: owner_id, 'technology_id': ids_by_slug[slug]})
+        if rows:
+            bind.execute(links.insert(), rows)
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if not inspector.has_table('technologies'):
+        op.create_table(
+            'technologies',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.Column('name', sa.String(length=100), nullable=False),
+            sa.Column('slug', sa.String(length=100), nullable=False)
+        )
+        op.create_index('ix_technologies_slug', 'technologies', ['slug'], unique=True)
+
+    for link_table, owner_column, owner_table in LINK_TABLES:
+        if inspector.has_table(link_table):
+            continue
+        op.create_table(
+            link_table,
+            sa.Column(owner_column, sa.Integer(), sa.ForeignKey(f'{owner_table}.id', ondelete='CASCADE'), primary_key=True),
+            sa.Column('technology_id', sa.Integer(), sa.ForeignKey('technologies.id', ondelete='CASCADE'), primary_key=True)
+        )
+        op.create_index(f'ix_{link_table}_technology_id', link_table, ['technology_id'])
+
+    _backfill(bind)
+
+
+def downgrade():
+    for link_table, _, _ in LINK_TABLES:
+        op.drop_index(f'ix_{link_table}_technology_id', table_name=link_table)
+        op.drop_table(link_table)
+    op.drop_index('ix_technologies_slug', table_name='technologies')
+    op.drop_table('technologies')
@@ -0,0 +1,36 @@
+"""Add rendered HTML columns to blog posts
+
+Existing posts are rendered by `flask blog render` after upgrading.
+
+Revision ID: 0006_blog_rendered_content
+Revises: 0005_technologies
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006_blog_rendered_content'
+down_revision = '0005_technologies'
+branch_labels = None
+depends_on = None
+
+COLUMNS = (
+    ('content_html', sa.Text()),
+    ('content_toc', sa.Text()),
+    ('content_hash', sa.String(length=64)),
+)
+
+
+def upgrade():
+    existing = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('blog_posts')}
+    for name, column_type in COLUMNS:
+        if name not in existing:
+            op.add_column('blog_posts', sa.Column(name, column_type, nullable=True))
+
+
+def downgrade():
+    for name, _ in reversed(COLUMNS):
+        op.drop_column('blog_posts', name)
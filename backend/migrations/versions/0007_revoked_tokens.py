@@ -0,0 +1,39 @@
+"""Add revoked tokens table
+
+Revision ID: 0007_revoked_tokens
+Revises: 0006_blog_rendered_content
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007_revoked_tokens'
+down_revision = '0006_blog_rendered_content'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table('revoked_tokens'):
+        return
+
+    op.create_table(
+        'revoked_tokens',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('token_key', sa.String(length=120), nullable=False),
+        sa.Column('not_before', sa.Integer(), nullable=True),
+        sa.Column('expires_at', sa.DateTime(), nullable=False)
+    )
+    op.create_index('ix_revoked_tokens_token_key', 'revoked_tokens', ['token_key'])
+    op.create_index('ix_revoked_tokens_expires_at', 'revoked_tokens', ['expires_at'])
+
+
+def downgrade():
+    op.drop_index('ix_revoked_tokens_expires_at', table_name='revoked_tokens')
+    op.drop_index('ix_revoked_tokens_token_key', table_name='revoked_tokens')
+    op.drop_table('revoked_tokens')
@@ -0,0 +1,69 @@
+"""Add upload metadata and reference tables
+
+Rows for files already on disk are created by `flask uploads backfill`.
+
+Revision ID: 0008_uploads
+Revises: 0007_revoked_tokens
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008_uploads'
+down_revision = '0007_revoked_tokens'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table('uploads'):
+        op.create_table(
+            'uploads',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.Column('relative_path', sa.String(length=500), nullable=False),
+            sa.Column('content_hash', sa.String(length=64), nullable=False),
+            sa.Column('original_filename', sa.String(length=255), nullable=True),
+            sa.Column('category', sa.String(length=20), nullable=False),
+            sa.Column('mime_type', sa.String(length=100), nullable=True),
+            sa.Column('file_size', sa.BigInteger(), nullable=False),
+            sa.Column('width', sa.Integer(), nullable=True),
+            sa.Column('height', sa.Integer(), nullable=True),
+            sa.Column('uploaded_by', sa.Integer(), sa.ForeignKey('admin_users.id', ondelete='SET NULL'), nullable=True),
+            sa.UniqueConstraint('relative_path', name='uq_uploads_relative_path')
+        )
+        op.create_index('ix_uploads_content_hash', 'uploads', ['content_hash'])
+        op.create_index('ix_uploads_mime_type', 'uploads', ['mime_type'])
+        op.create_index('ix_uploads_uploaded_by', 'uploads', ['uploaded_by'])
+        op.create_index('ix_uploads_category_created', 'uploads', ['category', 'created_at'])
+
+    if not inspector.has_table('upload_references'):
+        op.create_table(
+            'upload_references',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.Column('upload_id', sa.Integer(), sa.ForeignKey('uploads.id', ondelete='CASCADE'), nullable=False),
+            sa.Column('entity_type', sa.String(length=20), nullable=False),
+            sa.Column('entity_id', sa.Integer(), nullable=False),
+            sa.UniqueConstraint('upload_id', 'entity_type', 'entity_id', name='uq_upload_references_entity')
+        )
+        op.create_index('ix_upload_references_upload_id', 'upload_references', ['upload_id'])
+        op.create_index('ix_upload_references_entity', 'upload_references', ['entity_type', 'entity_id'])
+
+
+def downgrade():
+    op.drop_index('ix_upload_references_entity', table_name='upload_references')
+    op.drop_index('ix_upload_references_upload_id', table_name='upload_references')
+    op.drop_table('upload_references')
+    op.drop_index('ix_uploads_category_created', table_name='uploads')
+    op.drop_index('ix_uploads_uploaded_by', table_name='uploads')
+    op.drop_index('ix_uploads_mime_type', table_name='uploads')
+    op.drop_index('ix_uploads_content_hash', table_name='uploads')
+    op.drop_table('uploads')
@@ -0,0 +1,43 @@
+"""Add resumable upload sessions table
+
+Revision ID: 0009_upload_sessions
+Revises: 0008_uploads
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009_upload_sessions'
+down_revision = '0008_uploads'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table('upload_sessions'):
+        return
+
+    op.create_table(
+        'upload_sessions',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('session_key', sa.String(length=32), nullable=False),
+        sa.Column('filename', sa.String(length=255), nullable=False),
+        sa.Column('folder', sa.String(length=20), nullable=False),
+        sa.Column('total_size', sa.BigInteger(), nullable=False),
+        sa.Column('received', sa.BigInteger(), nullable=False),
+        sa.Column('checksum', sa.String(length=64), nullable=True),
+        sa.Column('created_by', sa.Integer(), sa.ForeignKey('admin_users.id', ondelete='CASCADE'), nullable=True),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.UniqueConstraint('session_key', name='uq_upload_sessions_session_key')
+    )
+    op.create_index('ix_upload_sessions_expires_at', 'upload_sessions', ['expires_at'])
+
+
+def downgrade():
+    op.drop_index('ix_upload_sessions_expires_at', table_name='upload_sessions')
+    op.drop_table('upload_sessions')
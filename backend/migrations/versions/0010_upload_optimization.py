@@ -0,0 +1,26 @@
+"""Record the as-uploaded size of optimized images
+
+Revision ID: 0010_upload_optimization
+Revises: 0009_upload_sessions
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010_upload_optimization'
+down_revision = '0009_upload_sessions'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    existing = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('uploads')}
+    if 'original_size' not in existing:
+        op.add_column('uploads', sa.Column('original_size', sa.BigInteger(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('uploads', 'original_size')
@@ -0,0 +1,26 @@
+"""Store a placeholder thumbnail with each uploaded image
+
+Revision ID: 0011_upload_placeholders
+Revises: 0010_upload_optimization
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0011_upload_placeholders'
+down_revision = '0010_upload_optimization'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    existing = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('uploads')}
+    if 'placeholder' not in existing:
+        op.add_column('uploads', sa.Column('placeholder', sa.Text(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('uploads', 'placeholder')
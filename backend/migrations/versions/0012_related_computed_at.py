@@ -0,0 +1,31 @@
+"""Record when each document's related items were last recomputed
+
+Revision ID: 0012_related_computed_at
+Revises: 0011_upload_placeholders
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0012_related_computed_at'
+down_revision = '0011_upload_placeholders'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    existing = {column['name'] for column in inspector.get_columns('related_documents')}
+    if 'computed_at' not in existing:
+        op.add_column('related_documents', sa.Column('computed_at', sa.DateTime(), nullable=True))
+    indexes = {index['name'] for index in inspector.get_indexes('related_documents')}
+    if 'ix_related_documents_computed_at' not in indexes:
+        op.create_index('ix_related_documents_computed_at', 'related_documents', ['computed_at'])
+
+
+def downgrade():
+    op.drop_index('ix_related_documents_computed_at', table_name='related_documents')
+    op.drop_column('related_documents', 'computed_at')
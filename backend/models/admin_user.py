@@ -4,7 +4,6 @@ from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum
 from datetime import datetime
 from typing import Optional
 import enum
-import bcrypt
 
 class AdminRole(enum.Enum):
     """Admin role enumeration"""
@@ -42,13 +41,19 @@ class AdminUser(BaseModel):
         self.role = role
     
     def set_password(self, password: str) -> None:
-        """Hash and set password"""
-        salt = bcrypt.gensalt()
-        self.password_hash = bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+        """Hash and set password at the configured bcrypt cost"""
+        from password_hashing import password_hasher
+        self.password_hash = password_hasher.hash(password)
     
     def check_password(self, password: str) -> bool:
         """Check if provided password matches hash"""
-        return bcrypt.checkpw(password.encode('utf-8'), self.password_hash.encode('utf-8'))
+        from password_hashing import password_hasher
+        return password_hasher.verify(password, self.password_hash)
+    
+    def password_needs_rehash(self) -> bool:
+        """Check if the stored hash was made at a different bcrypt cost than configured"""
+        from password_hashing import password_hasher
+        return password_hasher.needs_rehash(self.password_hash)
     
     def update_last_login(self) -> None:
         """Update last login timestamp"""
@@ -12,8 +12,8 @@ class Analytics(BaseModel):
     event_type = db.Column(db.String(100), nullable=False, index=True)
     event_data = db.Column(db.JSON, nullable=True)
     
-    # User Information
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='SET NULL'), nullable=True)
+    # User Information (no FOREIGN KEY: MySQL partitioned tables cannot have one)
+    user_id = db.Column(db.Integer, nullable=True, index=True)
     
     # Technical Information
     ip_address = db.Column(db.String(45), nullable=True)  # IPv6 support
@@ -0,0 +1,101 @@
+# Analytics Rollup Models for Wheeler Knight Portfolio
+from . import BaseModel, db
+from datetime import datetime
+import hashlib
+
+# Timestamp fields zeroed to find the start of each bucket unit
+BUCKET_TRUNCATE_FIELDS = {
+    'hour': ('minute', 'second', 'microsecond'),
+    'day': ('hour', 'minute', 'second', 'microsecond'),
+}
+
+
+class AnalyticsRollupMixin(BaseModel):
+    """Pre-aggregated analytics event counts for one time bucket and dimension set"""
+    __abstract__ = True
+
+    # Bucket width, a key of BUCKET_TRUNCATE_FIELDS (set by each rollup)
+    bucket_unit = None
+
+    # Time bucket (start of hour or day, UTC)
+    bucket_start = db.Column(db.DateTime, nullable=False)
+
+    # Dimensions ('' when not present so the unique key stays usable)
+    event_type = db.Column(db.String(100), nullable=False)
+    page_url = db.Column(db.String(500), nullable=False, default='')
+    referrer_domain = db.Column(db.String(255), nullable=False, default='')
+    dimension_hash = db.Column(db.String(40), nullable=False)
+
+    # Measures
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    @staticmethod
+    def hash_dimensions(event_type: str, page_url: str, referrer_domain: str) -> str:
+        """Hash the dimension values into a compact unique key"""
+        key = '\x1f'.join([event_type, page_url, referrer_domain])
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def bucket_for(cls, value: datetime) -> datetime:
+        """Truncate a timestamp to the start of this rollup's bucket"""
+        return value.replace(**{field: 0 for field in BUCKET_TRUNCATE_FIELDS[cls.bucket_unit]})
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary"""
+        data = super().to_dict()
+        data.pop('dimension_hash', None)
+        return data
+
+
+class AnalyticsHourlyRollup(AnalyticsRollupMixin):
+    """Hourly analytics counts"""
+    __tablename__ = 'analytics_hourly'
+    __table_args__ = (
+        db.UniqueConstraint('bucket_start', 'dimension_hash', name='uq_analytics_hourly_bucket_dimensions'),
+        db.Index('ix_analytics_hourly_event_type_bucket', 'event_type', 'bucket_start'),
+    )
+
+    bucket_unit = 'hour'
+
+    def __repr__(self):
+        return f'<AnalyticsHourlyRollup {self.bucket_start} {self.event_type}>'
+
+
+class AnalyticsDailyRollup(AnalyticsRollupMixin):
+    """Daily analytics counts"""
+    __tablename__ = 'analytics_daily'
+    __table_args__ = (
+        db.UniqueConstraint('bucket_start', 'dimension_hash', name='uq_analytics_daily_bucket_dimensions'),
+        db.Index('ix_analytics_daily_event_type_bucket', 'event_type', 'bucket_start'),
+    )
+
+    bucket_unit = 'day'
+
+    def __repr__(self):
+        return f'<AnalyticsDailyRollup {self.bucket_start} {self.event_type}>'
+
+
+class AnalyticsRollupState(BaseModel):
+    """High-water mark of raw analytics rows already aggregated by a job"""
+    __tablename__ = 'analytics_rollup_state'
+
+    job_name = db.Column(db.String(100), unique=True, nullable=False)
+    last_id = db.Column(db.Integer, nullable=False, default=0)
+    last_run_at = db.Column(db.DateTime, nullable=True)
+
+    def __init__(self, job_name: str, last_id: int = 0):
+        self.job_name = job_name
+        self.last_id = last_id
+
+    @classmethod
+    def get_or_create(cls, job_name: str) -> 'AnalyticsRollupState':
+        """Get the state row for a job, creating it on first run"""
+        state = cls.query.filter_by(job_name=job_name).first()
+        if not state:
+            state = cls(job_name=job_name)
+            db.session.add(state)
+            db.session.flush()
+        return state
+
+    def __repr__(self):
+        return f'<AnalyticsRollupState {self.job_name} @ {self.last_id}>'
@@ -1,7 +1,7 @@
 # Interest Model for Wheeler Knight Portfolio
 from . import BaseModel, db
 from sqlalchemy import Column, Integer, String, Boolean, Text, Enum
-from typing import Optional
+from typing import Optional, List
 import enum
 
 class InterestCategory(enum.Enum):
@@ -56,11 +56,23 @@ class Interest(BaseModel):
         }
         return category_map.get(self.category, "Unknown")
     
+    def image_urls(self) -> List[str]:
+        """Image URLs to_dict describes, for batching placeholder lookups"""
+        return [self.image_url] if self.image_url else []
+    
     def to_dict(self) -> dict:
         """Convert to dictionary with computed fields"""
         data = super().to_dict()
         data['category_display'] = self.category_display
         data['category'] = self.category.value if self.category else None
+        
+        # srcset-ready description of the image's resized variants
+        from image_variants import image_variants
+        data['image_responsive'] = image_variants.responsive(self.image_url)
+        
+        # Inline blurred thumbnail shown while the image loads
+        from image_placeholders import image_placeholders
+        data['image_placeholder'] = image_placeholders.get(self.image_url)
         return data
     
     def __repr__(self):
@@ -9,9 +9,14 @@ from .project import Project
 from .education import Education
 from .work_experience import WorkExperience
 from .interest import Interest
+from .technology import Technology
 from .analytics import Analytics
+from .analytics_rollup import AnalyticsHourlyRollup, AnalyticsDailyRollup, AnalyticsRollupState
+from .related_content import RelatedItem, RelatedDocument
 from .message import Message
 from .admin_user import AdminUser
+from .revoked_token import RevokedToken
+from .upload import Upload, UploadReference, UploadSession
 
 # Export all models
 __all__ = [
@@ -24,7 +29,17 @@ __all__ = [
     'Education',
     'WorkExperience',
     'Interest',
+    'Technology',
     'Analytics',
+    'AnalyticsHourlyRollup',
+    'AnalyticsDailyRollup',
+    'AnalyticsRollupState',
+    'RelatedItem',
+    'RelatedDocument',
     'Message',
-    'AdminUser'
+    'AdminUser',
+    'RevokedToken',
+    'Upload',
+    'UploadReference',
+    'UploadSession'
 ]
@@ -41,6 +41,9 @@ class Project(BaseModel):
     display_order = db.Column(db.Integer, default=0, nullable=False)
     is_featured = db.Column(db.Boolean, default=False, nullable=False)
     
+    # Normalized copy of technologies for filtering and stats (see models/technology.py)
+    technology_items = db.relationship('Technology', secondary='project_technologies', lazy='select')
+    
     def __init__(self, title: str, description: str, long_description: Optional[str] = None,
                  technologies: Optional[List[str]] = None, github_url: Optional[str] = None,
                  live_url: Optional[str] = None, featured_image: Optional[str] = None,
@@ -111,6 +114,10 @@ class Project(BaseModel):
         """Check if project is currently active"""
         return self.status == ProjectStatus.IN_PROGRESS
     
+    def image_urls(self) -> List[str]:
+        """Image URLs to_dict describes, for batching placeholder lookups"""
+        return ([self.featured_image] if self.featured_image else []) + self.images_list
+    
     def to_dict(self) -> dict:
         """Convert to dictionary with computed fields"""
         data = super().to_dict()
@@ -119,6 +126,17 @@ class Project(BaseModel):
         data['duration'] = self.duration
         data['is_current'] = self.is_current
         data['status'] = self.status.value if self.status else None
+        
+        # srcset-ready descriptions of resized image variants (None until built)
+        from image_variants import image_variants
+        data['featured_image_responsive'] = image_variants.responsive(self.featured_image)
+        data['images_responsive'] = [image_variants.responsive(url) for url in data['images_list']]
+        
+        # Inline blurred thumbnails shown while the images load
+        from image_placeholders import image_placeholders
+        placeholders = image_placeholders.get_many([self.featured_image] + data['images_list'])
+        data['featured_image_placeholder'] = placeholders[0]
+        data['images_placeholders'] = placeholders[1:]
         return data
     
     def __repr__(self):
@@ -0,0 +1,53 @@
+# Related Content Models for Wheeler Knight Portfolio
+from . import BaseModel, db
+
+
+class RelatedItem(BaseModel):
+    """Precomputed nearest neighbour of a blog post or project by TF-IDF cosine similarity"""
+    __tablename__ = 'related_items'
+    __table_args__ = (
+        db.UniqueConstraint('source_type', 'source_id', 'target_type', 'target_id', name='uq_related_items_pair'),
+        db.Index('ix_related_items_source_rank', 'source_type', 'source_id', 'rank'),
+    )
+
+    source_type = db.Column(db.String(20), nullable=False)
+    source_id = db.Column(db.Integer, nullable=False)
+    target_type = db.Column(db.String(20), nullable=False)
+    target_id = db.Column(db.Integer, nullable=False)
+    score = db.Column(db.Float, nullable=False)
+    rank = db.Column(db.Integer, nullable=False)
+
+    @classmethod
+    def for_source(cls, source_type: str, source_id: int) -> list:
+        """Get the stored neighbours of one item, best first"""
+        rows = db.session.query(cls.target_type, cls.target_id, cls.score).filter(
+            cls.source_type == source_type,
+            cls.source_id == source_id
+        ).order_by(cls.rank.asc()).all()
+        return [
+            {'type': target_type, 'id': target_id, 'score': round(score, 4)}
+            for target_type, target_id, score in rows
+        ]
+
+    def __repr__(self):
+        return f'<RelatedItem {self.source_type}:{self.source_id} -> {self.target_type}:{self.target_id}>'
+
+
+class RelatedDocument(BaseModel):
+    """Content hash of each item last vectorized, used to find what changed
+
+    computed_at records when the item's neighbour list was last rewritten,
+    including rewrites to an empty list that leave no RelatedItem rows.
+    """
+    __tablename__ = 'related_documents'
+    __table_args__ = (
+        db.UniqueConstraint('doc_type', 'doc_id', name='uq_related_documents_doc'),
+    )
+
+    doc_type = db.Column(db.String(20), nullable=False)
+    doc_id = db.Column(db.Integer, nullable=False)
+    content_hash = db.Column(db.String(64), nullable=False)
+    computed_at = db.Column(db.DateTime, nullable=True, index=True)
+
+    def __repr__(self):
+        return f'<RelatedDocument {self.doc_type}:{self.doc_id}>'
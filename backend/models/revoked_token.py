@@ -0,0 +1,18 @@
+# Revoked Token Model for Wheeler Knight Portfolio
+from . import BaseModel, db
+
+
+class RevokedToken(BaseModel):
+    """A revoked JWT (by jti) or a cutoff revoking every earlier token of one user
+
+    Rows are only needed until the tokens they cover expire; expired rows
+    are purged by the revocation sync.
+    """
+    __tablename__ = 'revoked_tokens'
+
+    token_key = db.Column(db.String(120), nullable=False, index=True)  # 'jti:<jti>' or 'user:<id>'
+    not_before = db.Column(db.Integer, nullable=True)  # user cutoffs: tokens issued before this epoch second
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return f'<RevokedToken {self.token_key}>'
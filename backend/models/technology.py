@@ -0,0 +1,85 @@
+# Technology Model for Wheeler Knight Portfolio
+from . import BaseModel, db
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional
+import re
+
+# Association tables (the JSON technologies columns stay the source of truth
+# for ordering and spelling; these rows are kept in sync on every flush)
+project_technologies = db.Table(
+    'project_technologies',
+    db.Column('project_id', db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('technology_id', db.Integer, db.ForeignKey('technologies.id', ondelete='CASCADE'), primary_key=True),
+    db.Index('ix_project_technologies_technology_id', 'technology_id')
+)
+
+work_experience_technologies = db.Table(
+    'work_experience_technologies',
+    db.Column('work_experience_id', db.Integer, db.ForeignKey('work_experience.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('technology_id', db.Integer, db.ForeignKey('technologies.id', ondelete='CASCADE'), primary_key=True),
+    db.Index('ix_work_experience_technologies_technology_id', 'technology_id')
+)
+
+class Technology(BaseModel):
+    """Normalized technology tag shared by projects and work experience"""
+    __tablename__ = 'technologies'
+
+    name = db.Column(db.String(100), nullable=False)
+    slug = db.Column(db.String(100), unique=True, nullable=False, index=True)
+
+    def __init__(self, name: str):
+        self.name = name
+        self.slug = self.slugify(name)
+
+    @staticmethod
+    def clean_name(name: str) -> str:
+        """Collapse whitespace and trim a technology name to the column size"""
+        return re.sub(r'\s+', ' ', name).strip()[:100]
+
+    @staticmethod
+    def slugify(name: str) -> str:
+        """Case-insensitive lookup key ('Node.js ' and 'node.js' are the same technology)"""
+        return Technology.clean_name(name).lower()
+
+    @classmethod
+    def find(cls, name: str) -> Optional['Technology']:
+        """Get a technology by any spelling of its name"""
+        return cls.query.filter_by(slug=cls.slugify(name)).first()
+
+    def __repr__(self):
+        return f'<Technology {self.name}>'
+
+def _resolve_technologies(session, names: List[str], created: Dict[str, Technology]) -> List[Technology]:
+    """Get or create Technology rows for names, de-duplicated by slug"""
+    technologies = []
+    seen = set()
+    for name in names:
+        if not isinstance(name, str) or not Technology.clean_name(name):
+            continue
+        slug = Technology.slugify(name)
+        if slug in seen:
+            continue
+        seen.add(slug)
+
+        technology = created.get(slug)
+        if technology is None:
+            technology = session.query(Technology).filter_by(slug=slug).first()
+        if technology is None:
+            technology = Technology(Technology.clean_name(name))
+            session.add(technology)
+        created[slug] = technology
+        technologies.append(technology)
+    return technologies
+
+@event.listens_for(Session, 'before_flush')
+def _sync_technology_links(session, flush_context, instances):
+    """Mirror changed technologies JSON columns into the association tables"""
+    created: Dict[str, Technology] = {}
+    with session.no_autoflush:
+        for instance in list(session.new) + list(session.dirty):
+            if not hasattr(type(instance), 'technology_items'):
+                continue
+            if instance not in session.new and not inspect(instance).attrs.technologies.history.has_changes():
+                continue
+            instance.technology_items = _resolve_technologies(session, instance.technologies_list, created)
@@ -0,0 +1,98 @@
+# Upload Metadata Models for Wheeler Knight Portfolio
+from . import BaseModel, db
+
+
+class Upload(BaseModel):
+    """One stored file under UPLOAD_FOLDER, recorded at upload time or by the backfill scan"""
+    __tablename__ = 'uploads'
+    __table_args__ = (
+        db.Index('ix_uploads_category_created', 'category', 'created_at'),
+    )
+
+    relative_path = db.Column(db.String(500), unique=True, nullable=False)  # e.g. images/ab/<sha256>.png
+    content_hash = db.Column(db.String(64), nullable=False, index=True)
+    original_filename = db.Column(db.String(255), nullable=True)
+    category = db.Column(db.String(20), nullable=False)  # image, document or other
+    mime_type = db.Column(db.String(100), nullable=True, index=True)
+    file_size = db.Column(db.BigInteger, nullable=False)
+    original_size = db.Column(db.BigInteger, nullable=True)  # size as uploaded, set once optimization has run
+    width = db.Column(db.Integer, nullable=True)
+    height = db.Column(db.Integer, nullable=True)
+    placeholder = db.Column(db.Text, nullable=True)  # data: URI of a ~16px thumbnail for first paint
+    uploaded_by = db.Column(db.Integer, db.ForeignKey('admin_users.id', ondelete='SET NULL'), nullable=True, index=True)
+
+    references = db.relationship('UploadReference', backref='upload', cascade='all, delete-orphan', lazy='select')
+
+    @property
+    def file_url(self) -> str:
+        return f"/uploads/{self.relative_path}"
+
+    @property
+    def download_url(self) -> str:
+        # Authorized route; file_url is only served once content publishes the file
+        return f"/api/downloads/{self.id}"
+
+    @property
+    def bytes_saved(self) -> int:
+        return max(0, (self.original_size or self.file_size) - self.file_size)
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary with computed fields"""
+        data = super().to_dict()
+        data['filename'] = self.relative_path.rsplit('/', 1)[-1]
+        data['file_url'] = self.file_url
+        data['download_url'] = self.download_url
+        data['file_category'] = self.category
+        data['uploaded_at'] = data['created_at']
+        data['bytes_saved'] = self.bytes_saved
+        data['references'] = [
+            {'type': reference.entity_type, 'id': reference.entity_id} for reference in self.references
+        ]
+        return data
+
+    def __repr__(self):
+        return f'<Upload {self.relative_path}>'
+
+
+class UploadReference(BaseModel):
+    """A blog post, project or interest that links to an upload"""
+    __tablename__ = 'upload_references'
+    __table_args__ = (
+        db.UniqueConstraint('upload_id', 'entity_type', 'entity_id', name='uq_upload_references_entity'),
+        db.Index('ix_upload_references_entity', 'entity_type', 'entity_id'),
+    )
+
+    upload_id = db.Column(db.Integer, db.ForeignKey('uploads.id', ondelete='CASCADE'), nullable=False, index=True)
+    entity_type = db.Column(db.String(20), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+
+    def __repr__(self):
+        return f'<UploadReference {self.upload_id} <- {self.entity_type}:{self.entity_id}>'
+
+
+class UploadSession(BaseModel):
+    """A resumable upload in progress: bytes received so far live in a .part file"""
+    __tablename__ = 'upload_sessions'
+
+    session_key = db.Column(db.String(32), unique=True, nullable=False)
+    filename = db.Column(db.String(255), nullable=False)
+    folder = db.Column(db.String(20), nullable=False)  # images or documents
+    total_size = db.Column(db.BigInteger, nullable=False)
+    received = db.Column(db.BigInteger, default=0, nullable=False)
+    checksum = db.Column(db.String(64), nullable=True)  # expected SHA-256, if the client sent one
+    created_by = db.Column(db.Integer, db.ForeignKey('admin_users.id', ondelete='CASCADE'), nullable=True)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    def to_dict(self) -> dict:
+        """Client-facing state used to resume"""
+        return {
+            'id': self.session_key,
+            'filename': self.filename,
+            'size': self.total_size,
+            'offset': self.received,
+            'complete': self.received == self.total_size,
+            'expires_at': self.expires_at.isoformat()
+        }
+
+    def __repr__(self):
+        return f'<UploadSession {self.session_key} {self.received}/{self.total_size}>'
@@ -23,7 +23,8 @@ class User(BaseModel):
     newsletter_subscribed = db.Column(db.Boolean, default=False, nullable=False)
     
     # Relationships
-    analytics = db.relationship('Analytics', backref='user', lazy=True, cascade='all, delete-orphan')
+    analytics = db.relationship('Analytics', backref='user', lazy=True, cascade='all, delete-orphan',
+                                primaryjoin='User.id == foreign(Analytics.user_id)')
     
     def __init__(self, email: str, first_name: Optional[str] = None, last_name: Optional[str] = None, 
                  company: Optional[str] = None, job_title: Optional[str] = None, phone: Optional[str] = None):
@@ -27,6 +27,9 @@ class WorkExperience(BaseModel):
     # Display Settings
     display_order = db.Column(db.Integer, default=0, nullable=False)
     
+    # Normalized copy of technologies for filtering and stats (see models/technology.py)
+    technology_items = db.relationship('Technology', secondary='work_experience_technologies', lazy='select')
+    
     def __init__(self, company: str, position: str, location: Optional[str] = None,
                  start_date: Optional[date] = None, end_date: Optional[date] = None,
                  is_current: bool = False, description: Optional[str] = None,
@@ -0,0 +1,131 @@
+# Password Hashing for Wheeler Knight Portfolio
+# bcrypt runs in a small bounded thread pool at a configurable cost
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, Any, Callable, Optional
+import logging
+import os
+import threading
+
+import bcrypt
+
+from error_handling import APIError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROUNDS = 12
+
+
+class PasswordHasherBusy(APIError):
+    """Too many password hashes already queued"""
+
+    def __init__(self, message: str = "Server is busy, please try again shortly"):
+        super().__init__(message=message, status_code=503, error_code="PASSWORD_HASHER_BUSY")
+
+
+class PasswordHasher:
+    """Hash and verify passwords on a bounded pool of worker threads
+
+    bcrypt releases the GIL, so with threaded gunicorn workers other
+    requests keep running while a hash is computed. At most pool_size
+    hashes run at once per process and at most max_pending wait; further
+    calls fail fast instead of piling up behind a login flood.
+    """
+
+    def __init__(self, app=None):
+        self.rounds = DEFAULT_ROUNDS
+        self.pool_size = 2
+        self.max_pending = 16
+        self.timeout = 10.0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots = threading.BoundedSemaphore(self.pool_size + self.max_pending)
+        self._pid = None
+        self._lock = threading.Lock()
+        self._counters = {'hashed': 0, 'verified': 0, 'rejected_busy': 0, 'rehashed': 0}
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Configure cost and pool limits from the Flask app config"""
+        self.rounds = app.config.get('BCRYPT_ROUNDS', DEFAULT_ROUNDS)
+        self.pool_size = app.config.get('BCRYPT_POOL_SIZE', 2)
+        self.max_pending = app.config.get('BCRYPT_MAX_PENDING', 16)
+        self.timeout = app.config.get('BCRYPT_TIMEOUT', 10.0)
+        with self._lock:
+            self._shutdown_executor()
+            self._slots = threading.BoundedSemaphore(self.pool_size + self.max_pending)
+
+    def _shutdown_executor(self) -> None:
+        if self._executor is not None and self._pid == os.getpid():
+            self._executor.shutdown(wait=False)
+        self._executor = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Created lazily per process; pools do not survive a gunicorn fork
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix='bcrypt')
+                self._pid = os.getpid()
+            return self._executor
+
+    def _run(self, counter: str, func: Callable, *args):
+        if not self._slots.acquire(blocking=False):
+            self._count('rejected_busy')
+            raise PasswordHasherBusy()
+        try:
+            future = self._get_executor().submit(func, *args)
+            try:
+                result = future.result(timeout=self.timeout)
+            except FutureTimeoutError:
+                future.cancel()
+                raise PasswordHasherBusy()
+            self._count(counter)
+            return result
+        finally:
+            self._slots.release()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def hash(self, password: str, rounds: Optional[int] = None) -> str:
+        """bcrypt hash of password at the configured (or given) cost"""
+        salt = bcrypt.gensalt(rounds=rounds or self.rounds)
+        return self._run('hashed', bcrypt.hashpw, password.encode('utf-8'), salt).decode('utf-8')
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        """Check password against a stored bcrypt hash"""
+        try:
+            return self._run('verified', bcrypt.checkpw, password.encode('utf-8'), password_hash.encode('utf-8'))
+        except ValueError:
+            logger.warning("Stored password hash is not a valid bcrypt hash")
+            return False
+
+    @staticmethod
+    def cost(password_hash: str) -> Optional[int]:
+        """Work factor encoded in a bcrypt hash ($2b$<cost>$...)"""
+        parts = (password_hash or '').split('$')
+        if len(parts) < 4 or not parts[2].isdigit():
+            return None
+        return int(parts[2])
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """True when a stored hash was made at a different cost than configured"""
+        return self.cost(password_hash) != self.rounds
+
+    def record_rehash(self) -> None:
+        self._count('rehashed')
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hashing counters for monitoring"""
+        with self._lock:
+            counters = dict(self._counters)
+        counters.update({
+            'rounds': self.rounds,
+            'pool_size': self.pool_size,
+            'max_pending': self.max_pending
+        })
+        return counters
+
+
+# Initialize password hasher
+password_hasher = PasswordHasher()
@@ -0,0 +1,261 @@
+# Related Content Job for Wheeler Knight Portfolio
+# TF-IDF vectors over blog posts and projects with stored top-k cosine neighbours
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Set, Tuple
+import hashlib
+import logging
+import math
+
+from content_events import DebouncedJob
+from search_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+DocKey = Tuple[str, int]
+
+# Repeat weights applied to each field's terms before TF-IDF
+BLOG_POST_FIELDS = (('title', 3), ('excerpt', 2), ('content', 1))
+PROJECT_FIELDS = (('title', 3), ('description', 1), ('long_description', 1))
+PROJECT_TECHNOLOGY_WEIGHT = 2
+
+# Attributes whose changes make a document's vector stale
+WATCHED_FIELDS = {
+    'BlogPost': ('title', 'excerpt', 'content', 'status'),
+    'Project': ('title', 'description', 'long_description', 'technologies')
+}
+
+
+def _weighted_terms(fields: List[Tuple[Optional[str], int]]) -> Counter:
+    terms = Counter()
+    for text, weight in fields:
+        for term in tokenize(text):
+            terms[term] += weight
+    return terms
+
+
+def collect_documents() -> Dict[DocKey, Counter]:
+    """Weighted term counts of every published blog post and every project"""
+    from models.models import BlogPost, Project
+    from models.blog_post import PostStatus
+
+    documents: Dict[DocKey, Counter] = {}
+
+    posts = BlogPost.query.filter(BlogPost.status == PostStatus.PUBLISHED).with_entities(
+        BlogPost.id, BlogPost.title, BlogPost.excerpt, BlogPost.content
+    )
+    for post in posts:
+        documents[('blog_post', post.id)] = _weighted_terms(
+            [(getattr(post, field), weight) for field, weight in BLOG_POST_FIELDS]
+        )
+
+    for project in Project.query.all():
+        fields = [(getattr(project, field), weight) for field, weight in PROJECT_FIELDS]
+        fields.append((' '.join(project.technologies_list), PROJECT_TECHNOLOGY_WEIGHT))
+        documents[('project', project.id)] = _weighted_terms(fields)
+
+    return documents
+
+
+def content_hash(terms: Counter) -> str:
+    """Stable hash of a document's weighted terms"""
+    payload = '\x1f'.join(f'{term}\x1e{count}' for term, count in sorted(terms.items()))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def tfidf_matrix(documents: List[Counter]):
+    """Build an L2-normalized TF-IDF matrix with sublinear term frequency"""
+    import numpy as np
+
+    vocabulary: Dict[str, int] = {}
+    for terms in documents:
+        for term in terms:
+            vocabulary.setdefault(term, len(vocabulary))
+
+    matrix = np.zeros((len(documents), max(len(vocabulary), 1)), dtype=np.float32)
+    for row, terms in enumerate(documents):
+        for term, count in terms.items():
+            matrix[row, vocabulary[term]] = 1.0 + math.log(count)
+
+    document_frequency = np.count_nonzero(matrix, axis=0)
+    matrix *= (np.log((1.0 + len(documents)) / (1.0 + document_frequency)) + 1.0).astype(np.float32)
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def top_neighbors(similarities, row: int, top_k: int, min_score: float) -> List[Tuple[int, float]]:
+    """Indices and scores of the top_k most similar rows, excluding row itself"""
+    import numpy as np
+
+    scores = similarities.copy()
+    scores[row] = -1.0
+    if top_k < len(scores):
+        candidates = np.argpartition(-scores, top_k)[:top_k]
+    else:
+        candidates = np.arange(len(scores))
+    ranked = sorted(candidates, key=lambda index: (-scores[index], index))
+    return [(int(index), float(scores[index])) for index in ranked if scores[index] >= min_score]
+
+
+def _stored_neighbors() -> Dict[DocKey, List[Tuple[DocKey, float]]]:
+    from models import db
+    from models.models import RelatedItem
+
+    stored: Dict[DocKey, List[Tuple[DocKey, float]]] = {}
+    rows = db.session.query(
+        RelatedItem.source_type, RelatedItem.source_id,
+        RelatedItem.target_type, RelatedItem.target_id, RelatedItem.score
+    )
+    for source_type, source_id, target_type, target_id, score in rows:
+        stored.setdefault((source_type, source_id), []).append(((target_type, target_id), score))
+    return stored
+
+
+def _affected_rows(keys: List[DocKey], matrix, changed: Set[DocKey], deleted: Set[DocKey],
+                   top_k: int, min_score: float) -> Set[int]:
+    """Rows whose stored neighbour list may differ after the given changes
+
+    That is the changed rows themselves, rows that listed a changed or
+    deleted document, and rows that a changed document would now enter the
+    top_k of. Similarities between two unchanged documents are treated as
+    fixed, ignoring the small IDF shift; `flask related refresh --full`
+    recomputes everything.
+    """
+    positions = {key: index for index, key in enumerate(keys)}
+    changed_rows = [positions[key] for key in changed if key in positions]
+    affected = set(changed_rows)
+    stored = _stored_neighbors()
+    touched = changed | deleted
+
+    changed_similarities = matrix[changed_rows] @ matrix.T if changed_rows else None
+    for index, key in enumerate(keys):
+        if index in affected:
+            continue
+        neighbors = stored.get(key, [])
+        if any(target in touched for target, _ in neighbors):
+            affected.add(index)
+            continue
+        if changed_similarities is None:
+            continue
+        threshold = min_score if len(neighbors) < top_k else min(score for _, score in neighbors)
+        if changed_similarities[:, index].max() > threshold:
+            affected.add(index)
+
+    return affected
+
+
+def _replace_neighbors(sources: List[DocKey], neighbors: Dict[DocKey, List[Tuple[DocKey, float]]],
+                       now: datetime) -> None:
+    from models import db
+    from models.models import RelatedItem
+
+    by_type: Dict[str, List[int]] = {}
+    for doc_type, doc_id in sources:
+        by_type.setdefault(doc_type, []).append(doc_id)
+    for doc_type, doc_ids in by_type.items():
+        RelatedItem.query.filter(
+            RelatedItem.source_type == doc_type,
+            RelatedItem.source_id.in_(doc_ids)
+        ).delete(synchronize_session=False)
+
+    rows = [
+        {
+            'source_type': source[0],
+            'source_id': source[1],
+            'target_type': target[0],
+            'target_id': target[1],
+            'score': score,
+            'rank': rank,
+            'created_at': now,
+            'updated_at': now
+        }
+        for source, items in neighbors.items()
+        for rank, (target, score) in enumerate(items, start=1)
+    ]
+    if rows:
+        db.session.execute(RelatedItem.__table__.insert(), rows)
+
+
+def _update_documents(stored: Dict[DocKey, Any], hashes: Dict[DocKey, str], changed: Set[DocKey],
+                      deleted: Set[DocKey], recomputed: Set[DocKey], now: datetime) -> None:
+    """Save new content hashes and stamp computed_at on every recomputed document"""
+    from models import db
+    from models.models import RelatedDocument
+
+    for key in deleted:
+        db.session.delete(stored[key])
+    for key in changed | recomputed:
+        row = stored.get(key)
+        if row is None:
+            row = RelatedDocument(doc_type=key[0], doc_id=key[1], content_hash=hashes[key])
+            db.session.add(row)
+        else:
+            row.content_hash = hashes[key]
+        if key in recomputed:
+            row.computed_at = now
+
+
+def refresh_related(db, top_k: int = 5, min_score: float = 0.05, full: bool = False) -> Dict[str, Any]:
+    """Recompute stored neighbours for documents affected by content changes
+
+    Documents are compared with the content hashes saved by the previous
+    run, so edits made anywhere (other workers, bulk updates, SQL) are found.
+    """
+    from models.models import RelatedDocument
+
+    documents = collect_documents()
+    hashes = {key: content_hash(terms) for key, terms in documents.items()}
+    stored = {(row.doc_type, row.doc_id): row for row in RelatedDocument.query.all()}
+
+    changed = {key for key, value in hashes.items() if key not in stored or stored[key].content_hash != value}
+    deleted = set(stored) - set(hashes)
+    full = full or not stored
+
+    if not changed and not deleted and not full:
+        return {'documents': len(documents), 'changed': 0, 'deleted': 0, 'recomputed': 0}
+
+    keys = sorted(documents)
+    matrix = tfidf_matrix([documents[key] for key in keys])
+
+    if full:
+        rows = set(range(len(keys)))
+        changed = set(keys)
+    else:
+        rows = _affected_rows(keys, matrix, changed, deleted, top_k, min_score)
+
+    neighbors: Dict[DocKey, List[Tuple[DocKey, float]]] = {}
+    for row in sorted(rows):
+        similarities = matrix @ matrix[row]
+        neighbors[keys[row]] = [
+            (keys[index], round(score, 6))
+            for index, score in top_neighbors(similarities, row, top_k, min_score)
+        ]
+
+    now = datetime.utcnow()
+    _replace_neighbors(list(neighbors) + sorted(deleted), neighbors, now)
+    _update_documents(stored, hashes, changed, deleted, set(neighbors), now)
+    db.session.commit()
+
+    logger.info(
+        f"Related content refreshed: {len(changed)} changed, {len(deleted)} deleted, "
+        f"{len(neighbors)} of {len(keys)} rows recomputed"
+    )
+    return {
+        'documents': len(keys),
+        'changed': len(changed),
+        'deleted': len(deleted),
+        'recomputed': len(neighbors)
+    }
+
+
+def _refresh_from_config(app) -> Dict[str, Any]:
+    from models import db
+
+    return refresh_related(db, top_k=app.config.get('RELATED_TOP_K', 5),
+                           min_score=app.config.get('RELATED_MIN_SCORE', 0.05))
+
+
+# Initialize related content updater (recomputes shortly after blog posts or projects change)
+related_updater = DebouncedJob('related content', _refresh_from_config, WATCHED_FIELDS)
@@ -1,9 +1,12 @@
 # Base Routes Module for Wheeler Knight Portfolio
 from flask import Blueprint, jsonify, request
 from functools import wraps
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable
+from datetime import datetime
 import logging
 
+from error_handling import APIError
+
 logger = logging.getLogger(__name__)
 
 def create_api_blueprint(name: str, url_prefix: str) -> Blueprint:
@@ -29,6 +32,9 @@ def handle_api_response(func):
                     'data': result,
                     'message': 'Operation completed successfully'
                 })
+        except APIError:
+            # Rendered by the app's APIError handler with its own status and details
+            raise
         except Exception as e:
             logger.error(f"API Error in {func.__name__}: {str(e)}")
             return jsonify({
@@ -68,3 +74,92 @@ def format_pagination_response(pagination):
             'prev_num': pagination.prev_num
         }
     }
+
+MAX_BULK_ITEMS = 500
+
+def bulk_int(value: Any) -> int:
+    """Validate an integer bulk update value"""
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError("must be an integer")
+    return value
+
+def bulk_bool(value: Any) -> bool:
+    """Validate a boolean bulk update value"""
+    if not isinstance(value, bool):
+        raise ValueError("must be a boolean")
+    return value
+
+def bulk_enum(enum_class):
+    """Build a validator that converts enum values for bulk updates"""
+    def convert(value: Any):
+        try:
+            return enum_class(value)
+        except ValueError:
+            raise ValueError(f"must be one of: {', '.join(member.value for member in enum_class)}")
+    return convert
+
+def apply_bulk_update(model, data: Any, fields: Dict[str, Callable[[Any], Any]]) -> Dict[str, Any]:
+    """Apply per-row changes to many rows with a single UPDATE ... CASE statement
+
+    data is a list (or {"items": [...]}) of objects with an id plus any of the
+    allowed fields. Each field becomes one CASE id WHEN ... THEN ... ELSE col
+    END expression, so the whole batch is one round trip and one transaction.
+    """
+    from models import db
+    from error_handling import ValidationError
+
+    items = data.get('items') if isinstance(data, dict) else data
+    if not isinstance(items, list) or not items:
+        raise ValidationError("Request body must be a non-empty list of changes")
+    if len(items) > MAX_BULK_ITEMS:
+        raise ValidationError(f"At most {MAX_BULK_ITEMS} items can be updated at once")
+
+    values_by_field: Dict[str, Dict[int, Any]] = {field: {} for field in fields}
+    ids: List[int] = []
+    seen_ids = set()
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or isinstance(item.get('id'), bool) or not isinstance(item.get('id'), int):
+            raise ValidationError(f"Item {index} must be an object with an integer id")
+        if item['id'] in seen_ids:
+            raise ValidationError(f"Duplicate id in bulk update: {item['id']}")
+        seen_ids.add(item['id'])
+        ids.append(item['id'])
+
+        unknown = set(item) - set(fields) - {'id'}
+        if unknown:
+            raise ValidationError(f"Fields not allowed in bulk update: {', '.join(sorted(unknown))}")
+
+        for field, convert in fields.items():
+            if field in item:
+                try:
+                    values_by_field[field][item['id']] = convert(item[field])
+                except ValueError as e:
+                    raise ValidationError(f"Item {index}: {field} {e}", field=field)
+
+    assignments = {}
+    for field, values in values_by_field.items():
+        if not values:
+            continue
+        column = getattr(model, field)
+        assignments[column] = db.case(
+            {row_id: db.literal(value, type_=column.type) for row_id, value in values.items()},
+            value=model.id,
+            else_=column
+        )
+
+    if not assignments:
+        raise ValidationError(f"No updatable fields provided. Allowed: {', '.join(fields)}")
+    assignments[model.updated_at] = datetime.utcnow()
+
+    matched = model.query.filter(model.id.in_(ids)).update(assignments, synchronize_session=False)
+    if matched != len(ids):
+        db.session.rollback()
+        raise ValidationError(f"{len(ids) - matched} of {len(ids)} ids were not found")
+
+    db.session.commit()
+
+    return {
+        'updated': matched,
+        'ids': ids,
+        'fields': [field for field, values in values_by_field.items() if values]
+    }
@@ -0,0 +1,158 @@
+# Analytics API Routes for Wheeler Knight Portfolio
+from flask import request, current_app
+from models.models import Analytics
+from routes import create_api_blueprint, handle_api_response
+from auth import admin_required
+from analytics_ingest import analytics_ingestor
+from analytics_rollup import query_rollups
+from error_handling import ValidationError
+import logging
+import json
+import random
+from datetime import datetime, timedelta, timezone
+
+logger = logging.getLogger(__name__)
+
+# Create analytics blueprint
+analytics_bp = create_api_blueprint('analytics', 'analytics')
+
+ROLLUP_GRANULARITIES = {'hour': timedelta(days=2), 'day': timedelta(days=30)}
+ROLLUP_GROUP_BY = {'event_type', 'page_url', 'referrer_domain'}
+
+def _parse_datetime(value, field):
+    """Parse an ISO timestamp query parameter as naive UTC, like the stored timestamps"""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValidationError(f"Invalid {field} format. Use ISO 8601", field=field)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+@analytics_bp.route('/rollups', methods=['GET'])
+@handle_api_response
+@admin_required
+def get_rollups(current_user):
+    """Get aggregated event counts from the rollup tables (Admin only)"""
+
+    granularity = request.args.get('granularity', 'day')
+    if granularity not in ROLLUP_GRANULARITIES:
+        raise ValidationError(f"Invalid granularity: {granularity}")
+
+    group_by = request.args.get('group_by', 'event_type')
+    if group_by not in ROLLUP_GROUP_BY:
+        raise ValidationError(f"Invalid group_by: {group_by}")
+
+    end = _parse_datetime(request.args['end'], 'end') if request.args.get('end') else datetime.utcnow()
+    start = (_parse_datetime(request.args['start'], 'start') if request.args.get('start')
+             else end - ROLLUP_GRANULARITIES[granularity])
+    if start >= end:
+        raise ValidationError("start must be before end")
+
+    limit = max(1, min(request.args.get('limit', 50, type=int), 500))
+
+    return query_rollups(
+        granularity=granularity,
+        start=start,
+        end=end,
+        group_by=group_by,
+        event_type=request.args.get('event_type'),
+        limit=limit
+    )
+
+@analytics_bp.route('/ingest/stats', methods=['GET'])
+@handle_api_response
+@admin_required
+def get_ingest_stats(current_user):
+    """Get analytics ingestion queue counters (Admin only)"""
+    return analytics_ingestor.stats()
+
+def _beacon_string(event, key, limit):
+    """Read an optional string field from a beacon event"""
+    value = event.get(key)
+    if not isinstance(value, str) or not value:
+        return None
+    return value[:limit]
+
+def _build_beacon_event(event, session_id, sample_rate):
+    """Turn one beacon payload item into an unsaved Analytics event, or None if invalid"""
+    if not isinstance(event, dict):
+        return None
+
+    event_type = event.get('type')
+    session_id = _beacon_string(event, 'session_id', 255) or session_id
+    ip_address = request.remote_addr
+    user_agent = request.headers.get('User-Agent')
+
+    if event_type == 'page_view':
+        page_url = _beacon_string(event, 'url', 500)
+        if not page_url:
+            return None
+        analytics = Analytics.track_page_view(
+            page_url=page_url,
+            ip_address=ip_address,
+            user_agent=user_agent,
+            referrer=_beacon_string(event, 'referrer', 500),
+            session_id=session_id
+        )
+    elif event_type == 'download':
+        file_name = _beacon_string(event, 'file_name', 255)
+        if not file_name:
+            return None
+        analytics = Analytics.track_download(
+            file_name=file_name,
+            file_type=_beacon_string(event, 'file_type', 50) or 'unknown',
+            ip_address=ip_address,
+            user_agent=user_agent,
+            session_id=session_id
+        )
+        analytics.page_url = _beacon_string(event, 'url', 500)
+    else:
+        return None
+
+    if sample_rate < 1.0:
+        analytics.event_data['sample_rate'] = sample_rate
+    return analytics
+
+@analytics_bp.route('/events', methods=['POST'])
+def track_events():
+    """Record page view and download beacons (single event, list, or {"events": [...]})
+
+    Accepts any content type because navigator.sendBeacon posts text/plain.
+    Events are sampled, queued for the background ingestor and never touch
+    the database on the request path.
+    """
+    config = current_app.config
+    max_bytes = config.get('ANALYTICS_BEACON_MAX_BYTES', 65536)
+    if request.content_length is not None and request.content_length > max_bytes:
+        return '', 413
+
+    body = request.stream.read(max_bytes + 1)
+    if len(body) > max_bytes:
+        return '', 413
+
+    try:
+        payload = json.loads(body or b'null')
+    except ValueError:
+        return '', 400
+
+    if isinstance(payload, dict) and isinstance(payload.get('events'), list):
+        events = payload['events']
+    elif isinstance(payload, list):
+        events = payload
+    elif isinstance(payload, dict):
+        events = [payload]
+    else:
+        return '', 400
+
+    sample_rate = config.get('ANALYTICS_SAMPLE_RATE', 1.0)
+    session_id = request.headers.get('X-Session-ID')
+
+    for event in events[:config.get('ANALYTICS_BEACON_MAX_EVENTS', 50)]:
+        if sample_rate < 1.0 and random.random() >= sample_rate:
+            continue
+        analytics = _build_beacon_event(event, session_id, sample_rate)
+        if analytics is not None:
+            analytics_ingestor.enqueue(analytics)
+
+    return '', 204
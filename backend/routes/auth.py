@@ -1,11 +1,16 @@
 # Authentication Routes for Wheeler Knight Portfolio
 from flask import Blueprint, request, jsonify, make_response
-from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity
+from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity, get_jwt, decode_token
 from models import db
 from models.models import AdminUser
 from models.admin_user import AdminRole
 from routes import create_api_blueprint, handle_api_response, validate_required_fields
-from auth import create_tokens, get_current_user, validate_password_strength, log_auth_event
+from auth import create_tokens, get_current_user, validate_password_strength, log_auth_event, admin_required
+from login_throttle import login_throttle
+from password_hashing import password_hasher
+from admin_user_cache import admin_user_cache
+from token_revocation import token_revocation
+from jwt_claims_cache import verified_claims_cache
 from error_handling import ValidationError, AuthenticationError, AuthorizationError
 import logging
 from datetime import datetime
@@ -16,9 +21,10 @@ logger = logging.getLogger(__name__)
 auth_bp = create_api_blueprint('auth', 'auth')
 
 @auth_bp.route('/login', methods=['POST'])
+@login_throttle.limit
 @handle_api_response
 def login():
-    """Admin login endpoint"""
+    """Admin login endpoint (throttled per IP and username before any lookup)"""
     data = request.get_json()
     
     # Validate required fields
@@ -26,6 +32,7 @@ def login():
     
     username = data['username']
     password = data['password']
+    client_ip = login_throttle.client_ip()
     
     # Find user
     user = AdminUser.query.filter_by(username=username).first()
@@ -33,19 +40,30 @@ def login():
     if not user:
         log_auth_event('login_failed', None, request.remote_addr, 
                       request.headers.get('User-Agent'), {'username': username, 'reason': 'user_not_found'})
+        login_throttle.record_failure(client_ip, username)
         raise AuthenticationError("Invalid username or password")
     
     if not user.is_active:
         log_auth_event('login_failed', user.id, request.remote_addr,
                       request.headers.get('User-Agent'), {'username': username, 'reason': 'account_inactive'})
+        login_throttle.record_failure(client_ip, username)
         raise AuthenticationError("Account is inactive")
     
     # Check password
     if not user.check_password(password):
         log_auth_event('login_failed', user.id, request.remote_addr,
                       request.headers.get('User-Agent'), {'username': username, 'reason': 'invalid_password'})
+        login_throttle.record_failure(client_ip, username)
         raise AuthenticationError("Invalid username or password")
     
+    login_throttle.record_success(username)
+    
+    # Upgrade the stored hash while the plaintext is at hand if the bcrypt cost changed
+    if user.password_needs_rehash():
+        user.set_password(password)
+        password_hasher.record_rehash()
+        logger.info(f"Rehashed password for {username} at the configured bcrypt cost")
+    
     # Update last login
     user.update_last_login()
     db.session.commit()
@@ -72,6 +90,19 @@ def logout():
     """Admin logout endpoint"""
     current_user = get_current_user()
     
+    token_revocation.revoke_token(get_jwt())
+    
+    # Revoke the refresh token too when the client hands it back
+    data = request.get_json(silent=True) or {}
+    refresh_token = data.get('refresh_token') if isinstance(data, dict) else None
+    if refresh_token:
+        try:
+            refresh_claims = decode_token(refresh_token, allow_expired=True)
+            if refresh_claims.get('sub') == get_jwt().get('sub'):
+                token_revocation.revoke_token(refresh_claims)
+        except Exception as e:
+            logger.warning(f"Ignoring invalid refresh token on logout: {e}")
+    
     if current_user:
         log_auth_event('logout', current_user['id'], request.remote_addr,
                       request.headers.get('User-Agent'), {'username': current_user['username']})
@@ -89,16 +120,16 @@ def refresh():
     if not current_user:
         raise AuthenticationError("Invalid refresh token")
     
-    # Get user from database to ensure they still exist and are active
-    user = AdminUser.query.get(current_user['id'])
-    if not user or not user.is_active:
+    # Ensure the user still exists and is active (cached; dropped on any change)
+    user = admin_user_cache.get(current_user['id'])
+    if not user or not user['is_active']:
         raise AuthenticationError("User not found or inactive")
     
     # Create new access token
-    tokens = create_tokens(user.id, user.username, user.role.value)
+    tokens = create_tokens(user['id'], user['username'], user['role'])
     
-    log_auth_event('token_refresh', user.id, request.remote_addr,
-                  request.headers.get('User-Agent'), {'username': user.username})
+    log_auth_event('token_refresh', user['id'], request.remote_addr,
+                  request.headers.get('User-Agent'), {'username': user['username']})
     
     return {
         'access_token': tokens['access_token'],
@@ -106,6 +137,18 @@ def refresh():
         'expires_in': tokens['expires_in']
     }
 
+@auth_bp.route('/throttle/stats', methods=['GET'])
+@handle_api_response
+@admin_required
+def get_login_throttle_stats(current_user):
+    """Get login throttle, password hashing and auth cache counters (Admin only)"""
+    stats = login_throttle.stats()
+    stats['password_hashing'] = password_hasher.stats()
+    stats['admin_user_cache'] = admin_user_cache.stats()
+    stats['token_revocation'] = token_revocation.stats()
+    stats['jwt_claims_cache'] = verified_claims_cache.stats()
+    return stats
+
 @auth_bp.route('/me', methods=['GET'])
 @handle_api_response
 @jwt_required()
@@ -116,12 +159,12 @@ def get_current_user_info():
     if not current_user:
         raise AuthenticationError("User not found")
     
-    # Get full user data from database
-    user = AdminUser.query.get(current_user['id'])
+    # Get full user data (cached; dropped on any change)
+    user = admin_user_cache.get(current_user['id'])
     if not user:
         raise AuthenticationError("User not found")
     
-    return user.to_dict()
+    return user
 
 @auth_bp.route('/change-password', methods=['POST'])
 @handle_api_response
@@ -270,11 +313,17 @@ def update_user(user_id):
         except ValueError:
             raise ValidationError(f"Invalid role: {data['role']}")
     
+    deactivated = False
     if 'is_active' in data:
+        deactivated = user.is_active and not data['is_active']
         user.is_active = data['is_active']
     
     db.session.commit()
     
+    # Tokens already issued to a deactivated account stop working everywhere
+    if deactivated:
+        token_revocation.revoke_user(user.id)
+    
     log_auth_event('user_updated', current_user['id'], request.remote_addr,
                   request.headers.get('User-Agent'), {
                       'updated_user': user.username,
@@ -309,6 +358,7 @@ def delete_user(user_id):
     
     db.session.delete(user)
     db.session.commit()
+    token_revocation.revoke_user(user_id)
     
     logger.info(f"Admin user deleted: {user.username} by {current_user['username']}")
     
@@ -324,6 +374,10 @@ def validate_token():
     if not current_user:
         raise AuthenticationError("Invalid token")
     
+    user = admin_user_cache.get(current_user['id'])
+    if not user or not user['is_active']:
+        raise AuthenticationError("User not found or inactive")
+    
     return {
         'valid': True,
         'user': current_user,
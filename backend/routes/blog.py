@@ -1,10 +1,13 @@
 # Blog API Routes for Wheeler Knight Portfolio
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response
 from models import db
-from models.models import BlogPost
+from models.models import BlogPost, RelatedItem
 from models.blog_post import PostStatus
 from routes import create_api_blueprint, handle_api_response, validate_required_fields, paginate_query, format_pagination_response
 from auth import admin_required
+from blog_search import blog_search
+from markdown_render import highlight_css
+from image_placeholders import image_placeholders
 from error_handling import ValidationError, NotFoundError
 import logging
 from datetime import datetime
@@ -44,6 +47,7 @@ def get_blog_posts():
         
         # Paginate results
         pagination = paginate_query(query, page, per_page)
+        image_placeholders.prefetch(pagination.items)
         
         return format_pagination_response(pagination)
         
@@ -57,12 +61,15 @@ def get_blog_post(post_id):
     """Get a specific blog post by ID"""
     post = BlogPost.query.get_or_404(post_id)
     
-    # Increment view count for published posts
-    if post.is_published:
-        post.increment_views()
-        db.session.commit()
+    # Views are counted by POST /<id>/view: anonymous reads of this route are
+    # usually answered by nginx from the baked snapshot and never get here
+    data = post.to_dict()
+    data['related'] = RelatedItem.for_source('blog_post', post.id)
     
-    return post.to_dict()
+    # Readers only need the rendered HTML; editors can still ask for the source
+    if request.args.get('source', 'true').lower() == 'false' and post.content_html is not None:
+        data.pop('content')
+    return data
 
 @blog_bp.route('/slug/<slug>', methods=['GET'])
 @handle_api_response
@@ -70,12 +77,39 @@ def get_blog_post_by_slug(slug):
     """Get a blog post by slug"""
     post = BlogPost.query.filter_by(slug=slug).first_or_404()
     
-    # Increment view count for published posts
-    if post.is_published:
-        post.increment_views()
-        db.session.commit()
+    # Views are counted by POST /<id>/view: anonymous reads of this route are
+    # usually answered by nginx from the baked snapshot and never get here
+    data = post.to_dict()
+    data['related'] = RelatedItem.for_source('blog_post', post.id)
     
-    return post.to_dict()
+    # Readers only need the rendered HTML; editors can still ask for the source
+    if request.args.get('source', 'true').lower() == 'false' and post.content_html is not None:
+        data.pop('content')
+    return data
+
+@blog_bp.route('/search', methods=['GET'])
+@handle_api_response
+def search_blog_posts():
+    """Search published blog posts with ranked, highlighted results"""
+    query = request.args.get('q', '').strip()
+    if not query:
+        raise ValidationError("Query parameter 'q' is required", field='q')
+    if len(query) > 200:
+        raise ValidationError("Search query is too long", field='q')
+    
+    limit = max(1, min(int(request.args.get('limit', 10)), 50))
+    
+    try:
+        return blog_search.search(query, limit=limit, cursor=request.args.get('cursor'))
+    except ValueError:
+        raise ValidationError("Invalid cursor", field='cursor')
+
+@blog_bp.route('/highlight.css', methods=['GET'])
+def get_highlight_css():
+    """Stylesheet for syntax-highlighted code blocks in content_html"""
+    response = Response(highlight_css(), mimetype='text/css')
+    response.headers['Cache-Control'] = 'public, max-age=86400'
+    return response
 
 @blog_bp.route('/statuses', methods=['GET'])
 @handle_api_response
@@ -126,6 +160,7 @@ def create_blog_post(current_user):
     
     db.session.add(post)
     db.session.commit()
+    blog_search.index_post(post)
     
     logger.info(f"Created blog post: {post.title}")
     return post.to_dict(), 201
@@ -172,6 +207,7 @@ def update_blog_post(post_id, current_user):
             raise ValidationError(f"Invalid status: {data['status']}")
     
     db.session.commit()
+    blog_search.index_post(post)
     
     logger.info(f"Updated blog post: {post.title}")
     return post.to_dict()
@@ -185,10 +221,25 @@ def delete_blog_post(post_id, current_user):
     
     db.session.delete(post)
     db.session.commit()
+    blog_search.remove_post(post_id)
     
     logger.info(f"Deleted blog post: {post.title}")
     return {'message': 'Blog post deleted successfully'}
 
+@blog_bp.route('/<int:post_id>/view', methods=['POST'])
+@handle_api_response
+def record_blog_post_view(post_id):
+    """Count one read of a published post (sent by the post page once loaded)"""
+    post = BlogPost.query.get_or_404(post_id)
+    
+    if not post.is_published:
+        raise ValidationError("Cannot record views of unpublished posts")
+    
+    post.increment_views()
+    db.session.commit()
+    
+    return {'views_count': post.views_count}
+
 @blog_bp.route('/<int:post_id>/like', methods=['POST'])
 @handle_api_response
 def like_blog_post(post_id):
@@ -223,6 +274,7 @@ def get_blog_stats(current_user):
     popular_posts = BlogPost.query.filter(
         BlogPost.status == PostStatus.PUBLISHED
     ).order_by(BlogPost.views_count.desc()).limit(5).all()
+    image_placeholders.prefetch(popular_posts)
     
     return {
         'total_posts': total_posts,
@@ -5,6 +5,7 @@ from models.models import Message, Analytics
 from models.message import MessageStatus
 from routes import create_api_blueprint, handle_api_response, validate_required_fields, paginate_query, format_pagination_response
 from auth import admin_required
+from analytics_ingest import analytics_ingestor
 from error_handling import ValidationError, NotFoundError
 import logging
 from datetime import datetime
@@ -102,8 +103,7 @@ def create_message():
             user_agent=request.headers.get('User-Agent'),
             session_id=request.headers.get('X-Session-ID')
         )
-        db.session.add(analytics)
-        db.session.commit()
+        analytics_ingestor.enqueue(analytics)
     except Exception as e:
         logger.warning(f"Failed to track contact form analytics: {e}")
     
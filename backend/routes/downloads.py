@@ -0,0 +1,111 @@
+# Download Routes for Wheeler Knight Portfolio
+# Authorize and count a download in Flask, then hand the bytes to nginx
+# (X-Accel-Redirect) or to the WSGI server's sendfile when running standalone
+from flask import Blueprint, current_app, jsonify, request, send_file
+from flask_jwt_extended import verify_jwt_in_request
+from models.models import Upload, Analytics
+from auth import get_current_user
+from admin_user_cache import admin_user_cache
+from analytics_ingest import analytics_ingestor
+from upload_publishing import is_public
+from urllib.parse import quote
+import logging
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+# Create downloads blueprint
+downloads_bp = Blueprint('downloads', __name__, url_prefix='/api/downloads')
+
+# Uploads never change under one id (names are content hashes), so public
+# responses can be cached for a year without revalidation
+IMMUTABLE_MAX_AGE = 31536000
+
+RANGE_START = re.compile(r'^bytes=(\d*)-')
+
+
+def is_admin() -> bool:
+    """True when the request carries a token for an active admin"""
+    verify_jwt_in_request(optional=True)
+    current_user = get_current_user()
+    if not current_user:
+        return False
+    user = admin_user_cache.get(current_user['id'])
+    return bool(user and user['is_active'])
+
+
+def should_track(etag: str) -> bool:
+    """Count first fetches only: not revalidations or resumed range requests"""
+    if etag in request.if_none_match:
+        return False
+    match = RANGE_START.match(request.headers.get('Range', ''))
+    return match is None or match.group(1) in ('', '0')
+
+
+@downloads_bp.route('/<int:upload_id>', methods=['GET', 'HEAD'])
+def download_file(upload_id):
+    """Download an uploaded file (?inline=1 to display instead of save)
+
+    Range requests resume interrupted downloads; the ETag is the file's
+    SHA-256 so unchanged files revalidate with a 304.
+    """
+    upload = Upload.query.get(upload_id)
+    if upload is None:
+        return jsonify({'success': False, 'error': 'File not found'}), 404
+
+    public = is_public(upload)
+    if not public and not is_admin():
+        return jsonify({
+            'success': False,
+            'error': 'Authentication required',
+            'message': 'Please log in to access this file'
+        }), 401
+
+    upload_folder = os.path.abspath(current_app.config.get('UPLOAD_FOLDER', 'uploads'))
+    file_path = os.path.join(upload_folder, *upload.relative_path.split('/'))
+    if not os.path.isfile(file_path):
+        logger.warning(f"Upload {upload.id} is indexed but missing on disk: {upload.relative_path}")
+        return jsonify({'success': False, 'error': 'File not found'}), 404
+
+    if request.method == 'GET' and should_track(upload.content_hash):
+        analytics_ingestor.enqueue(Analytics.track_download(
+            file_name=upload.original_filename or upload.relative_path.rsplit('/', 1)[-1],
+            file_type=upload.mime_type or upload.category,
+            ip_address=request.remote_addr,
+            user_agent=request.headers.get('User-Agent'),
+            session_id=request.headers.get('X-Session-ID')
+        ))
+
+    download_name = upload.original_filename or upload.relative_path.rsplit('/', 1)[-1]
+    as_attachment = request.args.get('inline', '0') not in ('1', 'true')
+    accel_prefix = current_app.config.get('UPLOAD_ACCEL_REDIRECT_PREFIX', '')
+
+    if accel_prefix and upload.content_hash in request.if_none_match:
+        response = current_app.response_class(status=304)
+    elif accel_prefix:
+        # nginx serves the file from an internal location with sendfile and
+        # handles Range itself; revalidation by ETag is answered above
+        response = current_app.response_class(mimetype=upload.mime_type or 'application/octet-stream')
+        response.headers['X-Accel-Redirect'] = accel_prefix.rstrip('/') + '/' + quote(upload.relative_path)
+        response.headers['Content-Disposition'] = (
+            f"{'attachment' if as_attachment else 'inline'}; filename*=UTF-8''{quote(download_name)}"
+        )
+    else:
+        response = send_file(
+            file_path,
+            mimetype=upload.mime_type,
+            as_attachment=as_attachment,
+            download_name=download_name,
+            conditional=True,
+            etag=upload.content_hash,
+            max_age=IMMUTABLE_MAX_AGE
+        )
+
+    response.headers['ETag'] = f'"{upload.content_hash}"'
+    response.headers['Accept-Ranges'] = 'bytes'
+    if public:
+        response.headers['Cache-Control'] = f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+    else:
+        response.headers['Cache-Control'] = 'private, no-store'
+    return response
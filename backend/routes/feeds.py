@@ -0,0 +1,37 @@
+# Feed Routes for Wheeler Knight Portfolio
+# nginx serves these files straight from FEEDS_OUTPUT_DIR in production; these
+# routes cover development and any deployment without the static location
+from flask import Blueprint, current_app, send_from_directory
+from static_feeds import generate_feeds
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Create feeds blueprint (feeds live at the site root like /rss.xml)
+feeds_bp = Blueprint('feeds', __name__)
+
+FEED_MIMETYPES = {
+    'rss.xml': 'application/rss+xml',
+    'atom.xml': 'application/atom+xml',
+    'projects.xml': 'application/rss+xml',
+    'sitemap.xml': 'application/xml'
+}
+
+@feeds_bp.route('/<any(rss.xml, atom.xml, projects.xml, sitemap.xml):filename>', methods=['GET'])
+@feeds_bp.route('/api/feeds/<any(rss.xml, atom.xml, projects.xml, sitemap.xml):filename>', methods=['GET'])
+def get_feed(filename):
+    """Serve a generated feed with ETag / Last-Modified validation (304 when unchanged)"""
+    output_dir = os.path.abspath(current_app.config.get('FEEDS_OUTPUT_DIR', 'public'))
+    if not os.path.exists(os.path.join(output_dir, filename)):
+        generate_feeds(current_app)
+
+    response = send_from_directory(
+        output_dir, filename,
+        mimetype=FEED_MIMETYPES[filename],
+        conditional=True,
+        etag=True,
+        max_age=300
+    )
+    response.headers['Cache-Control'] = 'public, max-age=300'
+    return response
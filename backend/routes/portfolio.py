@@ -3,8 +3,9 @@ from flask import Blueprint, request, jsonify
 from models import db
 from models.models import Education, WorkExperience, Interest
 from models.interest import InterestCategory
-from routes import create_api_blueprint, handle_api_response, validate_required_fields, paginate_query, format_pagination_response
+from routes import create_api_blueprint, handle_api_response, validate_required_fields, paginate_query, format_pagination_response, apply_bulk_update, bulk_int, bulk_bool, bulk_enum
 from auth import admin_required
+from image_placeholders import image_placeholders
 from error_handling import ValidationError, NotFoundError
 import logging
 from datetime import date
@@ -122,6 +123,19 @@ def update_education(edu_id, current_user):
     logger.info(f"Updated education record: {education.degree} at {education.institution}")
     return education.to_dict()
 
+@portfolio_bp.route('/education/bulk', methods=['PATCH'])
+@handle_api_response
+@admin_required
+def bulk_update_education(current_user):
+    """Reorder or update many education records in one statement (Admin only)"""
+    result = apply_bulk_update(Education, request.get_json(), {
+        'display_order': bulk_int,
+        'is_current': bulk_bool
+    })
+    
+    logger.info(f"Bulk updated {result['updated']} education records")
+    return result
+
 # Work Experience routes
 @portfolio_bp.route('/experience', methods=['GET'])
 @handle_api_response
@@ -251,6 +265,7 @@ def get_interests():
         query = query.filter(Interest.is_featured == True)
     
     interests = query.order_by(Interest.display_order.asc(), Interest.title.asc()).all()
+    image_placeholders.prefetch(interests)
     return [interest.to_dict() for interest in interests]
 
 @portfolio_bp.route('/interests/<int:interest_id>', methods=['GET'])
@@ -327,6 +342,20 @@ def update_interest(interest_id, current_user):
     logger.info(f"Updated interest: {interest.title}")
     return interest.to_dict()
 
+@portfolio_bp.route('/interests/bulk', methods=['PATCH'])
+@handle_api_response
+@admin_required
+def bulk_update_interests(current_user):
+    """Reorder or update many interests in one statement (Admin only)"""
+    result = apply_bulk_update(Interest, request.get_json(), {
+        'display_order': bulk_int,
+        'is_featured': bulk_bool,
+        'category': bulk_enum(InterestCategory)
+    })
+    
+    logger.info(f"Bulk updated {result['updated']} interests")
+    return result
+
 @portfolio_bp.route('/interests/categories', methods=['GET'])
 @handle_api_response
 def get_interest_categories():
@@ -357,6 +386,7 @@ def get_portfolio_summary():
     
     # Get featured interests
     featured_interests = Interest.query.filter(Interest.is_featured == True).limit(5).all()
+    image_placeholders.prefetch(featured_interests)
     
     return {
         'education_count': education_count,
@@ -1,10 +1,12 @@
 # Projects API Routes for Wheeler Knight Portfolio
 from flask import Blueprint, request, jsonify
 from models import db
-from models.models import Project
+from models.models import Project, RelatedItem, Technology
+from models.technology import project_technologies
 from models.project import ProjectStatus
-from routes import create_api_blueprint, handle_api_response, validate_required_fields, paginate_query, format_pagination_response
+from routes import create_api_blueprint, handle_api_response, validate_required_fields, paginate_query, format_pagination_response, apply_bulk_update, bulk_int, bulk_bool, bulk_enum
 from auth import admin_required
+from image_placeholders import image_placeholders
 from error_handling import ValidationError, NotFoundError
 import logging
 from datetime import date
@@ -22,6 +24,7 @@ def get_projects():
         # Get query parameters
         status = request.args.get('status')
         featured_only = request.args.get('featured', 'false').lower() == 'true'
+        technology = request.args.get('technology')
         page = int(request.args.get('page', 1))
         per_page = int(request.args.get('per_page', 10))
         
@@ -39,11 +42,16 @@ def get_projects():
         if featured_only:
             query = query.filter(Project.is_featured == True)
         
+        if technology:
+            # Uses the unique slug index and the technology_id index on the link table
+            query = query.join(Project.technology_items).filter(Technology.slug == Technology.slugify(technology))
+        
         # Order by display_order and created_at
         query = query.order_by(Project.display_order.asc(), Project.created_at.desc())
         
         # Paginate results
         pagination = paginate_query(query, page, per_page)
+        image_placeholders.prefetch(pagination.items)
         
         return format_pagination_response(pagination)
         
@@ -56,7 +64,9 @@ def get_projects():
 def get_project(project_id):
     """Get a specific project by ID"""
     project = Project.query.get_or_404(project_id)
-    return project.to_dict()
+    data = project.to_dict()
+    data['related'] = RelatedItem.for_source('project', project.id)
+    return data
 
 @projects_bp.route('/statuses', methods=['GET'])
 @handle_api_response
@@ -197,6 +207,20 @@ def update_project(project_id, current_user):
     logger.info(f"Updated project: {project.title}")
     return project.to_dict()
 
+@projects_bp.route('/bulk', methods=['PATCH'])
+@handle_api_response
+@admin_required
+def bulk_update_projects(current_user):
+    """Reorder or update many projects in one statement (Admin only)"""
+    result = apply_bulk_update(Project, request.get_json(), {
+        'display_order': bulk_int,
+        'is_featured': bulk_bool,
+        'status': bulk_enum(ProjectStatus)
+    })
+    
+    logger.info(f"Bulk updated {result['updated']} projects")
+    return result
+
 @projects_bp.route('/<int:project_id>', methods=['DELETE'])
 @handle_api_response
 @admin_required
@@ -224,11 +248,12 @@ def get_projects_stats(current_user):
         status_stats[status.value] = count
     
     # Get technology usage stats
-    all_projects = Project.query.all()
-    technology_stats = {}
-    for project in all_projects:
-        for tech in project.technologies_list:
-            technology_stats[tech] = technology_stats.get(tech, 0) + 1
+    technology_counts = db.session.query(
+        Technology.name, db.func.count(project_technologies.c.project_id)
+    ).join(
+        project_technologies, project_technologies.c.technology_id == Technology.id
+    ).group_by(Technology.id, Technology.name).all()
+    technology_stats = {name: count for name, count in technology_counts}
     
     return {
         'total_projects': total_projects,
@@ -9,6 +9,10 @@ from routes.contact import contact_bp
 from routes.portfolio import portfolio_bp
 from routes.auth import auth_bp
 from routes.upload import upload_bp
+from routes.analytics import analytics_bp
+from routes.search import search_bp
+from routes.feeds import feeds_bp
+from routes.downloads import downloads_bp
 
 def register_blueprints(app: Flask):
     """Register all API blueprints with the Flask app"""
@@ -21,6 +25,10 @@ def register_blueprints(app: Flask):
     app.register_blueprint(contact_bp)
     app.register_blueprint(portfolio_bp)
     app.register_blueprint(upload_bp)
+    app.register_blueprint(analytics_bp)
+    app.register_blueprint(search_bp)
+    app.register_blueprint(feeds_bp)
+    app.register_blueprint(downloads_bp)
     
     # Add a general API info route
     @app.route('/api')
@@ -38,6 +46,11 @@ def register_blueprints(app: Flask):
                 'contact': '/api/contact',
                 'portfolio': '/api/portfolio',
                 'upload': '/api/upload',
+                'downloads': '/api/downloads/<upload_id>',
+                'analytics': '/api/analytics',
+                'search': '/api/search',
+                'autocomplete': '/api/autocomplete',
+                'feeds': '/api/feeds/<rss.xml|atom.xml|projects.xml|sitemap.xml>',
                 'health': '/api/health',
                 'docs': '/api/docs'
             },
@@ -52,5 +65,9 @@ __all__ = [
     'blog_bp',
     'contact_bp',
     'portfolio_bp',
+    'analytics_bp',
+    'search_bp',
+    'feeds_bp',
+    'downloads_bp',
     'register_blueprints'
 ]
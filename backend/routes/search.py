@@ -0,0 +1,52 @@
+# Search API Routes for Wheeler Knight Portfolio
+from flask import Blueprint, request
+from routes import handle_api_response
+from site_search import site_search, SEARCH_TYPES
+from autocomplete import autocomplete
+from error_handling import ValidationError
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Create search blueprint (site-wide endpoints live directly under /api)
+search_bp = Blueprint('search', __name__, url_prefix='/api')
+
+@search_bp.route('/search', methods=['GET'])
+@handle_api_response
+def search():
+    """Search projects, skills, experience, education, interests and blog posts"""
+    query = request.args.get('q', '').strip()
+    if not query:
+        raise ValidationError("Query parameter 'q' is required", field='q')
+    if len(query) > 200:
+        raise ValidationError("Search query is too long", field='q')
+    
+    types = None
+    if request.args.get('types'):
+        types = [value.strip() for value in request.args['types'].split(',') if value.strip()]
+        invalid = [value for value in types if value not in SEARCH_TYPES]
+        if invalid:
+            raise ValidationError(f"Invalid types: {', '.join(invalid)}. Allowed: {', '.join(SEARCH_TYPES)}")
+    
+    limit = max(1, min(int(request.args.get('limit', 20)), 50))
+    
+    try:
+        return site_search.search(query, types=types, limit=limit, cursor=request.args.get('cursor'))
+    except ValueError:
+        raise ValidationError("Invalid cursor", field='cursor')
+
+@search_bp.route('/autocomplete', methods=['GET'])
+@handle_api_response
+def autocomplete_suggestions():
+    """Suggest skill names and technologies starting with q, most used first"""
+    query = request.args.get('q', '')
+    if len(query) > 100:
+        raise ValidationError("Autocomplete query is too long", field='q')
+    
+    source_type = request.args.get('type')
+    if source_type and source_type not in ('skill', 'technology'):
+        raise ValidationError(f"Invalid type: {source_type}. Allowed: skill, technology")
+    
+    limit = max(1, min(int(request.args.get('limit', 10)), 50))
+    
+    return autocomplete.suggest(query, limit=limit, source_type=source_type)
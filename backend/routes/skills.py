@@ -3,7 +3,7 @@ from flask import Blueprint, request, jsonify
 from models import db
 from models.models import Skill
 from models.skill import SkillCategory
-from routes import create_api_blueprint, handle_api_response, validate_required_fields, paginate_query, format_pagination_response
+from routes import create_api_blueprint, handle_api_response, validate_required_fields, paginate_query, format_pagination_response, apply_bulk_update, bulk_int, bulk_bool, bulk_enum
 from auth import admin_required
 from error_handling import ValidationError, NotFoundError
 import logging
@@ -151,6 +151,29 @@ def update_skill(skill_id, current_user):
     logger.info(f"Updated skill: {skill.name}")
     return skill.to_dict()
 
+def _bulk_proficiency_level(value):
+    """Validate a proficiency level for bulk updates"""
+    if value is not None:
+        value = bulk_int(value)
+        if not (1 <= value <= 5):
+            raise ValueError("must be between 1 and 5")
+    return value
+
+@skills_bp.route('/bulk', methods=['PATCH'])
+@handle_api_response
+@admin_required
+def bulk_update_skills(current_user):
+    """Reorder or update many skills in one statement (Admin only)"""
+    result = apply_bulk_update(Skill, request.get_json(), {
+        'display_order': bulk_int,
+        'is_featured': bulk_bool,
+        'proficiency_level': _bulk_proficiency_level,
+        'category': bulk_enum(SkillCategory)
+    })
+    
+    logger.info(f"Bulk updated {result['updated']} skills")
+    return result
+
 @skills_bp.route('/<int:skill_id>', methods=['DELETE'])
 @handle_api_response
 @admin_required
@@ -2,13 +2,22 @@
 from flask import Blueprint, request, jsonify, current_app
 from werkzeug.utils import secure_filename
 from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.formparser import parse_form_data
 import os
-import uuid
-from datetime import datetime
 from functools import wraps
-from routes import handle_api_response
+from sqlalchemy.orm import selectinload
+from routes import handle_api_response, paginate_query, format_pagination_response, validate_required_fields
+from models import db
+from models.models import Upload, UploadReference
 from auth import admin_required
 from error_handling import APIError, ValidationError
+from upload_storage import content_store, FileTooLarge
+from image_variants import image_variants
+from image_optimizer import image_optimizer
+from image_placeholders import image_placeholders
+from upload_publishing import upload_publisher
+from upload_index import record_upload
+from upload_sessions import resumable_uploads, parse_content_range
 import logging
 
 logger = logging.getLogger(__name__)
@@ -19,6 +28,9 @@ upload_bp = Blueprint('upload', __name__, url_prefix='/api/upload')
 # Allowed file extensions
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp', 'svg', 'pdf', 'doc', 'docx'}
 
+# Allowance for multipart boundaries and headers on top of MAX_FILE_SIZE
+MULTIPART_OVERHEAD = 64 * 1024
+
 def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and \
@@ -36,72 +48,133 @@ def get_file_category(filename):
     else:
         return 'other'
 
+def receive_upload():
+    """Stream the request's file to a temp file and return (filename, writer)
+
+    Accepts a multipart form with a "file" field, or the raw file as the
+    request body with its name in the X-File-Name header (or ?filename=).
+    Bytes are hashed and size-checked as they arrive; nothing is buffered
+    in memory and an oversized upload stops at MAX_FILE_SIZE.
+    """
+    max_size = content_store.max_size
+    if request.content_length and request.content_length > max_size + MULTIPART_OVERHEAD:
+        raise FileTooLarge(max_size)
+    
+    if request.mimetype != 'multipart/form-data':
+        filename = request.headers.get('X-File-Name') or request.args.get('filename', '')
+        if not filename:
+            raise ValidationError("No file provided")
+        if not allowed_file(filename):
+            raise ValidationError(f"File type not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}")
+        return filename, content_store.receive(request.stream)
+    
+    writers = []
+    try:
+        _, _, files = parse_form_data(
+            request.environ, stream_factory=content_store.stream_factory(writers), silent=False
+        )
+    except BaseException:
+        for writer in writers:
+            writer.discard()
+        raise
+    
+    # Only the "file" part is kept; any other file parts are dropped
+    file = files.get('file')
+    for writer in writers:
+        if file is None or writer is not file.stream:
+            writer.discard()
+    
+    if file is None:
+        raise ValidationError("No file provided")
+    
+    if file.filename == '':
+        file.stream.discard()
+        raise ValidationError("No file selected")
+    
+    if not allowed_file(file.filename):
+        file.stream.discard()
+        raise ValidationError(f"File type not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}")
+    
+    return file.filename, file.stream
+
+def store_upload(folder, current_user):
+    """Receive an upload and store it content-addressed under folder"""
+    original_filename, writer = receive_upload()
+    filename = secure_filename(original_filename)
+    _, ext = os.path.splitext(filename)
+    
+    writer.close()
+    stored = commit_upload(writer.path, writer.hexdigest(), writer.size, folder, ext)
+    return upload_result(stored, filename, current_user)
+
+def commit_upload(temp_path, content_hash, size, folder, ext):
+    """Store a received temp file, optimizing images first
+
+    The optimized bytes are what get hashed and stored, so the content
+    address always matches the file on disk. original_size stays None when
+    the image was not optimized (pool busy, or nothing to gain).
+    """
+    optimized = image_optimizer.optimize(temp_path, ext, content_store.incoming_dir) if folder == 'images' else None
+    if optimized is None:
+        return content_store.commit_file(temp_path, content_hash, size, folder, ext)
+    
+    os.remove(temp_path)
+    stored = content_store.commit_file(
+        optimized.file_path, optimized.content_hash, optimized.file_size, folder, optimized.ext
+    )
+    logger.info(f"Optimized {stored.relative_path}: {optimized.original_size} -> {optimized.file_size} bytes")
+    return stored._replace(original_size=optimized.original_size)
+
+def upload_result(stored, filename, current_user):
+    """Record a stored file in the upload index and describe it for the response"""
+    upload = record_upload(
+        stored.relative_path, stored.content_hash, stored.file_size, filename,
+        get_file_category(filename), current_user['id'], stored.file_path, stored.original_size
+    )
+    
+    logger.info(f"Upload stored: {stored.relative_path} ({'duplicate' if stored.deduplicated else 'new'}) "
+                f"by user {current_user['id']}")
+    
+    result = {
+        'id': upload.id,
+        'filename': os.path.basename(stored.relative_path),
+        'original_filename': filename,
+        'file_path': stored.file_path,
+        'file_url': stored.file_url,
+        'download_url': upload.download_url,
+        'file_size': stored.file_size,
+        'original_size': upload.original_size or upload.file_size,
+        'bytes_saved': upload.bytes_saved,
+        'file_category': get_file_category(filename),
+        'content_hash': stored.content_hash,
+        'mime_type': upload.mime_type,
+        'width': upload.width,
+        'height': upload.height,
+        'placeholder': upload.placeholder,
+        'deduplicated': stored.deduplicated,
+        'uploaded_at': upload.created_at.isoformat(),
+        'uploaded_by': upload.uploaded_by
+    }
+    
+    # Resized variants are built off the request; srcset fields appear once done
+    if stored.relative_path.startswith('images/'):
+        image_variants.submit(stored.file_path, stored.content_hash)
+        result['responsive'] = image_variants.responsive(stored.file_url)
+    
+    return result
+
 @upload_bp.route('/image', methods=['POST'])
 @handle_api_response
 @admin_required
 def upload_image(current_user):
     """Upload an image file (Admin only)"""
     try:
-        # Check if file is present
-        if 'file' not in request.files:
-            raise ValidationError("No file provided")
-        
-        file = request.files['file']
-        
-        # Check if file is selected
-        if file.filename == '':
-            raise ValidationError("No file selected")
-        
-        # Check if file is allowed
-        if not allowed_file(file.filename):
-            raise ValidationError(f"File type not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}")
-        
-        # Check file size
-        file.seek(0, os.SEEK_END)
-        file_size = file.tell()
-        file.seek(0)
-        
-        max_size = current_app.config.get('MAX_FILE_SIZE', 10 * 1024 * 1024)  # 10MB default
-        if file_size > max_size:
-            raise ValidationError(f"File too large. Maximum size: {max_size // (1024*1024)}MB")
-        
-        # Generate unique filename
-        filename = secure_filename(file.filename)
-        name, ext = os.path.splitext(filename)
-        unique_filename = f"{name}_{uuid.uuid4().hex[:8]}{ext}"
-        
-        # Create upload directory if it doesn't exist
-        upload_folder = current_app.config.get('UPLOAD_FOLDER', 'uploads')
-        if not os.path.exists(upload_folder):
-            os.makedirs(upload_folder)
-        
-        # Create subdirectory for images
-        image_folder = os.path.join(upload_folder, 'images')
-        if not os.path.exists(image_folder):
-            os.makedirs(image_folder)
-        
-        # Save file
-        file_path = os.path.join(image_folder, unique_filename)
-        file.save(file_path)
-        
-        # Generate URL
-        file_url = f"/uploads/images/{unique_filename}"
-        
-        logger.info(f"Image uploaded: {unique_filename} by user {current_user.id}")
-        
-        return {
-            'filename': unique_filename,
-            'original_filename': filename,
-            'file_path': file_path,
-            'file_url': file_url,
-            'file_size': file_size,
-            'file_category': get_file_category(filename),
-            'uploaded_at': datetime.utcnow().isoformat(),
-            'uploaded_by': current_user.id
-        }, 201
+        return store_upload('images', current_user), 201
         
     except RequestEntityTooLarge:
-        raise APIError("File too large", status_code=413)
+        raise FileTooLarge(content_store.max_size)
+    except APIError:
+        raise
     except Exception as e:
         logger.error(f"Error uploading image: {str(e)}")
         raise APIError(f"Upload failed: {str(e)}")
@@ -112,98 +185,158 @@ def upload_image(current_user):
 def upload_document(current_user):
     """Upload a document file (Admin only)"""
     try:
-        # Check if file is present
-        if 'file' not in request.files:
-            raise ValidationError("No file provided")
-        
-        file = request.files['file']
-        
-        # Check if file is selected
-        if file.filename == '':
-            raise ValidationError("No file selected")
-        
-        # Check if file is allowed
-        if not allowed_file(file.filename):
-            raise ValidationError(f"File type not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}")
-        
-        # Check file size
-        file.seek(0, os.SEEK_END)
-        file_size = file.tell()
-        file.seek(0)
-        
-        max_size = current_app.config.get('MAX_FILE_SIZE', 10 * 1024 * 1024)  # 10MB default
-        if file_size > max_size:
-            raise ValidationError(f"File too large. Maximum size: {max_size // (1024*1024)}MB")
-        
-        # Generate unique filename
-        filename = secure_filename(file.filename)
-        name, ext = os.path.splitext(filename)
-        unique_filename = f"{name}_{uuid.uuid4().hex[:8]}{ext}"
-        
-        # Create upload directory if it doesn't exist
-        upload_folder = current_app.config.get('UPLOAD_FOLDER', 'uploads')
-        if not os.path.exists(upload_folder):
-            os.makedirs(upload_folder)
-        
-        # Create subdirectory for documents
-        doc_folder = os.path.join(upload_folder, 'documents')
-        if not os.path.exists(doc_folder):
-            os.makedirs(doc_folder)
-        
-        # Save file
-        file_path = os.path.join(doc_folder, unique_filename)
-        file.save(file_path)
-        
-        # Generate URL
-        file_url = f"/uploads/documents/{unique_filename}"
-        
-        logger.info(f"Document uploaded: {unique_filename} by user {current_user.id}")
-        
-        return {
-            'filename': unique_filename,
-            'original_filename': filename,
-            'file_path': file_path,
-            'file_url': file_url,
-            'file_size': file_size,
-            'file_category': get_file_category(filename),
-            'uploaded_at': datetime.utcnow().isoformat(),
-            'uploaded_by': current_user.id
-        }, 201
+        return store_upload('documents', current_user), 201
         
     except RequestEntityTooLarge:
-        raise APIError("File too large", status_code=413)
+        raise FileTooLarge(content_store.max_size)
+    except APIError:
+        raise
     except Exception as e:
         logger.error(f"Error uploading document: {str(e)}")
         raise APIError(f"Upload failed: {str(e)}")
 
+@upload_bp.route('/sessions', methods=['POST'])
+@handle_api_response
+@admin_required
+def create_upload_session(current_user):
+    """Start a resumable upload (Admin only)
+
+    Body: {"filename", "size", "category": "image" or "document" (default
+    from the extension), "checksum": optional SHA-256 hex}. Then PUT each
+    chunk to /sessions/<id> with a Content-Range header, and POST
+    /sessions/<id>/complete. GET /sessions/<id> reports the offset to
+    resume from after a dropped connection.
+    """
+    data = request.get_json() or {}
+    validate_required_fields(data, ['filename', 'size'])
+    
+    filename = secure_filename(str(data['filename']))
+    if not allowed_file(filename):
+        raise ValidationError(f"File type not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}")
+    
+    category = data.get('category') or get_file_category(filename)
+    folder = 'images' if category == 'image' else 'documents'
+    
+    try:
+        size = int(data['size'])
+    except (TypeError, ValueError):
+        raise ValidationError("size must be an integer")
+    
+    session = resumable_uploads.create(filename, folder, size, data.get('checksum'), current_user['id'])
+    result = session.to_dict()
+    result['chunk_size'] = resumable_uploads.max_chunk_size
+    return result, 201
+
+@upload_bp.route('/sessions/<session_key>', methods=['GET'])
+@handle_api_response
+@admin_required
+def get_upload_session(session_key, current_user):
+    """Get a resumable upload's state, including the offset to send next (Admin only)"""
+    return resumable_uploads.get(session_key).to_dict()
+
+@upload_bp.route('/sessions/<session_key>', methods=['PUT'])
+@handle_api_response
+@admin_required
+def upload_session_chunk(session_key, current_user):
+    """Append one chunk (raw body, Content-Range: bytes start-end/total) (Admin only)"""
+    length = request.content_length
+    if not length:
+        raise ValidationError("Content-Length required")
+    
+    offset = parse_content_range(request.headers.get('Content-Range'), length)
+    return resumable_uploads.append(session_key, offset, request.stream, length).to_dict()
+
+@upload_bp.route('/sessions/<session_key>/complete', methods=['POST'])
+@handle_api_response
+@admin_required
+def complete_upload_session(session_key, current_user):
+    """Verify and store a fully received resumable upload (Admin only)"""
+    filename = resumable_uploads.get(session_key).filename
+    stored = resumable_uploads.complete(session_key, store=commit_upload)
+    return upload_result(stored, filename, current_user), 201
+
+@upload_bp.route('/sessions/<session_key>', methods=['DELETE'])
+@handle_api_response
+@admin_required
+def abort_upload_session(session_key, current_user):
+    """Cancel a resumable upload and discard the received bytes (Admin only)"""
+    resumable_uploads.abort(session_key)
+    return {'message': 'Upload session cancelled'}
+
+@upload_bp.route('/optimization', methods=['GET'])
+@handle_api_response
+@admin_required
+def optimization_stats(current_user):
+    """Bytes saved by image optimization, in total and in this process's pool (Admin only)"""
+    optimized, original_bytes, stored_bytes = db.session.query(
+        db.func.count(Upload.id),
+        db.func.coalesce(db.func.sum(Upload.original_size), 0),
+        db.func.coalesce(db.func.sum(Upload.file_size), 0)
+    ).filter(Upload.original_size.isnot(None)).one()
+    pending = Upload.query.filter(
+        Upload.mime_type.in_(('image/jpeg', 'image/png')), Upload.original_size.is_(None)
+    ).count()
+    
+    return {
+        'files_optimized': optimized,
+        'files_pending': pending,
+        'original_bytes': int(original_bytes),
+        'stored_bytes': int(stored_bytes),
+        'bytes_saved': int(original_bytes) - int(stored_bytes),
+        'pool': image_optimizer.stats()
+    }
+
 @upload_bp.route('/files', methods=['GET'])
 @handle_api_response
 @admin_required
 def list_uploaded_files(current_user):
-    """List all uploaded files (Admin only)"""
+    """List uploaded files, newest first, with filters and pagination (Admin only)
+
+    Query parameters: category, mime_type, uploaded_by, unused (true for
+    files nothing links to, false for linked ones), q (filename search),
+    sort (newest, oldest, largest), page and per_page.
+    """
     try:
-        upload_folder = current_app.config.get('UPLOAD_FOLDER', 'uploads')
-        files = []
-        
-        if os.path.exists(upload_folder):
-            for root, dirs, filenames in os.walk(upload_folder):
-                for filename in filenames:
-                    file_path = os.path.join(root, filename)
-                    file_size = os.path.getsize(file_path)
-                    relative_path = os.path.relpath(file_path, upload_folder)
-                    file_url = f"/uploads/{relative_path.replace(os.sep, '/')}"
-                    
-                    files.append({
-                        'filename': filename,
-                        'file_path': file_path,
-                        'file_url': file_url,
-                        'file_size': file_size,
-                        'file_category': get_file_category(filename),
-                        'uploaded_at': datetime.fromtimestamp(os.path.getctime(file_path)).isoformat()
-                    })
-        
-        return {'files': files}
-        
+        page = int(request.args.get('page', 1))
+        per_page = min(int(request.args.get('per_page', 50)), 200)
+        
+        query = Upload.query.options(selectinload(Upload.references))
+        
+        category = request.args.get('category')
+        if category:
+            query = query.filter(Upload.category == category)
+        
+        mime_type = request.args.get('mime_type')
+        if mime_type:
+            query = query.filter(Upload.mime_type == mime_type)
+        
+        uploaded_by = request.args.get('uploaded_by', type=int)
+        if uploaded_by:
+            query = query.filter(Upload.uploaded_by == uploaded_by)
+        
+        unused = request.args.get('unused')
+        if unused is not None:
+            referenced = db.session.query(UploadReference.id).filter(UploadReference.upload_id == Upload.id).exists()
+            query = query.filter(~referenced if unused.lower() == 'true' else referenced)
+        
+        search = request.args.get('q', '').strip()
+        if search:
+            query = query.filter(Upload.original_filename.ilike(f'%{search}%'))
+        
+        sort = request.args.get('sort', 'newest')
+        if sort == 'oldest':
+            query = query.order_by(Upload.created_at.asc(), Upload.id.asc())
+        elif sort == 'largest':
+            query = query.order_by(Upload.file_size.desc(), Upload.id.desc())
+        else:
+            query = query.order_by(Upload.created_at.desc(), Upload.id.desc())
+        
+        result = format_pagination_response(paginate_query(query, page, per_page))
+        result['files'] = result.pop('items')
+        return result
+        
+    except APIError:
+        raise
     except Exception as e:
         logger.error(f"Error listing files: {str(e)}")
         raise APIError(f"Failed to list files: {str(e)}")
@@ -220,13 +353,26 @@ def delete_file(filename, current_user):
         if not os.path.exists(file_path):
             raise APIError("File not found", status_code=404)
         
-        # Remove file
+        # Remove file and its metadata row (references go with it)
         os.remove(file_path)
         
-        logger.info(f"File deleted: {filename} by user {current_user.id}")
+        upload = Upload.query.filter_by(relative_path=filename.replace(os.sep, '/')).first()
+        if upload is not None:
+            db.session.delete(upload)
+            db.session.commit()
+        
+        content_hash = image_variants.content_hash(f"/uploads/{filename}")
+        if content_hash:
+            image_variants.remove(content_hash)
+        image_placeholders.invalidate(f"/uploads/{filename}")
+        upload_publisher.publish()
+        
+        logger.info(f"File deleted: {filename} by user {current_user['id']}")
         
         return {'message': 'File deleted successfully'}
         
+    except APIError:
+        raise
     except Exception as e:
         logger.error(f"Error deleting file: {str(e)}")
         raise APIError(f"Failed to delete file: {str(e)}")
@@ -0,0 +1,202 @@
+# In-Process Text Search Index for Wheeler Knight Portfolio
+from typing import Dict, Any, Hashable, Iterable, List, Optional, Tuple
+from markupsafe import escape
+import base64
+import json
+import math
+import re
+import threading
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#'.-]*[a-z0-9+#]|[a-z0-9]")
+MARKUP_PATTERN = re.compile(r'!?\[([^\]]*)\]\([^)]*\)|^[ \t]*(?:#{1,6}|>)[ \t]?|[*`~]+|(?<!\w)_+|_+(?!\w)', re.MULTILINE)
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+STOP_WORDS = frozenset("""
+a an and are as at be but by for from has have i in is it its of on or that the
+this to was were will with you your
+""".split())
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split text into lowercase search terms, dropping stop words"""
+    if not text:
+        return []
+    return [term for term in TOKEN_PATTERN.findall(text.lower()) if term not in STOP_WORDS]
+
+
+def plain_text(text: Optional[str]) -> str:
+    """Strip Markdown markup and collapse whitespace for snippets"""
+    if not text:
+        return ''
+    text = MARKUP_PATTERN.sub(lambda match: match.group(1) or ' ', text)
+    return WHITESPACE_PATTERN.sub(' ', text).strip()
+
+
+def _term_pattern(terms: Iterable[str]) -> Optional[re.Pattern]:
+    terms = sorted(set(terms), key=len, reverse=True)
+    if not terms:
+        return None
+    return re.compile(r'(?<![\w])(' + '|'.join(re.escape(term) for term in terms) + r')(?![\w])', re.IGNORECASE)
+
+
+def highlight(text: Optional[str], terms: Iterable[str]) -> str:
+    """HTML-escape text and wrap matched terms in <mark> tags"""
+    text = text or ''
+    pattern = _term_pattern(terms)
+    if pattern is None:
+        return str(escape(text))
+
+    parts = []
+    position = 0
+    for match in pattern.finditer(text):
+        parts.append(str(escape(text[position:match.start()])))
+        parts.append(f'<mark>{escape(match.group(0))}</mark>')
+        position = match.end()
+    parts.append(str(escape(text[position:])))
+    return ''.join(parts)
+
+
+def make_snippet(text: Optional[str], terms: Iterable[str], width: int = 200) -> str:
+    """Cut a window of text around the first matched term and highlight it"""
+    terms = list(terms)
+    text = plain_text(text)
+    pattern = _term_pattern(terms)
+    match = pattern.search(text) if pattern else None
+
+    start = 0
+    if match and match.start() > width // 3:
+        start = match.start() - width // 3
+        # Start on a word boundary
+        space = text.find(' ', start)
+        if space != -1 and space < match.start():
+            start = space + 1
+    end = min(len(text), start + width)
+    if end < len(text):
+        space = text.rfind(' ', start, end)
+        if space > start:
+            end = space
+
+    snippet = highlight(text[start:end], terms)
+    if start > 0:
+        snippet = '&hellip;' + snippet
+    if end < len(text):
+        snippet += '&hellip;'
+    return snippet
+
+
+def encode_cursor(score: float, key: Any) -> str:
+    """Encode the (score, key) of the last hit on a page as an opaque cursor"""
+    payload = json.dumps([score, key], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[float, Any]:
+    """Decode a cursor produced by encode_cursor; raises ValueError if malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        score, key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return float(score), key
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+class InvertedIndex:
+    """Thread-safe inverted index with weighted fields and BM25 ranking
+
+    Each document is a set of (text, weight) fields; a term's frequency in a
+    document is the weighted sum of its occurrences, so a title match can
+    count for more than a body match.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[Hashable, float]] = {}
+        self._doc_terms: Dict[Hashable, Dict[str, float]] = {}
+        self._doc_lengths: Dict[Hashable, float] = {}
+        self._total_length = 0.0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._doc_terms
+
+    def add(self, key: Hashable, fields: Iterable[Tuple[Optional[str], float]]) -> None:
+        """Index a document, replacing any previous version with the same key"""
+        frequencies: Dict[str, float] = {}
+        for text, weight in fields:
+            for term in tokenize(text):
+                frequencies[term] = frequencies.get(term, 0.0) + weight
+        self.add_terms(key, frequencies)
+
+    def add_terms(self, key: Hashable, frequencies: Dict[str, float]) -> None:
+        """Index a document from precomputed weighted term frequencies"""
+        with self._lock:
+            self._remove(key)
+            if not frequencies:
+                return
+            for term, frequency in frequencies.items():
+                self._postings.setdefault(term, {})[key] = frequency
+            length = sum(frequencies.values())
+            self._doc_terms[key] = dict(frequencies)
+            self._doc_lengths[key] = length
+            self._total_length += length
+
+    def terms(self, key: Hashable) -> Dict[str, float]:
+        """Get the weighted term frequencies stored for a document"""
+        with self._lock:
+            return dict(self._doc_terms.get(key, {}))
+
+    def remove(self, key: Hashable) -> None:
+        """Remove a document from the index if present"""
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key: Hashable) -> None:
+        frequencies = self._doc_terms.pop(key, None)
+        if frequencies is None:
+            return
+        for term in frequencies:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(key, 0.0)
+
+    def clear(self) -> None:
+        """Remove every document"""
+        with self._lock:
+            self._postings.clear()
+            self._doc_terms.clear()
+            self._doc_lengths.clear()
+            self._total_length = 0.0
+
+    def search(self, query: str) -> List[Tuple[Hashable, float]]:
+        """Rank documents matching any query term, best first"""
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+
+        scores: Dict[Hashable, float] = {}
+        with self._lock:
+            document_count = len(self._doc_terms)
+            if not document_count:
+                return []
+            average_length = self._total_length / document_count or 1.0
+
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (document_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for key, frequency in postings.items():
+                    length_norm = 1 - BM25_B + BM25_B * self._doc_lengths[key] / average_length
+                    scores[key] = scores.get(key, 0.0) + idf * frequency * (BM25_K1 + 1) / (frequency + BM25_K1 * length_norm)
+
+        return sorted(((key, round(score, 6)) for key, score in scores.items()),
+                      key=lambda hit: (-hit[1], hit[0]))
@@ -2,7 +2,6 @@
 from flask import Flask
 from models import db
 from models.models import AdminUser
-import bcrypt
 
 # Create Flask app context
 app = Flask(__name__)
@@ -17,8 +16,7 @@ def set_admin_password():
         admin = AdminUser.query.filter_by(username='wheeler').first()
         if admin:
             # Set password to 'admin123' using bcrypt
-            salt = bcrypt.gensalt()
-            admin.password_hash = bcrypt.hashpw('admin123'.encode('utf-8'), salt).decode('utf-8')
+            admin.set_password('admin123')
             db.session.commit()
             print(f"✅ Password set for admin user: {admin.username}")
         else:
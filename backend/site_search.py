@@ -0,0 +1,400 @@
+# Site-Wide Search for Wheeler Knight Portfolio
+# One inverted index over every public content type, kept current by commit events
+from typing import Dict, Any, Callable, List, NamedTuple, Optional, Tuple
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from content_events import content_events, table_signature
+from search_index import InvertedIndex, tokenize, highlight, make_snippet, encode_cursor, decode_cursor
+
+logger = logging.getLogger(__name__)
+
+INDEX_FORMAT_VERSION = 1
+
+
+class SearchSource(NamedTuple):
+    """How one model is turned into a search document"""
+    type: str
+    model: str
+    fields: Tuple[str, ...]  # Attributes whose changes require reindexing
+    document: Callable[[Any], Optional[Dict[str, Any]]]
+
+
+def _project_document(project) -> Dict[str, Any]:
+    return {
+        'title': project.title,
+        'summary': project.description,
+        'url': '/projects',
+        'text': [
+            (project.title, 3.0),
+            (' '.join(project.technologies_list), 2.0),
+            (project.description, 1.0),
+            (project.long_description, 1.0)
+        ]
+    }
+
+
+def _skill_document(skill) -> Dict[str, Any]:
+    return {
+        'title': skill.name,
+        'summary': skill.description,
+        'url': '/resume',
+        'text': [
+            (skill.name, 3.0),
+            (skill.category.value if skill.category else None, 1.0),
+            (skill.description, 1.0)
+        ]
+    }
+
+
+def _work_experience_document(experience) -> Dict[str, Any]:
+    return {
+        'title': f"{experience.position} at {experience.company}",
+        'summary': experience.description,
+        'url': '/resume',
+        'text': [
+            (experience.position, 3.0),
+            (experience.company, 3.0),
+            (' '.join(experience.technologies_list), 2.0),
+            (experience.location, 1.0),
+            (experience.description, 1.0),
+            (experience.achievements, 1.0)
+        ]
+    }
+
+
+def _education_document(education) -> Dict[str, Any]:
+    return {
+        'title': f"{education.degree}, {education.institution}",
+        'summary': education.field_of_study or education.description,
+        'url': '/resume',
+        'text': [
+            (education.degree, 3.0),
+            (education.institution, 3.0),
+            (education.field_of_study, 2.0),
+            (education.description, 1.0),
+            (education.achievements, 1.0)
+        ]
+    }
+
+
+def _interest_document(interest) -> Dict[str, Any]:
+    return {
+        'title': interest.title,
+        'summary': interest.description,
+        'url': '/about',
+        'text': [
+            (interest.title, 3.0),
+            (interest.category.value if interest.category else None, 1.0),
+            (interest.description, 1.0)
+        ]
+    }
+
+
+def _blog_post_document(post) -> Optional[Dict[str, Any]]:
+    if not post.is_published:
+        return None
+    return {
+        'title': post.title,
+        'summary': post.excerpt or post.content,
+        'url': f'/blog/{post.slug}',
+        'text': [
+            (post.title, 3.0),
+            (post.excerpt, 2.0),
+            (post.content, 1.0)
+        ]
+    }
+
+
+SEARCH_SOURCES = (
+    SearchSource('project', 'Project',
+                 ('title', 'description', 'long_description', 'technologies'), _project_document),
+    SearchSource('skill', 'Skill', ('name', 'category', 'description'), _skill_document),
+    SearchSource('work_experience', 'WorkExperience',
+                 ('company', 'position', 'location', 'description', 'achievements', 'technologies'),
+                 _work_experience_document),
+    SearchSource('education', 'Education',
+                 ('institution', 'degree', 'field_of_study', 'description', 'achievements'), _education_document),
+    SearchSource('interest', 'Interest', ('title', 'category', 'description'), _interest_document),
+    SearchSource('blog_post', 'BlogPost', ('title', 'slug', 'excerpt', 'content', 'status'), _blog_post_document)
+)
+
+SEARCH_TYPES = tuple(source.type for source in SEARCH_SOURCES)
+
+
+def _document_key(doc_type: str, doc_id: int) -> str:
+    return f"{doc_type}:{doc_id}"
+
+
+class SiteSearch:
+    """Ranked search across projects, skills, experience, education, interests and blog posts
+
+    Each worker keeps the index in memory. Commits made through the ORM in
+    this process are applied immediately; writes from other workers and bulk
+    updates are caught by comparing a per-table (count, max(updated_at))
+    signature every SEARCH_REFRESH_SECONDS. The index is saved to
+    SEARCH_INDEX_PATH with that signature so a new worker can load it
+    instead of rebuilding.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.index = InvertedIndex()
+        self.documents: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+        self._pid = None
+        self._signature = None
+        self._checked_at = 0.0
+        self.index_path = None
+        self.refresh_seconds = 30
+        self.snippet_length = 160
+        self._sources = {}
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Configure site search and subscribe to content changes"""
+        from models import models
+
+        self.app = app
+        self.index_path = app.config.get('SEARCH_INDEX_PATH')
+        self.refresh_seconds = app.config.get('SEARCH_REFRESH_SECONDS', 30)
+        self.snippet_length = app.config.get('SEARCH_SNIPPET_LENGTH', 160)
+
+        self._sources = {getattr(models, source.model): source for source in SEARCH_SOURCES}
+        content_events.subscribe(
+            {model: source.fields for model, source in self._sources.items()},
+            self._snapshot,
+            self._apply_changes
+        )
+
+    # Building documents
+
+    def _snapshot(self, instance) -> Optional[Dict[str, Any]]:
+        """Build the stored document for a model instance, or None if it is not searchable"""
+        source = self._sources[type(instance)]
+        document = source.document(instance)
+        if document is None:
+            return None
+
+        text = document.pop('text')
+        terms: Dict[str, float] = {}
+        for value, weight in text:
+            for term in tokenize(value):
+                terms[term] = terms.get(term, 0.0) + weight
+
+        document.update({
+            'type': source.type,
+            'id': instance.id,
+            'summary': (document.get('summary') or '')[:1000],
+            'terms': terms
+        })
+        return document
+
+    def _put(self, document: Dict[str, Any]) -> None:
+        key = _document_key(document['type'], document['id'])
+        self.index.add_terms(key, document['terms'])
+        self.documents[key] = {name: value for name, value in document.items() if name != 'terms'}
+
+    def _drop(self, key: str) -> None:
+        self.index.remove(key)
+        self.documents.pop(key, None)
+
+    def _apply_changes(self, changes) -> None:
+        """Apply committed ORM changes from this process to the in-memory index"""
+        if self._pid != os.getpid():
+            return  # Not loaded yet; the next search loads a fresh copy
+
+        types = {source.model: source.type for source in SEARCH_SOURCES}
+        with self._lock:
+            for change in changes:
+                if change.snapshot is None:
+                    self._drop(_document_key(types[change.model], change.id))
+                else:
+                    self._put(change.snapshot)
+
+        self._persist_async()
+
+    # Freshness and persistence
+
+    def _current_signature(self, connection=None) -> List[Any]:
+        return table_signature(self._sources, connection)
+
+    def rebuild(self) -> int:
+        """Rebuild the index from the database and save it"""
+        index = InvertedIndex()
+        documents = {}
+        for model in self._sources:
+            for instance in model.query.all():
+                document = self._snapshot(instance)
+                if document is None:
+                    continue
+                key = _document_key(document['type'], document['id'])
+                index.add_terms(key, document['terms'])
+                documents[key] = {name: value for name, value in document.items() if name != 'terms'}
+
+        signature = self._current_signature()
+        with self._lock:
+            self.index = index
+            self.documents = documents
+            self._signature = signature
+            self._pid = os.getpid()
+            self._checked_at = time.monotonic()
+
+        logger.info(f"Built site search index with {len(documents)} documents")
+        self.save()
+        return len(documents)
+
+    def load(self) -> bool:
+        """Load the saved index if it matches the database; returns False if a rebuild is needed"""
+        if not self.index_path or not os.path.exists(self.index_path):
+            return False
+
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable search index {self.index_path}: {e}")
+            return False
+
+        if data.get('version') != INDEX_FORMAT_VERSION or data.get('signature') != self._current_signature():
+            return False
+
+        index = InvertedIndex()
+        documents = {}
+        for key, document in data['documents'].items():
+            index.add_terms(key, document.pop('terms'))
+            documents[key] = document
+
+        with self._lock:
+            self.index = index
+            self.documents = documents
+            self._signature = data['signature']
+            self._pid = os.getpid()
+            self._checked_at = time.monotonic()
+
+        logger.info(f"Loaded site search index with {len(documents)} documents from {self.index_path}")
+        return True
+
+    def save(self, signature: Optional[List[Any]] = None) -> None:
+        """Write the index to SEARCH_INDEX_PATH atomically"""
+        if not self.index_path:
+            return
+
+        with self._lock:
+            data = {
+                'version': INDEX_FORMAT_VERSION,
+                'signature': signature if signature is not None else self._signature,
+                'documents': {
+                    key: dict(document, terms=self.index.terms(key))
+                    for key, document in self.documents.items()
+                }
+            }
+
+        directory = os.path.dirname(os.path.abspath(self.index_path))
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.search_index-', suffix='.json')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(temp_path, self.index_path)
+        except OSError as e:
+            logger.error(f"Failed to save search index to {self.index_path}: {e}")
+
+    def _persist_async(self) -> None:
+        """Record the new signature and save from a background thread
+
+        after_commit handlers cannot use the session, so the signature is read
+        on a fresh connection outside the request.
+        """
+        def persist():
+            from models import db
+
+            try:
+                with self.app.app_context():
+                    with db.engine.connect() as connection:
+                        signature = self._current_signature(connection)
+                with self._lock:
+                    self._signature = signature
+                    self._checked_at = time.monotonic()
+                self.save(signature)
+            except Exception as e:
+                logger.error(f"Failed to persist site search index: {e}")
+
+        threading.Thread(target=persist, name='site-search-persist', daemon=True).start()
+
+    def _ensure_fresh(self) -> None:
+        """Load or build the index once per process and rebuild it after outside writes"""
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid() and not self.load():
+                    self.rebuild()
+            return
+
+        if time.monotonic() - self._checked_at < self.refresh_seconds:
+            return
+
+        if self._current_signature() != self._signature:
+            self.rebuild()
+        else:
+            self._checked_at = time.monotonic()
+
+    # Querying
+
+    def search(self, query: str, types: Optional[List[str]] = None, limit: int = 20,
+               cursor: Optional[str] = None) -> Dict[str, Any]:
+        """Search every content type; raises ValueError for an invalid cursor"""
+        after = None
+        if cursor:
+            after_score, after_key = decode_cursor(cursor)
+            if not isinstance(after_key, str):
+                raise ValueError("Invalid cursor")
+            after = (after_score, after_key)
+
+        terms = tokenize(query)
+        hits = []
+        if terms:
+            self._ensure_fresh()
+            hits = self.index.search(query)
+
+        counts = {doc_type: 0 for doc_type in SEARCH_TYPES}
+        filtered = []
+        for key, score in hits:
+            doc_type = key.split(':', 1)[0]
+            counts[doc_type] += 1
+            if types and doc_type not in types:
+                continue
+            if after is not None and not (score < after[0] or (score == after[0] and key > after[1])):
+                continue
+            filtered.append((key, score))
+
+        page = filtered[:limit]
+        items = []
+        for key, score in page:
+            document = self.documents.get(key)
+            if document is None:
+                continue
+            items.append({
+                'type': document['type'],
+                'id': document['id'],
+                'title': document['title'],
+                'title_highlighted': highlight(document['title'], terms),
+                'snippet': make_snippet(document['summary'], terms, self.snippet_length),
+                'url': document['url'],
+                'score': score
+            })
+
+        return {
+            'query': query,
+            'items': items,
+            'counts': counts,
+            'next_cursor': encode_cursor(page[-1][1], page[-1][0]) if len(filtered) > limit else None
+        }
+
+
+# Initialize site search
+site_search = SiteSearch()
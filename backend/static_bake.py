@@ -0,0 +1,323 @@
+# Static API Snapshots for Wheeler Knight Portfolio
+# Public GET endpoints are rendered through the test client and written as
+# JSON files (plus .gz variants) that nginx serves without touching gunicorn
+from datetime import datetime
+from typing import Dict, Any, Iterable, List, NamedTuple, Optional, Set, Tuple
+import fcntl
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from content_events import DebouncedJob, table_signature
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = '.bake-manifest.json'
+LOCK_NAME = '.bake.lock'
+MANIFEST_VERSION = 1
+INDEX_FILE = 'index.json'
+
+# Columns that change on reads rather than edits; a stale count in a snapshot is fine
+IGNORED_COLUMNS = {'id', 'created_at', 'updated_at', 'views_count', 'likes_count'}
+
+SAFE_SLUG = re.compile(r'^[A-Za-z0-9_-]+$')
+
+# Endpoints that do not depend on any table
+STATIC_PATHS = ('/api/contact/info',)
+
+
+class BakeGroup(NamedTuple):
+    """Snapshot paths that depend on one model"""
+    model: str
+    lists: Tuple[str, ...]
+    items: Tuple[str, ...]  # formatted with each public row's attributes
+    published_only: bool = False
+
+
+BAKE_GROUPS = (
+    BakeGroup('Skill', ('/api/skills/', '/api/skills/categories'), ('/api/skills/{id}',)),
+    BakeGroup('Project', ('/api/projects/', '/api/projects/statuses'), ('/api/projects/{id}',)),
+    BakeGroup('BlogPost', ('/api/blog/', '/api/blog/statuses'), ('/api/blog/{id}', '/api/blog/slug/{slug}'),
+              published_only=True),
+    BakeGroup('Education', ('/api/portfolio/education', '/api/portfolio/summary'),
+              ('/api/portfolio/education/{id}',)),
+    BakeGroup('WorkExperience', ('/api/portfolio/experience', '/api/portfolio/summary'),
+              ('/api/portfolio/experience/{id}',)),
+    BakeGroup('Interest', ('/api/portfolio/interests', '/api/portfolio/interests/categories', '/api/portfolio/summary'),
+              ('/api/portfolio/interests/{id}',)),
+)
+
+# Detail pages embedding stored related items (see related_content.py)
+RELATED_GROUPS = {'blog_post': 'BlogPost', 'project': 'Project'}
+
+
+def _model(name: str):
+    from models import models
+    return getattr(models, name)
+
+
+def _content_fields(name: str) -> Tuple[str, ...]:
+    return tuple(
+        attribute.key for attribute in inspect(_model(name)).column_attrs
+        if attribute.key not in IGNORED_COLUMNS
+    )
+
+
+class SnapshotWriter:
+    """Render paths through the test client and keep the output tree and manifest in sync"""
+
+    def __init__(self, app, output_dir: str):
+        self.app = app
+        self.output_dir = output_dir
+        self.client = app.test_client()
+        self.manifest = self._load_manifest()
+        self.written = 0
+        self.unchanged = 0
+        self.removed = 0
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(os.path.join(self.output_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') == MANIFEST_VERSION:
+                return manifest
+        except (OSError, ValueError):
+            pass
+        return {'version': MANIFEST_VERSION, 'signatures': {}, 'related_synced_at': None, 'entries': {}}
+
+    def _file_path(self, path: str) -> str:
+        return os.path.join(self.output_dir, path.strip('/'), INDEX_FILE)
+
+    def _write_atomic(self, file_path: str, data: bytes) -> None:
+        directory = os.path.dirname(file_path)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.bake-', suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, file_path)
+
+    def bake(self, path: str, source: Optional[str] = None) -> None:
+        """Render one path; non-200 responses remove any existing snapshot"""
+        response = self.client.get(path)
+        if response.status_code != 200:
+            self.remove(path)
+            return
+
+        body = response.get_data()
+        digest = hashlib.sha256(body).hexdigest()
+        entry = self.manifest['entries'].get(path)
+        file_path = self._file_path(path)
+        if entry and entry['sha256'] == digest and os.path.exists(file_path):
+            self.unchanged += 1
+            entry['source'] = source
+            return
+
+        # mtime=0 keeps the gzip bytes stable for identical content
+        compressed = gzip.compress(body, compresslevel=9, mtime=0)
+        self._write_atomic(file_path, body)
+        self._write_atomic(file_path + '.gz', compressed)
+        self.manifest['entries'][path] = {
+            'file': os.path.relpath(file_path, self.output_dir),
+            'sha256': digest,
+            'bytes': len(body),
+            'gzip_bytes': len(compressed),
+            'source': source,
+            'baked_at': datetime.utcnow().isoformat()
+        }
+        self.written += 1
+
+    def remove(self, path: str) -> None:
+        if self.manifest['entries'].pop(path, None) is None:
+            return
+        file_path = self._file_path(path)
+        for name in (file_path, file_path + '.gz'):
+            try:
+                os.remove(name)
+            except FileNotFoundError:
+                pass
+        self.removed += 1
+
+    def sources(self, prefix: str) -> Dict[str, List[str]]:
+        """Baked item paths grouped by source key ("Model:id") for one model"""
+        grouped: Dict[str, List[str]] = {}
+        for path, entry in self.manifest['entries'].items():
+            source = entry.get('source')
+            if source and source.startswith(prefix + ':'):
+                grouped.setdefault(source, []).append(path)
+        return grouped
+
+    def save(self) -> None:
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._write_atomic(
+            os.path.join(self.output_dir, MANIFEST_NAME),
+            json.dumps(self.manifest, sort_keys=True, indent=1).encode('utf-8')
+        )
+
+
+def _rebake_items(writer: SnapshotWriter, group: BakeGroup, ids: Optional[Set[int]]) -> None:
+    """Re-render item paths for ids (every row when ids is None) and drop paths of rows that are gone"""
+    model = _model(group.model)
+    query = model.query
+    if ids is not None:
+        query = query.filter(model.id.in_(ids))
+    rows = {row.id: row for row in query.all()}
+
+    baked = writer.sources(group.model)
+    candidates = set(rows) | {int(source.split(':', 1)[1]) for source in baked}
+    if ids is not None:
+        candidates &= ids
+
+    for row_id in sorted(candidates):
+        source = f"{group.model}:{row_id}"
+        row = rows.get(row_id)
+        paths = []
+        if row is not None and (not group.published_only or row.is_published):
+            paths = [
+                template.format(id=row.id, slug=getattr(row, 'slug', ''))
+                for template in group.items
+            ]
+            paths = [path for path in paths if SAFE_SLUG.match(path.rsplit('/', 1)[1])]
+
+        for path in baked.get(source, []):
+            if path not in paths:
+                writer.remove(path)
+        for path in paths:
+            writer.bake(path, source)
+
+
+def _related_sources(since: Optional[str]) -> Dict[str, Set[int]]:
+    """Source ids whose related items were recomputed after since, even to an empty list"""
+    from models.models import RelatedDocument
+
+    query = RelatedDocument.query.with_entities(RelatedDocument.doc_type, RelatedDocument.doc_id).filter(
+        RelatedDocument.computed_at.isnot(None)
+    )
+    if since:
+        query = query.filter(RelatedDocument.computed_at >= datetime.fromisoformat(since))
+
+    sources: Dict[str, Set[int]] = {}
+    for source_type, source_id in query:
+        model = RELATED_GROUPS.get(source_type)
+        if model:
+            sources.setdefault(model, set()).add(source_id)
+    return sources
+
+
+def bake_snapshots(app, changes: Optional[Dict[str, Set[int]]] = None, full: bool = False) -> Dict[str, Any]:
+    """Bring the snapshot tree up to date
+
+    changes maps model names to ids known to have changed (from commit
+    events); only those rows and their model's list endpoints are rendered.
+    A model whose table signature moved without any known ids (bulk
+    updates, other processes, cron runs) is re-rendered as a whole; view
+    and like counters do not move signatures, so reads never cause this.
+    Runs hold an exclusive file lock so workers never interleave writes.
+    """
+    output_dir = app.config.get('BAKE_OUTPUT_DIR', 'public')
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, LOCK_NAME), 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        return _bake(app, output_dir, changes or {}, full)
+
+
+def _bake(app, output_dir: str, changes: Dict[str, Set[int]], full: bool) -> Dict[str, Any]:
+    writer = SnapshotWriter(app, output_dir)
+    full = full or not writer.manifest['entries']
+
+    started = datetime.utcnow()
+    signature = table_signature([_model(group.model) for group in BAKE_GROUPS])
+    signatures = {group.model: signature[index * 2:index * 2 + 2] for index, group in enumerate(BAKE_GROUPS)}
+    stored = writer.manifest['signatures']
+    related = {} if full else _related_sources(writer.manifest.get('related_synced_at'))
+
+    if full:
+        for path in STATIC_PATHS:
+            writer.bake(path)
+
+    baked_lists: Set[str] = set()
+    for group in BAKE_GROUPS:
+        ids = changes.get(group.model)
+        if full or (not ids and stored.get(group.model) != signatures[group.model]):
+            item_ids, refresh_lists = None, True
+        elif ids:
+            item_ids, refresh_lists = set(ids) | related.get(group.model, set()), True
+        elif group.model in related:
+            item_ids, refresh_lists = related[group.model], False
+        else:
+            continue
+
+        if refresh_lists:
+            for path in group.lists:
+                if path not in baked_lists:
+                    writer.bake(path)
+                    baked_lists.add(path)
+        _rebake_items(writer, group, item_ids)
+
+    writer.manifest['signatures'] = signatures
+    writer.manifest['related_synced_at'] = started.isoformat()
+    writer.save()
+
+    if writer.written or writer.removed:
+        logger.info(f"Static snapshots updated: {writer.written} written, {writer.removed} removed")
+    return {
+        'written': writer.written,
+        'unchanged': writer.unchanged,
+        'removed': writer.removed,
+        'output_dir': writer.output_dir
+    }
+
+
+class SnapshotUpdater(DebouncedJob):
+    """Re-bake snapshots shortly after admin writes, rendering only what changed"""
+
+    def __init__(self):
+        super().__init__('static snapshot', self._bake_pending, {})
+        self._changes: Dict[str, Set[int]] = {}
+        self._changes_lock = threading.Lock()
+
+    def init_app(self, app, delay: float = 5.0):
+        """Subscribe to content models; bulk UPDATE/DELETE statements schedule a signature check"""
+        self.watched = {group.model: _content_fields(group.model) for group in BAKE_GROUPS}
+        super().init_app(app, delay)
+        if delay >= 0:
+            event.listen(Session, 'do_orm_execute', self._on_bulk_statement)
+
+    def trigger(self, changes=None) -> None:
+        with self._changes_lock:
+            for change in changes or []:
+                self._changes.setdefault(change.model, set()).add(change.id)
+        super().trigger()
+
+    def trigger_rows(self, rows: Iterable[Tuple[str, int]]) -> None:
+        """Schedule a re-bake of (model name, id) rows changed outside the database (e.g. image variants)"""
+        if self.app is None or self.delay < 0:
+            return
+        with self._changes_lock:
+            for model, row_id in rows:
+                self._changes.setdefault(model, set()).add(row_id)
+        super().trigger()
+
+    def _on_bulk_statement(self, orm_execute_state) -> None:
+        if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+            return
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None and (mapper.class_.__name__ in self.watched or mapper.class_.__name__ == 'RelatedItem'):
+            super().trigger()
+
+    def _bake_pending(self, app) -> Dict[str, Any]:
+        with self._changes_lock:
+            changes, self._changes = self._changes, {}
+        return bake_snapshots(app, changes)
+
+
+# Initialize snapshot updater (re-bakes public API JSON after content changes)
+snapshot_updater = SnapshotUpdater()
@@ -0,0 +1,252 @@
+# Static Feeds and Sitemap for Wheeler Knight Portfolio
+# RSS/Atom feeds and sitemap.xml are written as files nginx serves directly
+from datetime import datetime
+from email.utils import format_datetime
+from typing import Dict, Any, List
+from xml.sax.saxutils import escape, quoteattr
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+from content_events import DebouncedJob
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = '.feeds-manifest.json'
+MANIFEST_VERSION = 1
+
+# Public pages listed in the sitemap besides individual blog posts
+SITEMAP_PAGES = (
+    ('/', 'weekly', '1.0'),
+    ('/about', 'monthly', '0.8'),
+    ('/resume', 'monthly', '0.8'),
+    ('/projects', 'weekly', '0.9'),
+    ('/blog', 'weekly', '0.9'),
+    ('/contact', 'yearly', '0.5'),
+)
+
+# Attributes that change what the feeds contain
+WATCHED_FIELDS = {
+    'BlogPost': ('title', 'slug', 'excerpt', 'content', 'status', 'published_at'),
+    'Project': ('title', 'description', 'technologies', 'github_url', 'live_url', 'status')
+}
+
+
+def _iso(value: datetime) -> str:
+    return value.replace(microsecond=0).isoformat() + 'Z'
+
+
+def _rfc822(value: datetime) -> str:
+    return format_datetime(value.replace(microsecond=0), usegmt=False).replace('-0000', '+0000')
+
+
+def _entry_hash(values: List[Any]) -> str:
+    payload = '\x1f'.join('' if value is None else str(value) for value in values)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _blog_fragments(post, site_url: str, modified: datetime) -> Dict[str, str]:
+    url = f"{site_url}/blog/{post.slug}"
+    summary = post.excerpt or ''
+    published = post.published_at or post.created_at
+    return {
+        'rss': (
+            f"<item><title>{escape(post.title)}</title><link>{escape(url)}</link>"
+            f"<guid isPermaLink=\"true\">{escape(url)}</guid><pubDate>{_rfc822(published)}</pubDate>"
+            f"<description>{escape(summary)}</description></item>"
+        ),
+        'atom': (
+            f"<entry><title>{escape(post.title)}</title><link href={quoteattr(url)}/>"
+            f"<id>{escape(url)}</id><published>{_iso(published)}</published><updated>{_iso(modified)}</updated>"
+            f"<summary>{escape(summary)}</summary>"
+            f"<content type=\"html\">{escape(post.content_html or '')}</content></entry>"
+        ),
+        'sitemap': (
+            f"<url><loc>{escape(url)}</loc><lastmod>{_iso(modified)}</lastmod>"
+            f"<changefreq>monthly</changefreq><priority>0.7</priority></url>"
+        )
+    }
+
+
+def _project_fragments(project, site_url: str, modified: datetime) -> Dict[str, str]:
+    link = project.live_url or project.github_url or f"{site_url}/projects"
+    guid = f"{site_url}/projects#project-{project.id}"
+    technologies = ', '.join(project.technologies_list)
+    description = project.description + (f" ({technologies})" if technologies else '')
+    return {
+        'rss': (
+            f"<item><title>{escape(project.title)}</title><link>{escape(link)}</link>"
+            f"<guid isPermaLink=\"false\">{escape(guid)}</guid><pubDate>{_rfc822(project.created_at)}</pubDate>"
+            f"<description>{escape(description)}</description></item>"
+        )
+    }
+
+
+class FeedWriter:
+    """Regenerate only changed feed entries and rewrite only files whose bytes changed
+
+    Rendered XML fragments and a hash of each entry's source fields are kept
+    in a manifest next to the output. Unchanged files keep their mtime, so
+    nginx keeps answering If-Modified-Since / If-None-Match with 304.
+    """
+
+    def __init__(self, output_dir: str, site_url: str, max_items: int = 20):
+        self.output_dir = output_dir
+        self.site_url = site_url.rstrip('/')
+        self.max_items = max_items
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        path = os.path.join(self.output_dir, MANIFEST_NAME)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') == MANIFEST_VERSION and manifest.get('site_url') == self.site_url:
+                return manifest
+        except (OSError, ValueError):
+            pass
+        return {'version': MANIFEST_VERSION, 'site_url': self.site_url, 'entries': {}}
+
+    def _write_if_changed(self, name: str, content: str) -> bool:
+        path = os.path.join(self.output_dir, name)
+        data = content.encode('utf-8')
+        try:
+            with open(path, 'rb') as f:
+                if f.read() == data:
+                    return False
+        except OSError:
+            pass
+
+        fd, temp_path = tempfile.mkstemp(dir=self.output_dir, prefix='.feed-', suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+        return True
+
+    def _refresh_entries(self, manifest: Dict[str, Any], rows: List[Any], prefix: str,
+                         fields: List[str], build) -> Dict[str, Any]:
+        """Re-render fragments for rows whose source fields changed since the last run"""
+        now = datetime.utcnow()
+        entries = {}
+        for row in rows:
+            key = f"{prefix}:{row.id}"
+            digest = _entry_hash([getattr(row, field) for field in fields])
+            previous = manifest['entries'].get(key)
+            if previous and previous['hash'] == digest:
+                entries[key] = previous
+                continue
+
+            modified = now if previous else (getattr(row, 'published_at', None) or row.created_at)
+            entries[key] = {
+                'hash': digest,
+                'modified': _iso(modified),
+                'fragments': build(row, self.site_url, modified)
+            }
+            self.rendered += 1
+        return entries
+
+    def generate(self) -> Dict[str, Any]:
+        """Write rss.xml, atom.xml, projects.xml and sitemap.xml"""
+        from models.models import BlogPost, Project
+        from models.blog_post import PostStatus
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        manifest = self._load_manifest()
+        self.rendered = 0
+
+        posts = BlogPost.query.filter(BlogPost.status == PostStatus.PUBLISHED).order_by(
+            BlogPost.published_at.desc(), BlogPost.id.desc()
+        ).all()
+        projects = Project.query.order_by(Project.display_order.asc(), Project.created_at.desc()).all()
+
+        entries = {}
+        entries.update(self._refresh_entries(
+            manifest, posts, 'blog_post',
+            ['title', 'slug', 'excerpt', 'content_hash', 'published_at'], _blog_fragments
+        ))
+        entries.update(self._refresh_entries(
+            manifest, projects, 'project',
+            ['title', 'description', 'technologies', 'github_url', 'live_url', 'created_at'], _project_fragments
+        ))
+
+        post_entries = [entries[f"blog_post:{post.id}"] for post in posts]
+        project_entries = [entries[f"project:{project.id}"] for project in projects]
+        blog_updated = max((entry['modified'] for entry in post_entries), default=_iso(datetime(2000, 1, 1)))
+        projects_updated = max((entry['modified'] for entry in project_entries), default=blog_updated)
+        site_updated = max(blog_updated, projects_updated)
+
+        files = {
+            'rss.xml': self._rss(
+                'Wheeler Knight Blog', f"{self.site_url}/blog", 'rss.xml',
+                [entry['fragments']['rss'] for entry in post_entries[:self.max_items]], blog_updated
+            ),
+            'atom.xml': self._atom([entry['fragments']['atom'] for entry in post_entries[:self.max_items]], blog_updated),
+            'projects.xml': self._rss(
+                'Wheeler Knight Projects', f"{self.site_url}/projects", 'projects.xml',
+                [entry['fragments']['rss'] for entry in project_entries[:self.max_items]], projects_updated
+            ),
+            'sitemap.xml': self._sitemap([entry['fragments']['sitemap'] for entry in post_entries], site_updated)
+        }
+        written = [name for name, content in files.items() if self._write_if_changed(name, content)]
+
+        manifest['entries'] = entries
+        self._write_if_changed(MANIFEST_NAME, json.dumps(manifest, sort_keys=True, separators=(',', ':')))
+
+        if written:
+            logger.info(f"Feeds regenerated: {', '.join(written)} ({self.rendered} entries rendered)")
+        return {'rendered_entries': self.rendered, 'written': written, 'output_dir': self.output_dir}
+
+    def _rss(self, title: str, link: str, name: str, items: List[str], updated: str) -> str:
+        last_build = _rfc822(datetime.fromisoformat(updated.rstrip('Z')))
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom"><channel>'
+            f"<title>{escape(title)}</title><link>{escape(link)}</link>"
+            f"<description>{escape(title)}</description><language>en-us</language>"
+            f"<lastBuildDate>{last_build}</lastBuildDate>"
+            f"<atom:link href={quoteattr(f'{self.site_url}/{name}')} rel=\"self\" type=\"application/rss+xml\"/>"
+            + ''.join(items) +
+            '</channel></rss>\n'
+        )
+
+    def _atom(self, entries: List[str], updated: str) -> str:
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<feed xmlns="http://www.w3.org/2005/Atom">'
+            f"<title>Wheeler Knight Blog</title><id>{escape(self.site_url)}/blog</id>"
+            f"<link href={quoteattr(f'{self.site_url}/blog')}/>"
+            f"<link rel=\"self\" href={quoteattr(f'{self.site_url}/atom.xml')}/>"
+            f"<updated>{updated}</updated><author><name>Wheeler Knight</name></author>"
+            + ''.join(entries) +
+            '</feed>\n'
+        )
+
+    def _sitemap(self, post_urls: List[str], updated: str) -> str:
+        pages = ''.join(
+            f"<url><loc>{escape(self.site_url + path)}</loc><lastmod>{updated}</lastmod>"
+            f"<changefreq>{changefreq}</changefreq><priority>{priority}</priority></url>"
+            for path, changefreq, priority in SITEMAP_PAGES
+        )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            + pages + ''.join(post_urls) +
+            '</urlset>\n'
+        )
+
+
+def generate_feeds(app) -> Dict[str, Any]:
+    """Regenerate the static feed files from the app config"""
+    config = app.config
+    writer = FeedWriter(
+        output_dir=config.get('FEEDS_OUTPUT_DIR', 'public'),
+        site_url=f"https://{config.get('PRODUCTION_DOMAIN', 'wheelerknight.com')}",
+        max_items=config.get('FEEDS_MAX_ITEMS', 20)
+    )
+    return writer.generate()
+
+
+# Initialize feed updater (regenerates shortly after blog posts or projects change)
+feed_updater = DebouncedJob('feed generation', generate_feeds, WATCHED_FIELDS)
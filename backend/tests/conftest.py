@@ -0,0 +1,65 @@
+# Test fixtures for the Wheeler Knight Portfolio API
+# app.py reads its configuration from the environment at import, so the
+# database, logs and every storage path are pointed at a temp directory first
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+TEST_ROOT = tempfile.mkdtemp(prefix='portfolio-tests-')
+
+os.environ['FLASK_ENV'] = 'testing'
+os.environ.setdefault('TEST_DATABASE_URL', f"sqlite:///{os.path.join(TEST_ROOT, 'test.db')}")
+os.environ['LOG_FILE'] = os.path.join(TEST_ROOT, 'logs', 'app.log')
+os.environ['UPLOAD_FOLDER'] = os.path.join(TEST_ROOT, 'uploads')
+os.environ['SEARCH_INDEX_PATH'] = os.path.join(TEST_ROOT, 'data', 'search_index.json')
+os.environ['FEEDS_OUTPUT_DIR'] = os.path.join(TEST_ROOT, 'public')
+os.environ['BAKE_OUTPUT_DIR'] = os.path.join(TEST_ROOT, 'public')
+
+# Background jobs never run on timers during tests
+for name in ('UPLOAD_REFERENCE_DELAY', 'RELATED_UPDATE_DELAY', 'FEEDS_UPDATE_DELAY', 'BAKE_UPDATE_DELAY'):
+    os.environ[name] = '-1'
+
+ADMIN_PASSWORD = 'Admin123!'
+
+
+@pytest.fixture(scope='session')
+def app():
+    """The application, configured for tests"""
+    from app import app as flask_app
+    from analytics_ingest import analytics_ingestor
+
+    yield flask_app
+    analytics_ingestor.shutdown()
+    shutil.rmtree(TEST_ROOT, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def database(app):
+    """Fresh tables and one super admin for every test"""
+    from models import db
+    from models.models import AdminUser
+    from models.admin_user import AdminRole
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        db.session.add(AdminUser('admin', 'admin@example.com', ADMIN_PASSWORD, role=AdminRole.SUPER_ADMIN))
+        db.session.commit()
+    yield db
+    with app.app_context():
+        db.session.remove()
+
+
+@pytest.fixture
+def auth_headers(client):
+    """Authorization header of the test admin"""
+    response = client.post('/api/auth/login', json={'username': 'admin', 'password': ADMIN_PASSWORD})
+    assert response.status_code == 200
+    return {'Authorization': f"Bearer {response.get_json()['data']['tokens']['access_token']}"}
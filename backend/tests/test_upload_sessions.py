@@ -0,0 +1,170 @@
+# Resumable upload protocol: POST /sessions -> PUT chunks -> POST /complete
+import hashlib
+import io
+import os
+
+import pytest
+
+from upload_sessions import resumable_uploads
+
+FILE_BYTES = bytes(range(256)) * 40  # 10240 bytes
+
+
+def start_session(client, headers, data=FILE_BYTES, checksum=None, filename='report.pdf'):
+    body = {'filename': filename, 'size': len(data), 'checksum': checksum or hashlib.sha256(data).hexdigest()}
+    response = client.post('/api/upload/sessions', json=body, headers=headers)
+    assert response.status_code == 201
+    return response.get_json()['data']['id']
+
+
+def put_chunk(client, headers, session_key, data, offset, total=len(FILE_BYTES), length=None):
+    """PUT one chunk; length larger than data simulates a body cut short"""
+    length = len(data) if length is None else length
+    return client.put(
+        f'/api/upload/sessions/{session_key}',
+        input_stream=io.BytesIO(data),
+        headers=dict(headers, **{'Content-Range': f'bytes {offset}-{offset + length - 1}/{total}'}),
+        environ_overrides={'CONTENT_LENGTH': str(length)}
+    )
+
+
+def session_offset(client, headers, session_key):
+    response = client.get(f'/api/upload/sessions/{session_key}', headers=headers)
+    assert response.status_code == 200
+    return response.get_json()['data']['offset']
+
+
+def error_of(response):
+    return response.get_json()['error']
+
+
+def test_chunks_assemble_into_stored_file(client, auth_headers):
+    key = start_session(client, auth_headers)
+
+    assert put_chunk(client, auth_headers, key, FILE_BYTES[:4096], 0).status_code == 200
+    assert session_offset(client, auth_headers, key) == 4096
+    assert put_chunk(client, auth_headers, key, FILE_BYTES[4096:], 4096).status_code == 200
+
+    response = client.post(f'/api/upload/sessions/{key}/complete', headers=auth_headers)
+    assert response.status_code == 201
+    stored = response.get_json()['data']
+    assert stored['content_hash'] == hashlib.sha256(FILE_BYTES).hexdigest()
+    with open(stored['file_path'], 'rb') as f:
+        assert f.read() == FILE_BYTES
+    assert not os.path.exists(resumable_uploads.part_path(key))
+
+
+def test_duplicate_chunk_is_refused_with_expected_offset(client, auth_headers):
+    key = start_session(client, auth_headers)
+    put_chunk(client, auth_headers, key, FILE_BYTES[:4096], 0)
+
+    response = put_chunk(client, auth_headers, key, FILE_BYTES[:4096], 0)
+
+    assert response.status_code == 409
+    assert error_of(response)['code'] == 'UPLOAD_OFFSET_MISMATCH'
+    assert error_of(response)['details'] == {'offset': 4096}
+    assert session_offset(client, auth_headers, key) == 4096
+
+
+def test_skipped_offset_is_refused(client, auth_headers):
+    key = start_session(client, auth_headers)
+
+    response = put_chunk(client, auth_headers, key, FILE_BYTES[4096:8192], 4096)
+
+    assert response.status_code == 409
+    assert error_of(response)['details'] == {'offset': 0}
+    assert os.path.getsize(resumable_uploads.part_path(key)) == 0
+
+
+def test_unrecorded_bytes_are_truncated(client, auth_headers):
+    key = start_session(client, auth_headers)
+    put_chunk(client, auth_headers, key, FILE_BYTES[:4096], 0)
+
+    # A chunk written to disk whose offset was never committed (worker died)
+    with open(resumable_uploads.part_path(key), 'ab') as part:
+        part.write(b'\xff' * 1000)
+
+    assert put_chunk(client, auth_headers, key, FILE_BYTES[4096:], 4096).status_code == 200
+    with open(resumable_uploads.part_path(key), 'rb') as part:
+        assert part.read() == FILE_BYTES
+    assert client.post(f'/api/upload/sessions/{key}/complete', headers=auth_headers).status_code == 201
+
+
+def test_checksum_mismatch_is_refused(client, auth_headers):
+    key = start_session(client, auth_headers, checksum=hashlib.sha256(b'something else').hexdigest())
+    put_chunk(client, auth_headers, key, FILE_BYTES, 0)
+
+    response = client.post(f'/api/upload/sessions/{key}/complete', headers=auth_headers)
+
+    assert response.status_code == 400
+    assert 'Checksum mismatch' in error_of(response)['message']
+
+
+def test_incomplete_upload_cannot_complete(client, auth_headers):
+    key = start_session(client, auth_headers)
+    put_chunk(client, auth_headers, key, FILE_BYTES[:4096], 0)
+
+    response = client.post(f'/api/upload/sessions/{key}/complete', headers=auth_headers)
+
+    assert response.status_code == 400
+    assert session_offset(client, auth_headers, key) == 4096
+
+
+def test_resume_after_short_body(client, auth_headers):
+    key = start_session(client, auth_headers)
+
+    # Content-Length promises 8192 bytes but the connection drops after 3000
+    response = put_chunk(client, auth_headers, key, FILE_BYTES[:3000], 0, length=8192)
+    assert response.status_code == 200
+    offset = session_offset(client, auth_headers, key)
+    assert offset == 3000
+
+    assert put_chunk(client, auth_headers, key, FILE_BYTES[offset:], offset).status_code == 200
+    response = client.post(f'/api/upload/sessions/{key}/complete', headers=auth_headers)
+    assert response.status_code == 201
+    assert response.get_json()['data']['content_hash'] == hashlib.sha256(FILE_BYTES).hexdigest()
+
+
+def test_session_larger_than_limit_is_refused(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(resumable_uploads, 'max_size', 1024)
+
+    response = client.post('/api/upload/sessions', json={'filename': 'report.pdf', 'size': 2048},
+                           headers=auth_headers)
+
+    assert response.status_code == 413
+    assert error_of(response)['code'] == 'FILE_TOO_LARGE'
+
+
+def test_chunk_larger_than_limit_is_refused(client, auth_headers, monkeypatch):
+    key = start_session(client, auth_headers)
+    monkeypatch.setattr(resumable_uploads, 'max_chunk_size', 1024)
+
+    response = put_chunk(client, auth_headers, key, FILE_BYTES[:2048], 0)
+
+    assert response.status_code == 413
+    assert error_of(response)['code'] == 'FILE_TOO_LARGE'
+    assert session_offset(client, auth_headers, key) == 0
+
+
+@pytest.mark.parametrize('method, path', [
+    ('get', '/api/upload/sessions/{key}'),
+    ('put', '/api/upload/sessions/{key}'),
+    ('post', '/api/upload/sessions/{key}/complete'),
+    ('delete', '/api/upload/sessions/{key}'),
+])
+def test_unknown_session_is_not_found(client, auth_headers, method, path):
+    headers = dict(auth_headers, **{'Content-Range': 'bytes 0-3/10240'})
+
+    response = getattr(client, method)(path.format(key='0' * 32), data=b'abcd', headers=headers)
+
+    assert response.status_code == 404
+
+
+def test_aborted_session_is_gone(client, auth_headers):
+    key = start_session(client, auth_headers)
+    put_chunk(client, auth_headers, key, FILE_BYTES[:4096], 0)
+
+    assert client.delete(f'/api/upload/sessions/{key}', headers=auth_headers).status_code == 200
+
+    assert client.get(f'/api/upload/sessions/{key}', headers=auth_headers).status_code == 404
+    assert not os.path.exists(resumable_uploads.part_path(key))
@@ -0,0 +1,235 @@
+# JWT Revocation for Wheeler Knight Portfolio
+# Revoked token ids and per-user cutoffs held in memory, synced from a shared store
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# (token_key, not_before, expires_at epoch seconds)
+Entry = Tuple[str, Optional[int], float]
+
+
+class DatabaseRevocationStore:
+    """Revocations in the revoked_tokens table (shared by every worker)"""
+
+    name = 'database'
+
+    # Expired rows are deleted at most this often per process
+    PURGE_INTERVAL = 600
+
+    def __init__(self, app):
+        self.app = app
+        self._last_purge = 0.0
+
+    def add(self, token_key: str, not_before: Optional[int], expires_at: float) -> None:
+        from models import db
+        from models.models import RevokedToken
+
+        db.session.add(RevokedToken(
+            token_key=token_key,
+            not_before=not_before,
+            expires_at=datetime.utcfromtimestamp(expires_at)
+        ))
+        db.session.commit()
+
+    def load(self, now: float) -> List[Entry]:
+        from models import db
+        from models.models import RevokedToken
+
+        with self.app.app_context():
+            cutoff = datetime.utcfromtimestamp(now)
+            if now - self._last_purge > self.PURGE_INTERVAL:
+                RevokedToken.query.filter(RevokedToken.expires_at <= cutoff).delete(synchronize_session=False)
+                db.session.commit()
+                self._last_purge = now
+            rows = db.session.query(
+                RevokedToken.token_key, RevokedToken.not_before, RevokedToken.expires_at
+            ).filter(RevokedToken.expires_at > cutoff).all()
+        return [
+            (token_key, not_before, (expires_at - datetime(1970, 1, 1)).total_seconds())
+            for token_key, not_before, expires_at in rows
+        ]
+
+
+class RedisRevocationStore:
+    """Revocations in a Redis hash (token_key -> "not_before:expires_at")"""
+
+    name = 'redis'
+
+    def __init__(self, url: str, key: str = 'jwt_revocations'):
+        import redis
+
+        self._redis = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self._key = key
+
+    def add(self, token_key: str, not_before: Optional[int], expires_at: float) -> None:
+        self._redis.hset(self._key, token_key, f"{not_before or ''}:{expires_at}")
+
+    def load(self, now: float) -> List[Entry]:
+        entries = []
+        expired = []
+        for token_key, value in self._redis.hgetall(self._key).items():
+            not_before, _, expires_at = value.decode('utf-8').partition(':')
+            if float(expires_at) <= now:
+                expired.append(token_key)
+                continue
+            entries.append((token_key.decode('utf-8'), int(not_before) if not_before else None, float(expires_at)))
+        if expired:
+            self._redis.hdel(self._key, *expired)
+        return entries
+
+
+class TokenRevocation:
+    """Answer "is this JWT revoked?" from memory in microseconds
+
+    Revoked jtis live in a set-like dict and whole-user revocations
+    (deactivation, deletion) as "issued before" cutoffs. A background
+    thread reloads both from the shared store every sync interval, so a
+    revocation made by another worker applies within that interval; one
+    made by this worker applies at once. Entries are dropped when the
+    tokens they cover expire.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.store = None
+        self.sync_interval = 2.0
+        self._tokens: Dict[str, float] = {}
+        self._users: Dict[str, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+        self._pid = None
+        self._thread: Optional[threading.Thread] = None
+        self._counters = {'checks': 0, 'revoked_hits': 0, 'syncs': 0, 'sync_errors': 0}
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Pick the shared store and register the JWT blocklist callback"""
+        from auth import auth_manager
+
+        self.app = app
+        self.sync_interval = app.config.get('TOKEN_REVOCATION_SYNC_SECONDS', 2.0)
+        storage = app.config.get('TOKEN_REVOCATION_STORAGE', 'auto')
+        redis_url = app.config.get('REDIS_URL', '')
+
+        self.store = DatabaseRevocationStore(app)
+        if storage in ('auto', 'redis') and redis_url:
+            try:
+                self.store = RedisRevocationStore(redis_url)
+            except ImportError:
+                level = logging.ERROR if storage == 'redis' else logging.INFO
+                logger.log(level, "redis package not installed; token revocations are shared through the database")
+
+        @auth_manager.jwt_manager.token_in_blocklist_loader
+        def check_if_token_revoked(jwt_header, jwt_payload):
+            return self.is_revoked(jwt_payload)
+
+        @auth_manager.jwt_manager.revoked_token_loader
+        def revoked_token_callback(jwt_header, jwt_payload):
+            return {
+                'success': False,
+                'error': 'Token has been revoked',
+                'message': 'Please log in again'
+            }, 401
+
+    def is_revoked(self, payload: Dict[str, Any]) -> bool:
+        """Blocklist check: a dict lookup, never a store round trip"""
+        if self._pid != os.getpid():
+            self._start()
+
+        self._counters['checks'] += 1
+        revoked = payload.get('jti') in self._tokens
+        if not revoked:
+            cutoff = self._users.get(str(payload.get('sub')))
+            revoked = cutoff is not None and payload.get('iat', 0) < cutoff[0]
+        if revoked:
+            self._counters['revoked_hits'] += 1
+        return revoked
+
+    def revoke_token(self, payload: Dict[str, Any]) -> None:
+        """Revoke one decoded token until it expires"""
+        jti = payload.get('jti')
+        if not jti:
+            return
+        expires_at = float(payload.get('exp') or time.time() + 86400)
+        self.store.add(f'jti:{jti}', None, expires_at)
+        with self._lock:
+            self._tokens[jti] = expires_at
+
+    def revoke_user(self, user_id: int) -> None:
+        """Revoke every token issued to a user up to now (refresh tokens included)"""
+        lifetime = self.app.config.get('JWT_REFRESH_TOKEN_EXPIRES', timedelta(days=30))
+        if isinstance(lifetime, timedelta):
+            lifetime = lifetime.total_seconds()
+        now = time.time()
+        not_before = int(now) + 1
+        expires_at = now + float(lifetime)
+
+        self.store.add(f'user:{user_id}', not_before, expires_at)
+        with self._lock:
+            self._users[str(user_id)] = (not_before, expires_at)
+
+    def _start(self) -> None:
+        # One sync thread per process, started after gunicorn forks
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+        self.sync()
+        self._thread = threading.Thread(target=self._sync_loop, name='token-revocation-sync', daemon=True)
+        self._thread.start()
+
+    def _sync_loop(self) -> None:
+        while True:
+            time.sleep(self.sync_interval)
+            self.sync()
+
+    def sync(self) -> None:
+        """Replace the in-memory view with the store's unexpired entries"""
+        now = time.time()
+        try:
+            entries = self.store.load(now)
+        except Exception as e:
+            self._counters['sync_errors'] += 1
+            logger.error(f"Token revocation sync failed, keeping previous list: {e}")
+            return
+
+        tokens: Dict[str, float] = {}
+        users: Dict[str, Tuple[int, float]] = {}
+        for token_key, not_before, expires_at in entries:
+            kind, _, value = token_key.partition(':')
+            if kind == 'jti':
+                tokens[value] = expires_at
+            elif kind == 'user':
+                previous = users.get(value)
+                if previous is None or not_before > previous[0]:
+                    users[value] = (not_before, expires_at)
+
+        with self._lock:
+            # Keep local revocations the store has not returned yet
+            tokens.update({jti: exp for jti, exp in self._tokens.items() if exp > now and jti not in tokens})
+            for user_id, cutoff in self._users.items():
+                if cutoff[1] > now and (user_id not in users or cutoff[0] > users[user_id][0]):
+                    users[user_id] = cutoff
+            self._tokens = tokens
+            self._users = users
+        self._counters['syncs'] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get revocation counters for monitoring"""
+        counters = dict(self._counters)
+        counters.update({
+            'store': self.store.name if self.store else None,
+            'revoked_tokens': len(self._tokens),
+            'revoked_users': len(self._users),
+            'sync_interval': self.sync_interval
+        })
+        return counters
+
+
+# Initialize token revocation
+token_revocation = TokenRevocation()
@@ -0,0 +1,292 @@
+# Upload Index for Wheeler Knight Portfolio
+# Metadata rows for stored uploads, the backfill scan for files already on
+# disk, and tracking of which content links to each upload
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+import threading
+
+from sqlalchemy.exc import IntegrityError
+
+from content_events import DebouncedJob
+from image_placeholders import make_placeholder
+
+logger = logging.getLogger(__name__)
+
+# Upload subdirectories that hold originals (variants and temp files are skipped)
+INDEXED_FOLDERS = ('images', 'documents')
+
+# /uploads/<folder>/... anywhere in a field, absolute or relative URL
+UPLOAD_URL = re.compile(r'/uploads/((?:images|documents)/[^\s"\'()<>?#\]]+)')
+
+# Content fields that may link to uploads (image columns and Markdown/HTML bodies)
+REFERENCE_FIELDS = {
+    'BlogPost': ('featured_image', 'content'),
+    'Project': ('featured_image', 'images', 'description', 'long_description'),
+    'Interest': ('image_url', 'description'),
+}
+
+# Publishing or unpublishing a post changes which of its files are public
+WATCHED_FIELDS = dict(REFERENCE_FIELDS, BlogPost=REFERENCE_FIELDS['BlogPost'] + ('status',))
+
+
+def inspect_file(file_path: str, category: str) -> Dict[str, Any]:
+    """Mime type and, for raster images, pixel dimensions and a placeholder thumbnail"""
+    info: Dict[str, Any] = {
+        'mime_type': mimetypes.guess_type(file_path)[0],
+        'width': None,
+        'height': None,
+        'placeholder': None
+    }
+    if category == 'image' and not file_path.lower().endswith('.svg'):
+        try:
+            from PIL import Image
+            with Image.open(file_path) as image:
+                info['width'], info['height'] = image.size
+                info['mime_type'] = Image.MIME.get(image.format, info['mime_type'])
+        except Exception as e:
+            logger.warning(f"Could not read image dimensions of {file_path}: {e}")
+            return info
+        info['placeholder'] = make_placeholder(file_path)
+    return info
+
+
+def record_upload(relative_path: str, content_hash: str, file_size: int, original_filename: Optional[str],
+                  category: str, uploaded_by: Optional[int], file_path: str, original_size: Optional[int] = None):
+    """Insert the metadata row for a stored file, or return the existing one"""
+    from models import db
+    from models.models import Upload
+
+    upload = Upload.query.filter_by(relative_path=relative_path).first()
+    if upload is not None:
+        return upload
+
+    upload = Upload(
+        relative_path=relative_path,
+        content_hash=content_hash,
+        original_filename=original_filename,
+        category=category,
+        file_size=file_size,
+        original_size=original_size,
+        uploaded_by=uploaded_by,
+        **inspect_file(file_path, category)
+    )
+    db.session.add(upload)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent upload of the same bytes inserted the row first
+        db.session.rollback()
+        return Upload.query.filter_by(relative_path=relative_path).one()
+    return upload
+
+
+def referenced_paths(instance) -> List[str]:
+    """Upload paths (relative to UPLOAD_FOLDER) linked from a content row"""
+    paths = set()
+    for field in REFERENCE_FIELDS.get(type(instance).__name__, ()):
+        value = getattr(instance, field, None)
+        if value:
+            paths.update(UPLOAD_URL.findall(str(value)))
+    return sorted(paths)
+
+
+def sync_references(changes: Dict[Tuple[str, int], Optional[List[str]]]) -> int:
+    """Replace the stored references of each changed entity; returns rows written"""
+    from models import db
+    from models.models import Upload, UploadReference
+
+    written = 0
+    for (entity_type, entity_id), paths in changes.items():
+        UploadReference.query.filter_by(entity_type=entity_type, entity_id=entity_id).delete(synchronize_session=False)
+        if paths:
+            upload_ids = db.session.query(Upload.id).filter(Upload.relative_path.in_(paths)).all()
+            for (upload_id,) in upload_ids:
+                db.session.add(UploadReference(upload_id=upload_id, entity_type=entity_type, entity_id=entity_id))
+                written += 1
+    db.session.commit()
+    return written
+
+
+def rebuild_references() -> int:
+    """Recompute every reference from current content"""
+    from models import db
+    from models import models
+    from models.models import UploadReference
+
+    changes: Dict[Tuple[str, int], Optional[List[str]]] = {}
+    for model_name in REFERENCE_FIELDS:
+        for instance in getattr(models, model_name).query.all():
+            changes[(model_name, instance.id)] = referenced_paths(instance)
+
+    UploadReference.query.delete(synchronize_session=False)
+    db.session.commit()
+    return sync_references(changes)
+
+
+def move_upload(upload, stored, original_size: Optional[int] = None):
+    """Point an upload's row and every content link to it at a newly stored copy
+
+    Content fields found through the upload's references have the old URL
+    replaced (absolute or relative). When the new path already has a row,
+    identical bytes were stored before: the references move to that row and
+    this one is deleted. Returns the row now describing the file; the caller
+    commits.
+    """
+    from models import db
+    from models import models
+    from models.models import Upload, UploadReference
+
+    old_url = re.compile(re.escape(f"/uploads/{upload.relative_path}") + r'(?![^\s"\'()<>?#\]])')
+    new_url = f"/uploads/{stored.relative_path}"
+    for reference in upload.references:
+        instance = getattr(models, reference.entity_type).query.get(reference.entity_id)
+        for field in REFERENCE_FIELDS.get(reference.entity_type, ()):
+            value = getattr(instance, field, None) if instance is not None else None
+            if isinstance(value, str) and old_url.search(value):
+                setattr(instance, field, old_url.sub(new_url, value))
+
+    target = Upload.query.filter_by(relative_path=stored.relative_path).first()
+    if target is not None and target.id != upload.id:
+        linked = {(reference.entity_type, reference.entity_id) for reference in target.references}
+        for reference in upload.references:
+            if (reference.entity_type, reference.entity_id) not in linked:
+                db.session.add(UploadReference(
+                    upload_id=target.id, entity_type=reference.entity_type, entity_id=reference.entity_id
+                ))
+        db.session.delete(upload)
+        return target
+
+    upload.relative_path = stored.relative_path
+    upload.content_hash = stored.content_hash
+    upload.file_size = stored.file_size
+    upload.original_size = original_size
+    for key, value in inspect_file(stored.file_path, upload.category).items():
+        setattr(upload, key, value)
+    return upload
+
+
+def _file_hash(file_path: str) -> str:
+    sha256 = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def backfill_uploads(app) -> Dict[str, int]:
+    """Index files already on disk, drop rows for missing files, rebuild references
+
+    Needed once after the uploads table is created and safe to re-run; the
+    listing endpoint only sees files that have a row.
+    """
+    from models import db
+    from models.models import Upload
+    from routes.upload import get_file_category
+
+    upload_folder = app.config.get('UPLOAD_FOLDER', 'uploads')
+    known = {relative_path: upload_id for upload_id, relative_path in db.session.query(Upload.id, Upload.relative_path)}
+    seen = set()
+    added = 0
+
+    for folder in INDEXED_FOLDERS:
+        for root, dirs, filenames in os.walk(os.path.join(upload_folder, folder)):
+            dirs[:] = [name for name in dirs if not name.startswith('.')]
+            for filename in filenames:
+                if filename.startswith('.') or '.' not in filename:
+                    continue
+                file_path = os.path.join(root, filename)
+                relative_path = os.path.relpath(file_path, upload_folder).replace(os.sep, '/')
+                seen.add(relative_path)
+                if relative_path in known:
+                    continue
+
+                category = get_file_category(filename)
+                created_at = datetime.utcfromtimestamp(os.path.getmtime(file_path))
+                db.session.add(Upload(
+                    relative_path=relative_path,
+                    content_hash=_file_hash(file_path),
+                    original_filename=filename,
+                    category=category,
+                    file_size=os.path.getsize(file_path),
+                    created_at=created_at,
+                    updated_at=created_at,
+                    **inspect_file(file_path, category)
+                ))
+                added += 1
+                if added % 500 == 0:
+                    db.session.commit()
+
+    # Rows indexed before placeholders existed
+    filled = 0
+    for upload in Upload.query.filter(Upload.category == 'image', Upload.placeholder.is_(None)).all():
+        file_path = os.path.join(upload_folder, *upload.relative_path.split('/'))
+        if upload.relative_path in seen and not upload.relative_path.lower().endswith('.svg'):
+            upload.placeholder = make_placeholder(file_path)
+            filled += upload.placeholder is not None
+    db.session.commit()
+
+    missing = [upload_id for relative_path, upload_id in known.items() if relative_path not in seen]
+    for upload in Upload.query.filter(Upload.id.in_(missing)).all() if missing else []:
+        db.session.delete(upload)
+    db.session.commit()
+
+    references = rebuild_references()
+    from upload_publishing import upload_publisher
+    published = upload_publisher.publish()
+    logger.info(f"Upload backfill: {added} added, {len(missing)} removed, {filled} placeholders, "
+                f"{references} references, {published['public']} public")
+    return {'added': added, 'removed': len(missing), 'placeholders': filled, 'references': references,
+            'public': published['public']}
+
+
+class ReferenceUpdater(DebouncedJob):
+    """Keep upload references, and the public upload tree, in step with content edits
+
+    Runs shortly after each commit; trigger() with no changes only
+    re-publishes (e.g. once new variants of a public image are built).
+    """
+
+    def __init__(self):
+        super().__init__('upload reference', self._sync_pending, WATCHED_FIELDS)
+        self._changes: Dict[Tuple[str, int], Optional[List[str]]] = {}
+        self._changes_lock = threading.Lock()
+
+    def init_app(self, app, delay: float = 1.0):
+        """Subscribe to content models, snapshotting the upload links of each changed row"""
+        from content_events import content_events
+        from models import models
+
+        self.app = app
+        self.delay = delay
+        if delay < 0:
+            return
+
+        content_events.subscribe(
+            {getattr(models, name): fields for name, fields in self.watched.items()},
+            referenced_paths,
+            self.trigger
+        )
+
+    def trigger(self, changes=None) -> None:
+        with self._changes_lock:
+            for change in changes or []:
+                self._changes[(change.model, change.id)] = None if change.deleted else change.snapshot
+        super().trigger()
+
+    def _sync_pending(self, app) -> int:
+        from upload_publishing import upload_publisher
+
+        with self._changes_lock:
+            changes, self._changes = self._changes, {}
+        written = sync_references(changes) if changes else 0
+        upload_publisher.publish()
+        return written
+
+
+# Initialize upload reference tracking
+reference_updater = ReferenceUpdater()
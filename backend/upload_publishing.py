@@ -0,0 +1,136 @@
+# Upload Publishing for Wheeler Knight Portfolio
+# nginx serves /uploads/ from UPLOAD_FOLDER/public, a tree of hard links to
+# the files (and their variants) that public content links to. Everything
+# else stays reachable only through the authorized /api/downloads/<id> route
+from typing import Dict, Set
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+PUBLIC_DIR = 'public'
+
+# Entities whose linked files are public whatever their state
+PUBLIC_ENTITY_TYPES = ('Project', 'Interest')
+
+
+def is_public(upload) -> bool:
+    """Files linked from a project, an interest or a published post are public"""
+    from models.models import BlogPost
+    from models.blog_post import PostStatus
+
+    for reference in upload.references:
+        if reference.entity_type in PUBLIC_ENTITY_TYPES:
+            return True
+        if reference.entity_type == 'BlogPost':
+            post = BlogPost.query.get(reference.entity_id)
+            if post is not None and post.status == PostStatus.PUBLISHED:
+                return True
+    return False
+
+
+def public_paths() -> Set[str]:
+    """Relative paths of every upload that is_public() would accept, in one query"""
+    from sqlalchemy import and_, or_
+    from models import db
+    from models.models import Upload, UploadReference, BlogPost
+    from models.blog_post import PostStatus
+
+    rows = db.session.query(Upload.relative_path).join(
+        UploadReference, UploadReference.upload_id == Upload.id
+    ).outerjoin(
+        BlogPost, and_(UploadReference.entity_type == 'BlogPost', BlogPost.id == UploadReference.entity_id)
+    ).filter(or_(
+        UploadReference.entity_type.in_(PUBLIC_ENTITY_TYPES),
+        BlogPost.status == PostStatus.PUBLISHED
+    )).distinct()
+    return {relative_path for (relative_path,) in rows}
+
+
+class UploadPublisher:
+    """Keep UPLOAD_FOLDER/public in step with which uploads are public
+
+    publish() reconciles the whole tree: links are added for files that
+    became public (with their resized variants) and removed for files that
+    stopped being public or were deleted. Hard links cost no space, and the
+    public tree lives on the same volume, so nothing is copied. Safe to run
+    from several workers at once.
+    """
+
+    def __init__(self, app=None):
+        self.upload_folder = 'uploads'
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Configure the storage root from the Flask app config"""
+        self.upload_folder = app.config.get('UPLOAD_FOLDER', 'uploads')
+
+    @property
+    def public_root(self) -> str:
+        return os.path.join(self.upload_folder, PUBLIC_DIR)
+
+    def _source(self, relative_path: str) -> str:
+        return os.path.join(self.upload_folder, *relative_path.split('/'))
+
+    def _wanted(self) -> Set[str]:
+        from image_variants import image_variants, MANIFEST_NAME
+
+        wanted = set()
+        for relative_path in public_paths():
+            if not os.path.isfile(self._source(relative_path)):
+                continue
+            wanted.add(relative_path)
+
+            content_hash = image_variants.content_hash(f"/uploads/{relative_path}")
+            variant_dir = image_variants.output_dir(content_hash) if content_hash else None
+            if variant_dir and os.path.isdir(variant_dir):
+                for name in os.listdir(variant_dir):
+                    if name != MANIFEST_NAME and not name.startswith('.'):
+                        wanted.add(f"variants/{content_hash[:2]}/{content_hash}/{name}")
+        return wanted
+
+    def _existing(self) -> Set[str]:
+        existing = set()
+        for root, _, filenames in os.walk(self.public_root):
+            for filename in filenames:
+                existing.add(os.path.relpath(os.path.join(root, filename), self.public_root).replace(os.sep, '/'))
+        return existing
+
+    def publish(self) -> Dict[str, int]:
+        """Link every public file into the public tree and unlink the rest"""
+        wanted = self._wanted()
+        existing = self._existing()
+        linked = removed = 0
+
+        for relative_path in sorted(wanted):
+            source = self._source(relative_path)
+            target = os.path.join(self.public_root, *relative_path.split('/'))
+            try:
+                if relative_path in existing:
+                    # A rebuilt variant is a new file; its old link would keep old bytes
+                    if os.stat(target).st_ino == os.stat(source).st_ino:
+                        continue
+                    os.remove(target)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.link(source, target)
+                linked += 1
+            except FileExistsError:
+                pass
+            except FileNotFoundError:
+                continue
+
+        for relative_path in existing - wanted:
+            try:
+                os.remove(os.path.join(self.public_root, *relative_path.split('/')))
+                removed += 1
+            except FileNotFoundError:
+                pass
+
+        if linked or removed:
+            logger.info(f"Upload publishing: {linked} linked, {removed} unlinked")
+        return {'linked': linked, 'unlinked': removed, 'public': len(wanted)}
+
+
+# Initialize public upload tree maintenance
+upload_publisher = UploadPublisher()
@@ -0,0 +1,217 @@
+# Resumable Uploads for Wheeler Knight Portfolio
+# init -> PUT chunk at offset -> complete. Progress lives in upload_sessions
+# rows and a .part file on the shared volume, so any worker can take the next
+# chunk and an interrupted upload resumes where it stopped
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+import hashlib
+import logging
+import os
+import re
+import uuid
+
+from werkzeug.exceptions import ClientDisconnected
+
+from error_handling import APIError, ValidationError, NotFoundError
+from upload_storage import FileTooLarge, StoredFile, content_store
+
+logger = logging.getLogger(__name__)
+
+CONTENT_RANGE = re.compile(r'^bytes (\d+)-(\d+)/(\d+|\*)$')
+SHA256_HEX = re.compile(r'^[0-9a-f]{64}$')
+
+
+class UploadOffsetMismatch(APIError):
+    """Chunk does not start where the stored upload ends"""
+
+    def __init__(self, expected: int):
+        super().__init__(
+            message=f"Chunk must start at offset {expected}",
+            status_code=409,
+            error_code="UPLOAD_OFFSET_MISMATCH",
+            details={'offset': expected}
+        )
+
+
+def parse_content_range(header: Optional[str], length: int) -> int:
+    """Start offset from a "bytes start-end/total" Content-Range that matches the body length"""
+    match = CONTENT_RANGE.match((header or '').strip())
+    if not match:
+        raise ValidationError("Content-Range header required (bytes start-end/total)")
+    start, end = int(match.group(1)), int(match.group(2))
+    if end < start or end - start + 1 != length:
+        raise ValidationError("Content-Range does not match the chunk length")
+    return start
+
+
+class ResumableUploads:
+    """Create, extend and finish resumable upload sessions
+
+    Each chunk is streamed straight into the session's .part file at the
+    recorded offset (never held in memory) and the new offset is committed
+    after an fsync. A chunk that arrives for the wrong offset is refused, so
+    retries after a dropped connection cannot duplicate or skip bytes.
+    """
+
+    def __init__(self, app=None):
+        self.max_size = 200 * 1024 * 1024
+        self.max_chunk_size = 8 * 1024 * 1024
+        self.session_ttl = timedelta(hours=24)
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Configure size limits and session lifetime from the Flask app config"""
+        self.max_size = app.config.get('UPLOAD_RESUMABLE_MAX_SIZE', 200 * 1024 * 1024)
+        self.max_chunk_size = app.config.get('UPLOAD_RESUMABLE_CHUNK_SIZE', 8 * 1024 * 1024)
+        self.session_ttl = timedelta(hours=app.config.get('UPLOAD_SESSION_TTL_HOURS', 24))
+
+    @property
+    def sessions_dir(self) -> str:
+        path = os.path.join(content_store.incoming_dir, 'sessions')
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def part_path(self, session_key: str) -> str:
+        return os.path.join(self.sessions_dir, f'{session_key}.part')
+
+    def create(self, filename: str, folder: str, size: int, checksum: Optional[str], user_id: Optional[int]):
+        """Start a session for a file of known size"""
+        from models import db
+        from models.models import UploadSession
+
+        if size <= 0:
+            raise ValidationError("size must be a positive number of bytes")
+        if size > self.max_size:
+            raise FileTooLarge(self.max_size)
+        if checksum is not None and not SHA256_HEX.match(checksum):
+            raise ValidationError("checksum must be a lowercase hex SHA-256")
+
+        session = UploadSession(
+            session_key=uuid.uuid4().hex,
+            filename=filename,
+            folder=folder,
+            total_size=size,
+            received=0,
+            checksum=checksum,
+            created_by=user_id,
+            expires_at=datetime.utcnow() + self.session_ttl
+        )
+        db.session.add(session)
+        db.session.commit()
+        open(self.part_path(session.session_key), 'wb').close()
+        return session
+
+    def get(self, session_key: str, for_update: bool = False):
+        """Look up an unexpired session"""
+        from models.models import UploadSession
+
+        query = UploadSession.query.filter_by(session_key=session_key)
+        if for_update:
+            query = query.with_for_update()
+        session = query.first()
+        if session is None or session.expires_at <= datetime.utcnow():
+            raise NotFoundError("Upload session not found or expired")
+        return session
+
+    def append(self, session_key: str, offset: int, stream, length: int):
+        """Write one chunk at offset and record the new offset"""
+        from models import db
+
+        if length <= 0:
+            raise ValidationError("Empty chunk")
+        if length > self.max_chunk_size:
+            raise FileTooLarge(self.max_chunk_size)
+
+        # Row lock serialises chunks for one session across workers
+        session = self.get(session_key, for_update=True)
+        if offset != session.received:
+            db.session.rollback()
+            raise UploadOffsetMismatch(session.received)
+        if offset + length > session.total_size:
+            db.session.rollback()
+            raise ValidationError("Chunk extends past the declared file size")
+
+        written = 0
+        with open(self.part_path(session_key), 'r+b') as part:
+            # Drop bytes of a chunk that was written but never recorded
+            part.truncate(offset)
+            part.seek(offset)
+            while written < length:
+                try:
+                    data = stream.read(min(content_store.chunk_size, length - written))
+                except ClientDisconnected:
+                    # Body ended before Content-Length; keep what arrived
+                    break
+                if not data:
+                    break
+                part.write(data)
+                written += len(data)
+            part.flush()
+            os.fsync(part.fileno())
+
+        # A body cut short still counts; the client resumes from here
+        session.received = offset + written
+        session.expires_at = datetime.utcnow() + self.session_ttl
+        db.session.commit()
+        return session
+
+    def complete(self, session_key: str, store: Optional[Callable[..., StoredFile]] = None) -> StoredFile:
+        """Verify the assembled file and move it to content-addressed storage
+
+        store(temp_path, content_hash, size, folder, ext) does the move and
+        defaults to content_store.commit_file.
+        """
+        from models import db
+
+        session = self.get(session_key, for_update=True)
+        if session.received != session.total_size:
+            db.session.rollback()
+            raise ValidationError(f"Upload incomplete: {session.received} of {session.total_size} bytes received")
+
+        part_path = self.part_path(session_key)
+        sha256 = hashlib.sha256()
+        with open(part_path, 'rb') as part:
+            for data in iter(lambda: part.read(1024 * 1024), b''):
+                sha256.update(data)
+        content_hash = sha256.hexdigest()
+        if session.checksum and session.checksum != content_hash:
+            db.session.rollback()
+            raise ValidationError("Checksum mismatch; upload the file again")
+
+        _, ext = os.path.splitext(session.filename)
+        stored = (store or content_store.commit_file)(part_path, content_hash, session.total_size, session.folder, ext)
+        db.session.delete(session)
+        db.session.commit()
+        return stored
+
+    def abort(self, session_key: str) -> None:
+        """Cancel a session and delete its partial file"""
+        from models import db
+
+        session = self.get(session_key, for_update=True)
+        db.session.delete(session)
+        db.session.commit()
+        self._remove_part(session_key)
+
+    def _remove_part(self, session_key: str) -> None:
+        try:
+            os.remove(self.part_path(session_key))
+        except FileNotFoundError:
+            pass
+
+    def purge_expired(self) -> int:
+        """Delete expired sessions and their partial files"""
+        from models import db
+        from models.models import UploadSession
+
+        expired = UploadSession.query.filter(UploadSession.expires_at <= datetime.utcnow()).all()
+        for session in expired:
+            self._remove_part(session.session_key)
+            db.session.delete(session)
+        db.session.commit()
+        return len(expired)
+
+
+# Initialize resumable uploads
+resumable_uploads = ResumableUploads()
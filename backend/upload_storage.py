@@ -0,0 +1,180 @@
+# Upload Storage for Wheeler Knight Portfolio
+# Uploads stream to disk in chunks while being hashed, then are stored under
+# their SHA-256 so identical files share one copy and one cacheable URL
+from typing import Callable, List, NamedTuple, Optional
+import hashlib
+import logging
+import os
+import tempfile
+
+from error_handling import APIError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class FileTooLarge(APIError):
+    """Upload exceeded MAX_FILE_SIZE"""
+
+    def __init__(self, max_size: int):
+        super().__init__(
+            message=f"File too large. Maximum size: {max_size // (1024 * 1024)}MB",
+            status_code=413,
+            error_code="FILE_TOO_LARGE"
+        )
+
+
+class StoredFile(NamedTuple):
+    """Where an upload ended up"""
+    relative_path: str
+    file_path: str
+    file_url: str
+    content_hash: str
+    file_size: int
+    deduplicated: bool
+    original_size: Optional[int] = None  # bytes as uploaded, when the stored file was optimized
+
+
+class HashingWriter:
+    """Temp file sink that hashes and size-checks bytes as they are written
+
+    Usable directly or as a Werkzeug stream_factory result, so multipart
+    file parts are hashed while the parser writes them.
+    """
+
+    def __init__(self, directory: str, max_size: int):
+        self.max_size = max_size
+        self.size = 0
+        self._sha256 = hashlib.sha256()
+        self._file = tempfile.NamedTemporaryFile(dir=directory, prefix='upload-', suffix='.part', delete=False)
+        self.path = self._file.name
+
+    def write(self, data: bytes) -> int:
+        self.size += len(data)
+        if self.size > self.max_size:
+            raise FileTooLarge(self.max_size)
+        self._sha256.update(data)
+        self._file.write(data)
+        return len(data)
+
+    def hexdigest(self) -> str:
+        return self._sha256.hexdigest()
+
+    # File-like methods Werkzeug's FileStorage relies on
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        return self._file.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    def read(self, size: int = -1) -> bytes:
+        return self._file.read(size)
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def discard(self) -> None:
+        """Close and delete the temp file"""
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class ContentStore:
+    """Content-addressed upload storage under UPLOAD_FOLDER
+
+    Files live at <category>/<hash[:2]>/<hash><ext>; the name changes
+    whenever the bytes do, so the URLs can be cached as immutable.
+    """
+
+    def __init__(self, app=None):
+        self.upload_folder = 'uploads'
+        self.max_size = 10 * 1024 * 1024
+        self.chunk_size = DEFAULT_CHUNK_SIZE
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Configure the storage root and limits from the Flask app config"""
+        self.upload_folder = app.config.get('UPLOAD_FOLDER', 'uploads')
+        self.max_size = app.config.get('MAX_FILE_SIZE', 10 * 1024 * 1024)
+        self.chunk_size = app.config.get('UPLOAD_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+
+    @property
+    def incoming_dir(self) -> str:
+        # Hidden directory on the same filesystem so the final move is a rename
+        path = os.path.join(self.upload_folder, '.incoming')
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def writer(self, max_size: Optional[int] = None) -> HashingWriter:
+        return HashingWriter(self.incoming_dir, max_size or self.max_size)
+
+    def stream_factory(self, writers: List[HashingWriter]) -> Callable:
+        """Werkzeug stream_factory that streams every file part into a HashingWriter"""
+        def factory(total_content_length, content_type, filename, content_length=None):
+            writer = self.writer()
+            writers.append(writer)
+            return writer
+        return factory
+
+    def receive(self, stream, max_size: Optional[int] = None) -> HashingWriter:
+        """Copy a raw request body to a temp file chunk by chunk"""
+        writer = self.writer(max_size)
+        try:
+            while True:
+                chunk = stream.read(self.chunk_size)
+                if not chunk:
+                    break
+                writer.write(chunk)
+            writer.close()
+        except BaseException:
+            writer.discard()
+            raise
+        return writer
+
+    @staticmethod
+    def relative_path(category: str, content_hash: str, ext: str) -> str:
+        return f"{category}/{content_hash[:2]}/{content_hash}{ext.lower()}"
+
+    def commit(self, writer: HashingWriter, category: str, ext: str) -> StoredFile:
+        """Move a finished upload to its content address, reusing an existing copy"""
+        writer.close()
+        return self.commit_file(writer.path, writer.hexdigest(), writer.size, category, ext)
+
+    def commit_file(self, temp_path: str, content_hash: str, size: int, category: str, ext: str) -> StoredFile:
+        """Move a hashed temp file under UPLOAD_FOLDER to its content address"""
+        relative_path = self.relative_path(category, content_hash, ext)
+        file_path = os.path.join(self.upload_folder, *relative_path.split('/'))
+
+        deduplicated = os.path.exists(file_path)
+        if deduplicated:
+            os.remove(temp_path)
+        else:
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, file_path)
+
+        return StoredFile(
+            relative_path=relative_path,
+            file_path=file_path,
+            file_url=f"/uploads/{relative_path}",
+            content_hash=content_hash,
+            file_size=size,
+            deduplicated=deduplicated
+        )
+
+
+# Initialize content-addressed upload storage
+content_store = ContentStore()
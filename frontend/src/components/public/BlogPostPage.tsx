@@ -1,5 +1,5 @@
 // Individual Blog Post Page for Wheeler Knight Portfolio
-import React from "react";
+import React, { useEffect, useState } from "react";
 import {
   Container,
   Title,
@@ -41,6 +41,32 @@ import {
   useBlogPosts,
   useLikeBlogPost,
 } from "../../hooks/useApi";
+import { BlogService } from "../../services/api";
+
+const API_URL = process.env.REACT_APP_API_URL || "http://localhost:5000/api";
+const HIGHLIGHT_CSS_ID = "blog-highlight-css";
+
+interface TocEntry {
+  id: string;
+  title: string;
+  level: number;
+  children: TocEntry[];
+}
+
+const TableOfContents: React.FC<{ entries: TocEntry[] }> = ({ entries }) => (
+  <Stack gap={4} pl="sm">
+    {entries.map((entry) => (
+      <Box key={entry.id}>
+        <Anchor href={`#${entry.id}`} size="sm">
+          {entry.title}
+        </Anchor>
+        {entry.children.length > 0 && (
+          <TableOfContents entries={entry.children} />
+        )}
+      </Box>
+    ))}
+  </Stack>
+);
 
 const BlogPostPage: React.FC = () => {
   const { slug } = useParams<{ slug: string }>();
@@ -52,6 +78,28 @@ const BlogPostPage: React.FC = () => {
     per_page: 3,
   });
   const likePost = useLikeBlogPost();
+  const [viewsCount, setViewsCount] = useState<number | null>(null);
+
+  // The post itself may come from a static snapshot, so the view is counted
+  // with a separate request (once per post) that also returns the live count
+  const postId = post?.id;
+  useEffect(() => {
+    if (!postId) return;
+    setViewsCount(null);
+    BlogService.recordBlogPostView(postId)
+      .then((response) => setViewsCount(response.data.views_count))
+      .catch(() => undefined);
+  }, [postId]);
+
+  // Code blocks in content_html are highlighted server-side and need the matching stylesheet
+  useEffect(() => {
+    if (document.getElementById(HIGHLIGHT_CSS_ID)) return;
+    const link = document.createElement("link");
+    link.id = HIGHLIGHT_CSS_ID;
+    link.rel = "stylesheet";
+    link.href = `${API_URL}/blog/highlight.css`;
+    document.head.appendChild(link);
+  }, []);
 
   const formatDate = (dateString: string) => {
     if (!dateString) return "N/A";
@@ -202,7 +250,7 @@ const BlogPostPage: React.FC = () => {
               <Group gap="xs">
                 <IconEye size={16} color="gray" />
                 <Text size="sm" c="dimmed">
-                  {post.views_count || 0} views
+                  {viewsCount ?? post.views_count ?? 0} views
                 </Text>
               </Group>
               <Group gap="xs">
@@ -234,18 +282,36 @@ const BlogPostPage: React.FC = () => {
           </Box>
         )}
 
-        {/* Article Content */}
+        {/* Table of Contents */}
+        {post.toc && post.toc.length > 0 && (
+          <Paper p="md" withBorder>
+            <Title order={4} mb="xs">
+              Contents
+            </Title>
+            <TableOfContents entries={post.toc} />
+          </Paper>
+        )}
+
+        {/* Article Content (rendered and sanitized by the API) */}
         <Paper p="xl" withBorder>
-          <Text
-            size="md"
-            style={{
-              whiteSpace: "pre-wrap",
-              lineHeight: 1.7,
-              fontSize: "1.1rem",
-            }}
-          >
-            {post.content}
-          </Text>
+          {post.content_html ? (
+            <Box
+              className="blog-content"
+              style={{ lineHeight: 1.7, fontSize: "1.1rem" }}
+              dangerouslySetInnerHTML={{ __html: post.content_html }}
+            />
+          ) : (
+            <Text
+              size="md"
+              style={{
+                whiteSpace: "pre-wrap",
+                lineHeight: 1.7,
+                fontSize: "1.1rem",
+              }}
+            >
+              {post.content}
+            </Text>
+          )}
         </Paper>
 
         {/* Actions */}
@@ -29,6 +29,7 @@ import {
 import { useForm } from "@mantine/form";
 import { notifications } from "@mantine/notifications";
 import { useSubmitMessage, useContactInfo } from "../../hooks/useApi";
+import { getErrorMessage } from "../../services/api";
 
 interface ContactFormData {
   name: string;
@@ -84,9 +85,10 @@ const ContactPage: React.FC = () => {
     } catch (error: any) {
       notifications.show({
         title: "Error",
-        message:
-          error?.response?.data?.error ||
-          "Failed to send message. Please try again.",
+        message: getErrorMessage(
+          error,
+          "Failed to send message. Please try again."
+        ),
         color: "red",
       });
     } finally {
@@ -1,5 +1,5 @@
 // Public Layout Component for Wheeler Knight Portfolio
-import React, { useState } from "react";
+import React, { useEffect, useState } from "react";
 import {
   AppShell,
   Group,
@@ -35,6 +35,7 @@ import {
   IconFileText,
 } from "@tabler/icons-react";
 import { Outlet, useNavigate, useLocation } from "react-router-dom";
+import { trackPageView } from "../../utils/analytics";
 
 const PublicLayout: React.FC = () => {
   const [opened, { toggle, close }] = useDisclosure(false);
@@ -42,6 +43,10 @@ const PublicLayout: React.FC = () => {
   const navigate = useNavigate();
   const location = useLocation();
 
+  useEffect(() => {
+    trackPageView(location.pathname);
+  }, [location.pathname]);
+
   const navItems = [
     { label: "Home", path: "/", icon: IconHome },
     { label: "About", path: "/about", icon: IconUser },
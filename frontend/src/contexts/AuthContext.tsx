@@ -1,6 +1,6 @@
 // Authentication Context for Wheeler Knight Portfolio
 import React, { createContext, useContext, useReducer, useEffect, ReactNode } from 'react';
-import { AuthService } from '../services/api';
+import { AuthService, getErrorMessage } from '../services/api';
 
 // Types
 interface User {
@@ -145,7 +145,7 @@ export const AuthProvider: React.FC<{ children: ReactNode }> = ({ children }) =>
       
       dispatch({ type: 'LOGIN_SUCCESS', payload: { user, tokens } });
     } catch (error: any) {
-      const errorMessage = error.response?.data?.message || 'Login failed';
+      const errorMessage = getErrorMessage(error, 'Login failed');
       dispatch({ type: 'LOGIN_FAILURE', payload: errorMessage });
       throw error;
     }
@@ -68,6 +68,15 @@ apiClient.interceptors.response.use(
   }
 );
 
+// Message of a failed request's {"error": {"message", "code", ...}} body, or fallback
+export const getErrorMessage = (error: any, fallback: string): string => {
+  const body = error?.response?.data?.error;
+  if (typeof body?.message === 'string') {
+    return body.message;
+  }
+  return typeof body === 'string' ? body : fallback;
+};
+
 // API Service Classes
 export class AuthService {
   static async login(credentials: { username: string; password: string }) {
@@ -255,6 +264,11 @@ export class BlogService {
     return response.data;
   }
 
+  static async recordBlogPostView(id: number) {
+    const response = await apiClient.post(`/blog/${id}/view`);
+    return response.data;
+  }
+
   static async likeBlogPost(id: number) {
     const response = await apiClient.post(`/blog/${id}/like`);
     return response.data;
@@ -0,0 +1,80 @@
+// First-party Analytics Beacons for Wheeler Knight Portfolio
+// Events are buffered and sent in batches to /api/analytics/events
+
+const API_URL = process.env.REACT_APP_API_URL || 'http://localhost:5000/api';
+const EVENTS_URL = `${API_URL}/analytics/events`;
+const SESSION_KEY = 'analytics_session_id';
+const MAX_BATCH = 20;
+const FLUSH_DELAY = 5000; // 5 seconds
+
+type AnalyticsEvent =
+  | { type: 'page_view'; url: string; referrer?: string; session_id: string }
+  | { type: 'download'; file_name: string; file_type: string; url?: string; session_id: string };
+
+let buffer: AnalyticsEvent[] = [];
+let flushTimer: ReturnType<typeof setTimeout> | null = null;
+
+const getSessionId = (): string => {
+  let sessionId = sessionStorage.getItem(SESSION_KEY);
+  if (!sessionId) {
+    sessionId = `${Date.now().toString(36)}-${Math.random().toString(36).slice(2, 10)}`;
+    sessionStorage.setItem(SESSION_KEY, sessionId);
+  }
+  return sessionId;
+};
+
+export const flushAnalytics = (): void => {
+  if (flushTimer) {
+    clearTimeout(flushTimer);
+    flushTimer = null;
+  }
+  if (buffer.length === 0) {
+    return;
+  }
+
+  const body = JSON.stringify({ events: buffer });
+  buffer = [];
+
+  // sendBeacon survives page unloads; fall back to fetch with keepalive
+  if (!navigator.sendBeacon || !navigator.sendBeacon(EVENTS_URL, body)) {
+    fetch(EVENTS_URL, { method: 'POST', body, keepalive: true }).catch(() => undefined);
+  }
+};
+
+const enqueue = (event: AnalyticsEvent): void => {
+  buffer.push(event);
+  if (buffer.length >= MAX_BATCH) {
+    flushAnalytics();
+  } else if (!flushTimer) {
+    flushTimer = setTimeout(flushAnalytics, FLUSH_DELAY);
+  }
+};
+
+export const trackPageView = (url: string): void => {
+  enqueue({
+    type: 'page_view',
+    url,
+    referrer: document.referrer || undefined,
+    session_id: getSessionId(),
+  });
+};
+
+export const trackDownload = (fileName: string, fileType: string, url?: string): void => {
+  enqueue({
+    type: 'download',
+    file_name: fileName,
+    file_type: fileType,
+    url,
+    session_id: getSessionId(),
+  });
+};
+
+// Send whatever is buffered when the tab is hidden or closed
+if (typeof window !== 'undefined') {
+  document.addEventListener('visibilitychange', () => {
+    if (document.visibilityState === 'hidden') {
+      flushAnalytics();
+    }
+  });
+  window.addEventListener('pagehide', flushAnalytics);
+}